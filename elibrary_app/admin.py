@@ -3,10 +3,207 @@
 
 Регистрирует модели приложения электронной библиотеки
 в административной панели Django для управления данными.
+
+Список книг рассчитан на большой каталог:
+    - поиск идет по полнотекстовому индексу (elibrary_app.search),
+      а не просмотром всех строк через icontains
+    - общее количество книг берется из счетчиков категорий, а количество
+      отфильтрованных книг считается не дальше ADMIN_COUNT_LIMIT
+      (EstimatedCountPaginator); второй COUNT(*) по всей таблице
+      отключен (show_full_result_count)
+    - массовые действия выполняются одним UPDATE или DELETE (elibrary_app.bulk)
 """
 
-from django.contrib import admin
-from .models import EBooksModel
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.auth.models import User
+from django.core.paginator import Paginator
+from django.db.models import Exists, OuterRef, Sum
+from django.template.response import TemplateResponse
+from django.utils.functional import cached_property
+
+from .bulk import delete_books, recategorize, reextract_text
+from .models import Category, EBooksModel
+from .search import filter_books
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Пагинатор списка книг без полного COUNT(*).
+
+    Без фильтров количество книг - сумма счетчиков категорий (запрос
+    к маленькой таблице категорий). С фильтрами или поиском строки
+    считаются не дальше settings.ADMIN_COUNT_LIMIT: при большем
+    количестве совпадений доступны первые ADMIN_COUNT_LIMIT книг,
+    остальные находятся уточнением фильтра.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.has_filters():
+            totals = Category.objects.using(queryset.db).aggregate(total=Sum('book_count'))
+            return totals['total'] or 0
+        return queryset.order_by()[:settings.ADMIN_COUNT_LIMIT].count()
+
+
+class CategoryListFilter(admin.SimpleListFilter):
+    """
+    Фильтр по категории со счетчиками книг из таблицы категорий.
+    """
+
+    title = 'категория'
+    parameter_name = 'category'
+
+    def lookups(self, request, model_admin):
+        return [
+            (category.name, f'{category.title} ({category.book_count})')
+            for category in Category.objects.all()
+        ]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(category=self.value())
+        return queryset
+
+
+class AuthorListFilter(admin.SimpleListFilter):
+    """
+    Фильтр по автору: в списке только пользователи, у которых есть книги.
+
+    Наличие книг проверяется EXISTS по индексу (author, title, id) для
+    каждого пользователя, без просмотра всей таблицы книг.
+    """
+
+    title = 'автор'
+    parameter_name = 'author'
+
+    def lookups(self, request, model_admin):
+        authors = User.objects.filter(
+            Exists(EBooksModel.objects.filter(author=OuterRef('pk'))),
+        ).order_by('username')
+        return [
+            (str(user.pk), f'{user.get_full_name() or user.username}')
+            for user in authors
+        ]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(author_id=self.value())
+        return queryset
+
+
+def _move_action(category):
+    """
+    Действие "Перенести в категорию" для одной категории.
+
+    Действия создаются по строкам таблицы категорий, поэтому для новой
+    категории код менять не нужно.
+    """
+    def move(modeladmin, request, queryset):
+        moved = recategorize(queryset, category)
+        modeladmin.message_user(request, f'Перенесено в "{category.title}": {moved}', messages.SUCCESS)
+
+    return move
+
+
+@admin.register(EBooksModel)
+class EBooksAdmin(admin.ModelAdmin):
+    """
+    Список и редактирование книг каталога.
+    """
+
+    list_display = ('id', 'title', 'category_name', 'author_display', 'pages', 'updated_at')
+    list_filter = (CategoryListFilter, AuthorListFilter)
+    # Категория выводится из столбца книги, соединение с категориями не нужно
+    list_select_related = ('author',)
+    # Сортировка только по столбцам с индексом
+    sortable_by = ('id', 'updated_at')
+    # Поиск по названию, автору и аннотации (см. get_search_results)
+    search_fields = ('title',)
+    search_help_text = 'Поиск по названию, автору и аннотации (по началу слов)'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    raw_id_fields = ('author',)
+    actions = ('delete_selected_books', 'reextract_selected_text')
+
+    @admin.display(description='категория', ordering='category')
+    def category_name(self, obj):
+        return obj.category_id
+
+    @admin.display(description='автор')
+    def author_display(self, obj):
+        return obj.author_name
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Поиск по полнотекстовому индексу (icontains - только для других баз).
+        """
+        found = filter_books(queryset, search_term)
+        if found is None:
+            return super().get_search_results(request, queryset, search_term)
+        return found, False
+
+    def get_actions(self, request):
+        """
+        Действия списка: стандартное удаление по одной книге заменено
+        массовым, и для каждой категории добавлен перенос в нее.
+        """
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        if self.has_change_permission(request):
+            for category in Category.objects.all():
+                name = f'move_to_{category.name}'
+                actions[name] = (_move_action(category), name, f'Перенести в категорию "{category.title}"')
+        return actions
+
+    @admin.action(description='Удалить выбранные книги', permissions=['delete'])
+    def delete_selected_books(self, request, queryset):
+        """
+        Удаление выбранных книг одним DELETE после подтверждения.
+
+        Страница подтверждения показывает только количество книг:
+        список всех удаляемых объектов (как у delete_selected) для
+        большой выборки не строится.
+        """
+        if request.POST.get('post') != 'yes':
+            return TemplateResponse(request, 'admin/elibrary_app/delete_books_confirmation.html', {
+                **self.admin_site.each_context(request),
+                'title': 'Удаление книг',
+                'opts': self.model._meta,
+                'count': queryset.count(),
+                'action_checkbox_name': admin.helpers.ACTION_CHECKBOX_NAME,
+                'selected': request.POST.getlist(admin.helpers.ACTION_CHECKBOX_NAME),
+                'select_across': request.POST.get('select_across', '0'),
+            })
+        deleted = delete_books(queryset)
+        self.message_user(request, f'Удалено книг: {deleted}', messages.SUCCESS)
+        return None
+
+    @admin.action(description='Извлечь текст PDF заново', permissions=['change'])
+    def reextract_selected_text(self, request, queryset):
+        count, queued = reextract_text(queryset)
+        if queued:
+            self.message_user(request, f'Книг в очереди извлечения текста: {count}', messages.SUCCESS)
+        else:
+            self.message_user(
+                request,
+                f'Текст книг удален: {count}. Запустите python manage.py extract_pdf_text',
+                messages.WARNING,
+            )
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    """
+    Категории книг. Имя категории хранится в строках книг, поэтому
+    после создания не редактируется.
+    """
+
+    list_display = ('name', 'title', 'color', 'icon', 'position', 'book_count')
+    list_editable = ('position',)
 
-# Регистрация модели EBooksModel в административной панели
-admin.site.register(EBooksModel)
\ No newline at end of file
+    def get_readonly_fields(self, request, obj=None):
+        if obj is not None:
+            return ('name', 'book_count')
+        return ('book_count',)
@@ -0,0 +1,227 @@
+"""
+JSON API каталога книг только для чтения.
+
+    GET /api/books/             - список книг (фильтры, курсор, выбор полей)
+    GET /api/books/<id>/        - одна книга
+
+Параметр fields задает набор полей ответа (sparse fieldset) и
+одновременно набор столбцов запроса: поля переводятся в only(), поэтому
+длинная аннотация (summary) не читается из базы, если не запрошена.
+По умолчанию список отдается без summary, а книга - со всеми полями.
+
+Список выводится по ключу сортировки (keyset) с непрозрачным курсором,
+как страница обзора. Ответы несут ETag, вычисляемый без обращения к
+данным книг (версия каталога из кеша или updated_at книги), а тело ответа
+кешируется по этому ETag: повторный запрос с тем же ETag получает 304,
+а с другими клиентами - готовый ответ из кеша.
+"""
+
+import hashlib
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from elibrary_app.caching import catalog_changed_at, category_counts
+from elibrary_app.models import EBooksModel
+
+# Версия формата ответов (входит в ETag и ключ кеша)
+API_VERSION = 1
+
+# Поле ответа -> поля модели, которые нужно загрузить для него
+API_FIELDS = {
+    'id': ('id',),
+    'title': ('title',),
+    'summary': ('summary',),
+    'pages': ('pages',),
+    'category': ('category',),
+    'author': ('author_id',),
+    'author_name': (
+        'author_id', 'indexed_author',
+        'author__first_name', 'author__last_name', 'author__username',
+    ),
+    'pdf_url': ('pdf',),
+    'pdf_sha256': ('pdf_sha256',),
+    'created_at': ('created_at',),
+    'updated_at': ('updated_at',),
+}
+
+# Поля списка по умолчанию: все, кроме аннотации
+DEFAULT_LIST_FIELDS = tuple(name for name in API_FIELDS if name != 'summary')
+
+# Сортировки списка: ключ keyset-пагинации
+API_ORDERINGS = {
+    'id': ('id',),
+    'title': ('title', 'id'),
+    'updated': ('-updated_at', '-id'),
+}
+
+
+class ApiError(ValueError):
+    """
+    Некорректный параметр запроса API (ответ 400).
+    """
+
+
+def parse_fields(value, default):
+    """
+    Разбор параметра fields.
+
+    Args:
+        value (str): Имена полей через запятую или пустое значение
+        default (tuple): Поля по умолчанию
+
+    Returns:
+        tuple: Имена полей ответа в порядке API_FIELDS
+
+    Raises:
+        ApiError: Указано неизвестное поле
+    """
+    if not value:
+        return default
+    requested = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = requested - API_FIELDS.keys()
+    if unknown:
+        raise ApiError(f'Неизвестные поля: {", ".join(sorted(unknown))}')
+    return tuple(name for name in API_FIELDS if name in requested)
+
+
+def select_fields(queryset, fields, ordering=()):
+    """
+    Ограничение запроса столбцами, нужными для полей ответа.
+
+    Args:
+        queryset (QuerySet): Набор книг
+        fields (tuple): Поля ответа
+        ordering (tuple): Поля ключа сортировки (нужны для курсора)
+
+    Returns:
+        QuerySet: Набор с only() и, при необходимости, select_related('author')
+    """
+    columns = {'id'}
+    for name in fields:
+        columns.update(API_FIELDS[name])
+    columns.update(field.lstrip('-') for field in ordering)
+    if 'author_name' in fields:
+        queryset = queryset.select_related('author')
+    return queryset.only(*sorted(columns))
+
+
+def serialize_book(book, fields):
+    """
+    Представление книги в ответе API.
+
+    Args:
+        book (EBooksModel): Книга, загруженная через select_fields
+        fields (tuple): Поля ответа
+
+    Returns:
+        dict: Значения запрошенных полей
+    """
+    data = {}
+    for name in fields:
+        if name == 'author':
+            data[name] = book.author_id
+        elif name == 'category':
+            data[name] = book.category_id
+        elif name == 'author_name':
+            data[name] = book.author_name
+        elif name == 'pdf_url':
+            data[name] = reverse('downloadBook', args=[book.id]) if book.pdf else None
+        elif name in ('created_at', 'updated_at'):
+            value = getattr(book, name)
+            data[name] = value.isoformat() if value else None
+        else:
+            data[name] = getattr(book, name)
+    return data
+
+
+def json_response(data, status=200):
+    """
+    Ответ API с компактным JSON.
+    """
+    return HttpResponse(
+        json.dumps(data, ensure_ascii=False, separators=(',', ':')),
+        content_type='application/json',
+        status=status,
+    )
+
+
+def _make_etag(*parts):
+    """
+    ETag ответа API из составных частей его версии.
+    """
+    raw = ':'.join(str(part) for part in (API_VERSION,) + parts)
+    return '"%s"' % hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def list_etag(request):
+    """
+    ETag списка книг: версия каталога и параметры запроса.
+
+    Не требует запросов к базе, пока версия каталога и количество книг
+    по категориям есть в кеше.
+    """
+    changed_at = catalog_changed_at()
+    return _make_etag(
+        'list',
+        changed_at.isoformat() if changed_at else '',
+        sorted(category_counts().items()),
+        request.GET.urlencode(),
+    )
+
+
+def book_etag(request, book_id):
+    """
+    ETag книги: updated_at (запрос по первичному ключу) и параметры запроса.
+
+    Returns:
+        str | None: ETag или None для несуществующей книги
+    """
+    updated_at = (
+        EBooksModel.objects.filter(id=book_id)
+        .values_list('updated_at', flat=True)
+        .first()
+    )
+    if updated_at is None:
+        return None
+    return _make_etag('book', book_id, updated_at.isoformat(), request.GET.urlencode())
+
+
+def api_view(etag_func):
+    """
+    Декоратор представления API: ETag, 304 и кеш готовых ответов.
+
+    Представление вызывается, только если ответа с таким ETag нет в кеше.
+    Ответы не зависят от пользователя и не обращаются к сессии.
+
+    Args:
+        etag_func (callable): Функция (request, *args, **kwargs) -> ETag или None
+    """
+    def decorator(view):
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            etag = etag_func(request, *args, **kwargs)
+            if etag is None:
+                response = view(request, *args, **kwargs)
+            else:
+                response = get_conditional_response(request, etag=etag)
+                if response is None:
+                    key = 'api:response:' + etag.strip('"')
+                    content = cache.get(key)
+                    if content is not None:
+                        response = HttpResponse(content, content_type='application/json')
+                    else:
+                        response = view(request, *args, **kwargs)
+                        if response.status_code == 200:
+                            cache.set(key, response.content, settings.API_CACHE_TIMEOUT)
+                if response.status_code in (200, 304):
+                    response['ETag'] = etag
+            patch_cache_control(response, public=True, no_cache=True)
+            return response
+        return inner
+    return decorator
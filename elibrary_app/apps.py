@@ -16,10 +16,35 @@ class ElibraryAppConfig(AppConfig):
     Определяет основные параметры приложения:
     - default_auto_field: тип автоматически создаваемого первичного ключа
     - name: имя приложения для использования в проекте Django
+    - ready(): подключение обработчиков сигналов приложения
     """
     
     # Использование BigAutoField для автоматически создаваемых первичных ключей
     default_auto_field = 'django.db.models.BigAutoField'
     
     # Имя приложения в проекте Django
-    name = 'elibrary_app'
\ No newline at end of file
+    name = 'elibrary_app'
+    
+    def ready(self):
+        """
+        Подключение обработчиков сигналов после загрузки приложения.
+        
+        - post_migrate: восстановление триггеров полнотекстового поиска,
+          которые SQLite удаляет при пересоздании таблиц миграциями
+        - post_save/post_delete книг: инвалидация кеша страницы обзора
+          (обработчики регистрируются при импорте elibrary_app.signals)
+        - post_save/post_delete пользователей: удаление пользователя из кеша
+        - connection_created: учет SQL-запросов для Server-Timing и /metrics
+        - проверка наличия и хеша сторонних статических файлов (Bootstrap)
+        """
+        from django.core import checks
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_migrate
+        from elibrary_app import signals  # noqa: F401
+        from elibrary_app.assets import check_vendor_assets
+        from elibrary_app.metrics import install_query_timer
+        from elibrary_app.search import ensure_search_triggers
+        
+        post_migrate.connect(ensure_search_triggers, sender=self)
+        connection_created.connect(install_query_timer)
+        checks.register(check_vendor_assets, checks.Tags.staticfiles)
\ No newline at end of file
@@ -0,0 +1,296 @@
+"""
+Статические файлы: имена с хешем, сжатые копии и долгое кеширование.
+
+Конвейер:
+
+    1. collectstatic через CompressedManifestStaticFilesStorage копирует
+       файлы в STATIC_ROOT, добавляет к именам хеш содержимого
+       (css/style.3f2a9c1d.css, таблица имен - staticfiles.json) и рядом
+       с каждым текстовым файлом пишет сжатые копии .gz и .br
+       (Brotli - если установлен пакет brotli)
+    2. {% static %} в шаблонах возвращает имя с хешем, поэтому при любом
+       изменении файла меняется и его URL
+    3. PrecompressedStaticMiddleware отдает файлы из STATIC_ROOT: сжатую
+       копию по Accept-Encoding и для имен с хешем заголовок
+       Cache-Control: immutable на год - браузер больше не запрашивает файл.
+       Файлы без хеша в имени кешируются ненадолго и с ETag/Last-Modified:
+       после истечения срока браузер получает 304 без тела
+
+Сторонние библиотеки (Bootstrap) закреплены версией и хешем SRI
+(VENDOR_ASSETS), хранятся в репозитории в static/vendor/ и отдаются
+вместе с остальной статикой. Команда vendor_assets нужна только для
+смены закрепленной версии: она скачивает файлы с проверкой хеша.
+Если файла нет, тег {% vendor_asset %} подключает его с CDN с тем же
+хешем integrity, а проверка check_vendor_assets (manage.py check,
+запуск сервера) предупреждает об этом.
+
+В режиме отладки (runserver) статические файлы по-прежнему отдает
+django.contrib.staticfiles без хешей в именах.
+"""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import mimetypes
+import os
+import posixpath
+from functools import lru_cache
+
+from asgiref.sync import markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core import checks
+from django.http import FileResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from elibrary_app.downloads import file_etag
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - зависит от окружения
+    brotli = None
+
+# Расширения файлов, для которых создаются сжатые копии
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.map', '.svg', '.json', '.txt', '.html', '.xml')
+
+# Файлы меньше этого размера не сжимаются (выигрыш меньше заголовков)
+COMPRESS_MIN_SIZE = 256
+
+# Сжатая копия сохраняется, только если она меньше оригинала хотя бы на 5%
+COMPRESS_MIN_RATIO = 0.95
+
+# Кодировки сжатых копий в порядке предпочтения: (Content-Encoding, суффикс)
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+# Cache-Control для имен с хешем и для остальных файлов
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+DEFAULT_CACHE_CONTROL = 'public, max-age=60'
+
+# Сторонние файлы: имя -> (путь в static/, URL на CDN, хеш SRI)
+VENDOR_ASSETS = {
+    'bootstrap-css': (
+        'vendor/bootstrap/5.1.3/bootstrap.min.css',
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css',
+        'sha384-1BmE4kWBq78iYhFldvKuhfTAU6auU8tT94WrHftjDbrCEXSU1oBoqyl2QvZ6jIW3',
+    ),
+    'bootstrap-js': (
+        'vendor/bootstrap/5.1.3/bootstrap.bundle.min.js',
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js',
+        'sha384-ka7Sk0Gln4gmtz2MlQnikT1wXgYsOg+OMhuP+IlRH9sENBO0LRn5q+8nbTov4+1p',
+    ),
+}
+
+
+def compress_bytes(content):
+    """
+    Сжатые варианты содержимого файла.
+
+    Args:
+        content (bytes): Исходное содержимое
+
+    Returns:
+        dict: Суффикс ('.gz', '.br') -> сжатые байты; только варианты,
+              заметно меньшие оригинала
+    """
+    variants = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(content, quality=11)
+    limit = len(content) * COMPRESS_MIN_RATIO
+    return {suffix: data for suffix, data in variants.items() if len(data) < limit}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    ManifestStaticFilesStorage, создающее сжатые копии при collectstatic.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        # Сжимаются и исходные имена (для ссылок без хеша), и имена с хешем
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self._compress(name)
+
+    def _compress(self, name):
+        """
+        Запись сжатых копий файла рядом с ним.
+        """
+        path = self.path(name)
+        if not os.path.exists(path) or os.path.getsize(path) < COMPRESS_MIN_SIZE:
+            return
+        with open(path, 'rb') as source:
+            content = source.read()
+        for suffix, data in compress_bytes(content).items():
+            with open(path + suffix, 'wb') as target:
+                target.write(data)
+
+
+def sri_digest(content, algorithm):
+    """
+    Хеш содержимого в формате SRI (base64 от двоичного хеша).
+    """
+    return base64.b64encode(hashlib.new(algorithm, content).digest()).decode('ascii')
+
+
+def check_vendor_assets(app_configs=None, **kwargs):
+    """
+    Проверка сторонних файлов в static/ (регистрируется в apps.py).
+
+    Отсутствующий файл - предупреждение (страницы берут его с CDN),
+    файл с другим хешем - ошибка: браузер отклонит его по integrity.
+
+    Returns:
+        list: Сообщения проверки
+    """
+    messages = []
+    for name, (path, url, integrity) in VENDOR_ASSETS.items():
+        found = finders.find(path)
+        if found is None:
+            messages.append(checks.Warning(
+                f'Файла {path} ({name}) нет в static/: страницы подключают его с CDN',
+                hint='Выполните python manage.py vendor_assets и добавьте файл в репозиторий',
+                id='elibrary_app.W001',
+            ))
+            continue
+        algorithm, expected = integrity.split('-', 1)
+        with open(found, 'rb') as stream:
+            if sri_digest(stream.read(), algorithm) != expected:
+                messages.append(checks.Error(
+                    f'Хеш {path} ({name}) не совпадает с {integrity}',
+                    hint='Скачайте файл заново: python manage.py vendor_assets --force',
+                    id='elibrary_app.E001',
+                ))
+    return messages
+
+
+@lru_cache(maxsize=None)
+def vendored(path):
+    """
+    Скачан ли сторонний файл в static/ (результат запоминается до перезапуска).
+    """
+    return finders.find(path) is not None
+
+
+def _accepted_encodings(request):
+    """
+    Кодировки из Accept-Encoding, разрешенные клиентом (q > 0).
+    """
+    accepted = set()
+    for item in request.headers.get('Accept-Encoding', '').split(','):
+        coding, _, params = item.strip().partition(';')
+        if params.replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+class StaticIndex:
+    """
+    Таблица файлов STATIC_ROOT: URL -> (путь, сжатые копии, имя с хешем,
+    ETag по кодировкам, время изменения).
+
+    Строится один раз при запуске процесса: после collectstatic сервер
+    перезапускается, и на пути запроса нет обращений к файловой системе,
+    кроме открытия отдаваемого файла. У каждой сжатой копии свой ETag
+    (None в словаре - файл без сжатия): это разные представления файла.
+    """
+
+    def __init__(self, root, url):
+        self.files = {}
+        if not root or not url.startswith('/') or not os.path.isdir(root):
+            return
+        immutable = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+        for directory, _, filenames in os.walk(root):
+            names = set(filenames)
+            for filename in filenames:
+                if filename.endswith(('.gz', '.br')):
+                    continue
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, root).replace(os.sep, '/')
+                variants = {
+                    coding: path + suffix
+                    for coding, suffix in ENCODINGS if filename + suffix in names
+                }
+                stat = os.stat(path)
+                etags = {None: file_etag(stat)}
+                for coding, variant in variants.items():
+                    etags[coding] = file_etag(os.stat(variant))
+                self.files[posixpath.join(url, name)] = (
+                    path, variants, name in immutable, etags, int(stat.st_mtime),
+                )
+
+    def lookup(self, url_path):
+        return self.files.get(url_path)
+
+
+class PrecompressedStaticMiddleware:
+    """
+    Раздача статических файлов из STATIC_ROOT со сжатыми копиями.
+
+    Ставится первым в MIDDLEWARE: запросы к статике не проходят сессии,
+    аутентификацию и замеры представлений. Файлы без копии в STATIC_ROOT
+    (например, в режиме отладки до collectstatic) передаются дальше.
+    Работает и в синхронном (WSGI), и в асинхронном (ASGI) стеке middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.index = StaticIndex(settings.STATIC_ROOT, settings.STATIC_URL)
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        entry = self._lookup(request)
+        if entry is not None:
+            return self.serve(request, *entry)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        entry = self._lookup(request)
+        if entry is not None:
+            return self.serve(request, *entry)
+        return await self.get_response(request)
+
+    def _lookup(self, request):
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        return self.index.lookup(request.path_info)
+
+    def serve(self, request, path, variants, immutable, etags, last_modified):
+        """
+        Ответ с файлом или его сжатой копией (304 - если копия у клиента актуальна).
+        """
+        encoding = None
+        accepted = _accepted_encodings(request)
+        for coding, _ in ENCODINGS:
+            if coding in variants and coding in accepted:
+                encoding, path = coding, variants[coding]
+                break
+
+        etag = etags[encoding]
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            content_type, _ = mimetypes.guess_type(request.path_info)
+            response = FileResponse(open(path, 'rb'), content_type=content_type or 'application/octet-stream')
+            # FileResponse подставляет имя файла на диске (style.css.br)
+            del response['Content-Disposition']
+            if encoding:
+                response['Content-Encoding'] = encoding
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        if variants:
+            patch_vary_headers(response, ('Accept-Encoding',))
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL if immutable else DEFAULT_CACHE_CONTROL
+        return response
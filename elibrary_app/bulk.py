@@ -0,0 +1,120 @@
+"""
+Массовые операции с книгами каталога.
+
+Операции выполняются одним запросом UPDATE или DELETE по условию
+выборки, без загрузки книг в память. QuerySet.update() и удаление
+в обход Collector не вызывают save() и сигналы моделей, поэтому
+счетчики книг категорий (adjust_book_counts) и кеш страницы обзора
+(bump_generation_on_commit) обновляются здесь явно, в той же транзакции,
+что и изменение: количество книг по категориям считается одним
+запросом GROUP BY до изменения.
+
+Используются действиями административной панели (elibrary_app.admin).
+"""
+
+from django.db import router, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from elibrary_app.caching import bump_generation_on_commit
+from elibrary_app.ingest import schedule_ingest
+from elibrary_app.models import BookPage, EBooksModel, adjust_book_counts
+
+# Больше этого количества книг текст не ставится в очередь извлечения
+# из запроса: такие выборки обрабатывает команда extract_pdf_text
+REEXTRACT_INLINE_LIMIT = 100
+
+
+def _category_totals(queryset):
+    """
+    Количество книг выборки по категориям (один запрос GROUP BY).
+    """
+    return dict(
+        queryset.order_by().values_list('category').annotate(total=Count('id'))
+    )
+
+
+def recategorize(queryset, category):
+    """
+    Перенос книг выборки в другую категорию одним UPDATE.
+
+    Args:
+        queryset (QuerySet): Книги
+        category (Category): Новая категория
+
+    Returns:
+        int: Количество перенесенных книг
+    """
+    using = router.db_for_write(EBooksModel)
+    books = queryset.using(using).exclude(category=category.name)
+    changed_at = timezone.now()
+    with transaction.atomic(using=using):
+        totals = _category_totals(books)
+        moved = books.update(category=category.name, updated_at=changed_at)
+        changes = {name: -total for name, total in totals.items()}
+        changes[category.name] = sum(totals.values())
+        adjust_book_counts(changes, using)
+        if moved:
+            bump_generation_on_commit(changes, changed_at, using)
+    return moved
+
+
+def delete_books(queryset):
+    """
+    Удаление книг выборки вместе с текстом страниц: по одному DELETE на таблицу.
+
+    Файлы PDF остаются в хранилище: один файл может принадлежать
+    нескольким книгам (адресация по содержимому, см. elibrary_app.storage).
+
+    Книги удаляются QuerySet._raw_delete() - тем же запросом, которым
+    Collector удаляет строки моделей без сигналов. Это внутренний API
+    Django (проверяется test_admin.py при обновлении Django): он не
+    вызывает post_delete, поэтому работу обработчика
+    invalidate_explore_on_delete сразу после удаления выполняют
+    adjust_book_counts и bump_generation_on_commit. QuerySet.delete()
+    загрузил бы все книги и вызвал обработчик для каждой.
+
+    Args:
+        queryset (QuerySet): Книги
+
+    Returns:
+        int: Количество удаленных книг
+    """
+    using = router.db_for_write(EBooksModel)
+    selected = queryset.using(using).order_by().values('pk')
+    with transaction.atomic(using=using):
+        totals = _category_totals(queryset.using(using))
+        BookPage.objects.using(using).filter(book__in=selected).delete()
+        # Сигналы не вызываются: их работа выполняется явно (см. выше)
+        deleted = EBooksModel.objects.using(using).filter(pk__in=selected)._raw_delete(using)
+        adjust_book_counts({name: -total for name, total in totals.items()}, using)
+        bump_generation_on_commit(totals, using=using)
+    return deleted
+
+
+def reextract_text(queryset):
+    """
+    Повторное извлечение текста PDF для книг выборки.
+
+    Старый текст страниц удаляется одним DELETE. Небольшие выборки сразу
+    ставятся в очередь фонового извлечения (elibrary_app.ingest), для
+    остальных текст извлекает команда extract_pdf_text, которая
+    обрабатывает книги без текста.
+
+    Args:
+        queryset (QuerySet): Книги
+
+    Returns:
+        tuple: (количество книг с PDF, поставлены ли они в очередь)
+    """
+    using = router.db_for_write(EBooksModel)
+    books = queryset.using(using).exclude(pdf='')
+    with transaction.atomic(using=using):
+        BookPage.objects.using(using).filter(book__in=books.order_by().values('pk')).delete()
+        count = books.count()
+        queued = count <= REEXTRACT_INLINE_LIMIT
+        if queued:
+            # Задачи отправляются в пул после фиксации транзакции
+            for book in books.select_related(None).only('id', 'pdf'):
+                schedule_ingest(book)
+    return count, queued
@@ -0,0 +1,243 @@
+"""
+Кеширование фрагментов страницы обзора книг.
+
+Карточки книг каждой категории рендерятся один раз и хранятся в кеше
+под ключом, включающим номер поколения категории. При сохранении или
+удалении книги (сигналы post_save/post_delete, см. elibrary_app.signals)
+поколение категории увеличивается: старые фрагменты перестают
+использоваться и вытесняются по таймауту, а фрагменты остальных
+категорий остаются действительными.
+
+Поколение увеличивается после фиксации транзакции изменения
+(bump_generation_on_commit): иначе параллельный запрос успел бы
+прочитать еще старые строки и сохранить их фрагмент под новым
+поколением, и устаревший фрагмент жил бы до следующего изменения.
+
+Начальное значение поколения берется из текущего времени, чтобы после
+вытеснения ключа поколения из кеша не совпасть с уже сохраненными
+фрагментами.
+
+Для асинхронных представлений есть варианты функций с префиксом a,
+использующие асинхронный API кеша и ORM; acached_fragments получает
+фрагменты всех категорий страницы обзора одним запросом к кешу.
+
+Данные, прочитанные с реплики базы (elibrary_app.database), кешируются
+не дольше REPLICA_STICKY_SECONDS: реплика может отставать от default.
+
+Здесь же хранится время последнего изменения каталога, по которому
+страница обзора отвечает на условные GET-запросы (см. elibrary_app.conditional).
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+
+from elibrary_app.database import replica_cache_timeout
+from elibrary_app.models import Category, EBooksModel
+
+# Ключ списка категорий (со счетчиками книг)
+CATEGORIES_KEY = 'explore:categories'
+
+# Ключ времени последнего изменения каталога
+CHANGED_KEY = 'explore:changed_at'
+
+
+def _generation_key(category):
+    """
+    Ключ номера поколения категории.
+    """
+    return f'explore:generation:{category}'
+
+
+def generation(category):
+    """
+    Текущее поколение фрагментов категории.
+
+    Args:
+        category (str): Название категории
+
+    Returns:
+        int: Номер поколения
+    """
+    key = _generation_key(category)
+    value = cache.get(key)
+    if value is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        value = cache.get(key, 0)
+    return value
+
+
+async def ageneration(category):
+    """
+    Асинхронный вариант generation().
+    """
+    key = _generation_key(category)
+    value = await cache.aget(key)
+    if value is None:
+        await cache.aadd(key, time.time_ns(), timeout=None)
+        value = await cache.aget(key, 0)
+    return value
+
+
+def bump_generation(category, changed_at=None):
+    """
+    Инвалидация фрагментов категории и списка категорий со счетчиками книг.
+
+    Также запоминается время изменения каталога: удаление книги не меняет
+    max(updated_at), но должно менять Last-Modified страницы обзора.
+
+    Args:
+        category (str): Название категории, в которой изменились книги
+        changed_at (datetime): Время изменения (updated_at сохраненной книги,
+                               чтобы совпасть с max(updated_at) после вытеснения
+                               ключа из кеша); по умолчанию текущее время
+    """
+    try:
+        cache.incr(_generation_key(category))
+    except ValueError:
+        cache.set(_generation_key(category), time.time_ns(), timeout=None)
+    cache.delete(CATEGORIES_KEY)
+    cache.set(CHANGED_KEY, changed_at or timezone.now(), timeout=None)
+
+
+def bump_generation_on_commit(categories, changed_at=None, using=None):
+    """
+    Инвалидация категорий (bump_generation) после фиксации текущей транзакции.
+
+    Вне транзакции инвалидация выполняется сразу; при откате
+    транзакции не выполняется.
+
+    Args:
+        categories (iterable): Названия категорий, в которых изменились книги
+        changed_at (datetime): Время изменения, как в bump_generation
+        using (str): Псевдоним базы данных транзакции
+    """
+    categories = set(categories)
+
+    def bump():
+        for category in categories:
+            bump_generation(category, changed_at)
+
+    transaction.on_commit(bump, using=using)
+
+
+def catalog_changed_at():
+    """
+    Время последнего изменения каталога.
+
+    При промахе кеша берется max(updated_at) одним запросом по индексу.
+
+    Returns:
+        datetime | None: Время изменения или None для пустого каталога
+    """
+    changed = cache.get(CHANGED_KEY)
+    if changed is None:
+        changed = EBooksModel.objects.aggregate(latest=Max('updated_at'))['latest']
+        if changed is not None:
+            # add, а не set: не затирать время изменения, записанное параллельно
+            cache.add(CHANGED_KEY, changed, timeout=replica_cache_timeout(None))
+    return changed
+
+
+def category_list():
+    """
+    Категории в порядке вывода со счетчиками книг (один запрос при промахе кеша).
+
+    Returns:
+        list: Объекты Category
+    """
+    categories = cache.get(CATEGORIES_KEY)
+    if categories is None:
+        categories = list(Category.objects.all())
+        cache.set(CATEGORIES_KEY, categories, replica_cache_timeout(settings.EXPLORE_CACHE_TIMEOUT))
+    return categories
+
+
+async def acategory_list():
+    """
+    Асинхронный вариант category_list().
+    """
+    categories = await cache.aget(CATEGORIES_KEY)
+    if categories is None:
+        categories = [category async for category in Category.objects.all()]
+        await cache.aset(CATEGORIES_KEY, categories, replica_cache_timeout(settings.EXPLORE_CACHE_TIMEOUT))
+    return categories
+
+
+def category_counts():
+    """
+    Количество книг по категориям (из списка категорий, без отдельного запроса).
+
+    Returns:
+        dict: Имя категории -> количество книг
+    """
+    return {category.name: category.book_count for category in category_list()}
+
+
+def _fragment_key(category, generation_value, cursor):
+    """
+    Ключ фрагмента страницы категории.
+    """
+    cursor_hash = hashlib.md5((cursor or '').encode('utf-8')).hexdigest()
+    return f'explore:fragment:{category}:{generation_value}:{cursor_hash}'
+
+
+def cached_fragment(category, cursor, render):
+    """
+    Получение отрендеренного фрагмента категории из кеша.
+
+    Args:
+        category (str): Название категории
+        cursor (str): Курсор страницы (пустой для первой страницы)
+        render (callable): Функция без аргументов, возвращающая HTML
+                           фрагмента; вызывается только при промахе кеша
+
+    Returns:
+        SafeString: HTML фрагмента
+    """
+    key = _fragment_key(category, generation(category), cursor)
+
+    html = cache.get(key)
+    if html is None:
+        html = render()
+        cache.set(key, html, replica_cache_timeout(settings.EXPLORE_CACHE_TIMEOUT))
+    return mark_safe(html)
+
+
+async def acached_fragments(pages, render):
+    """
+    Фрагменты нескольких категорий за одно обращение к кешу.
+
+    Args:
+        pages (list): Пары (категория, курсор страницы)
+        render (callable): Асинхронная функция, получающая список пар,
+                           которых нет в кеше, и возвращающая словарь
+                           пара -> HTML; вызывается один раз для всех промахов
+
+    Returns:
+        dict: Пара (категория, курсор) -> SafeString с HTML фрагмента
+    """
+    generation_keys = {category: _generation_key(category) for category, _ in pages}
+    found = await cache.aget_many(list(generation_keys.values()))
+    generations = {}
+    for category, key in generation_keys.items():
+        generations[category] = found[key] if key in found else await ageneration(category)
+    keys = {page: _fragment_key(page[0], generations[page[0]], page[1]) for page in pages}
+
+    found = await cache.aget_many(list(keys.values()))
+    fragments = {page: found[key] for page, key in keys.items() if key in found}
+    missing = [page for page in pages if page not in fragments]
+    if missing:
+        rendered = await render(missing)
+        await cache.aset_many(
+            {keys[page]: html for page, html in rendered.items()},
+            replica_cache_timeout(settings.EXPLORE_CACHE_TIMEOUT),
+        )
+        fragments.update(rendered)
+    return {page: mark_safe(html) for page, html in fragments.items()}
@@ -0,0 +1,188 @@
+"""
+Условные GET-запросы (ETag / Last-Modified) для HTML-страниц.
+
+Страница книги и страница обзора меняются редко, поэтому браузер
+хранит их и перед показом переспрашивает сервер. Версия страницы
+вычисляется до вызова представления:
+
+    - книга: updated_at одной записи (запрос по первичному ключу)
+    - обзор: время последнего изменения каталога и количество книг
+      по категориям (из кеша, при промахе - max(updated_at) по индексу)
+
+Если версия совпала с If-None-Match / If-Modified-Since, возвращается
+304 без выборки данных и рендеринга шаблона.
+
+Страницы содержат меню текущего пользователя, поэтому его идентификатор
+входит в ETag, а ответ помечается Vary: Cookie и Cache-Control: private
+для авторизованных пользователей.
+
+Декоратор conditional_page применим и к асинхронным представлениям:
+встроенный condition() в Django 4.2 работает только с синхронными.
+"""
+
+import asyncio
+import datetime
+import hashlib
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from elibrary_app.caching import catalog_changed_at, category_counts
+from elibrary_app.models import EBooksModel
+
+
+def _user_tag(request):
+    """
+    Идентификатор пользователя для ETag персонализированной страницы.
+    """
+    return request.user.pk if request.user.is_authenticated else 'anon'
+
+
+def _make_etag(*parts):
+    """
+    ETag из составных частей версии страницы.
+
+    В хеш входит settings.PAGE_ETAG_VERSION, чтобы после изменения
+    шаблонов браузеры не получали 304 на старые страницы.
+    """
+    raw = ':'.join(str(part) for part in (settings.PAGE_ETAG_VERSION,) + parts)
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def _book_updated_at(request, book_id):
+    """
+    Время изменения книги (один запрос на HTTP-запрос).
+
+    condition() вызывает функции ETag и Last-Modified по отдельности,
+    поэтому результат запоминается в объекте запроса.
+    """
+    versions = request.__dict__.setdefault('_book_versions', {})
+    if book_id not in versions:
+        versions[book_id] = (
+            EBooksModel.objects.filter(id=book_id)
+            .values_list('updated_at', flat=True)
+            .first()
+        )
+    return versions[book_id]
+
+
+def book_etag(request, book_id):
+    """
+    ETag страницы книги; None для несуществующей книги (ответит 404).
+    """
+    updated_at = _book_updated_at(request, book_id)
+    if updated_at is None:
+        return None
+    return _make_etag('book', book_id, updated_at.isoformat(), _user_tag(request))
+
+
+def book_last_modified(request, book_id):
+    """
+    Last-Modified страницы книги.
+    """
+    return _book_updated_at(request, book_id)
+
+
+def catalog_etag(request, *args, **kwargs):
+    """
+    ETag страниц обзора каталога.
+
+    Количество книг по категориям меняется при удалении и переносе книги,
+    а параметры запроса (курсоры) определяют показываемые страницы.
+    """
+    changed_at = catalog_changed_at()
+    counts = sorted(category_counts().items())
+    return _make_etag(
+        'catalog',
+        changed_at.isoformat() if changed_at else '',
+        counts,
+        request.GET.urlencode(),
+        _user_tag(request),
+        *args,
+    )
+
+
+def catalog_last_modified(request, *args, **kwargs):
+    """
+    Last-Modified страниц обзора каталога.
+    """
+    return catalog_changed_at()
+
+
+def _check_conditions(request, etag_func, last_modified_func, args, kwargs):
+    """
+    Версия страницы и ответ 304/412, как в django.views.decorators.http.condition.
+
+    Returns:
+        tuple: (ETag, Last-Modified в секундах, готовый ответ или None)
+    """
+    etag = etag_func(request, *args, **kwargs)
+    etag = quote_etag(etag) if etag is not None else None
+
+    last_modified = last_modified_func(request, *args, **kwargs)
+    if last_modified:
+        if not timezone.is_aware(last_modified):
+            last_modified = timezone.make_aware(last_modified, datetime.timezone.utc)
+        last_modified = int(last_modified.timestamp())
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    return etag, last_modified, response
+
+
+def _finish_page(request, response, etag, last_modified):
+    """
+    Заголовки версии и кеширования ответа страницы.
+    """
+    if request.method in ('GET', 'HEAD'):
+        if last_modified and not response.has_header('Last-Modified'):
+            response.headers['Last-Modified'] = http_date(last_modified)
+        if etag:
+            response.headers.setdefault('ETag', etag)
+
+    patch_vary_headers(response, ('Cookie',))
+    if request.user.is_authenticated:
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        patch_cache_control(response, no_cache=True)
+    return response
+
+
+def conditional_page(etag_func, last_modified_func):
+    """
+    Декоратор представления с условными GET-запросами.
+
+    Работает как django.views.decorators.http.condition и дополнительно
+    требует у браузера проверять версию страницы при каждом показе.
+
+    Args:
+        etag_func (callable): Функция (request, *args, **kwargs) -> ETag
+        last_modified_func (callable): Функция (request, *args, **kwargs) -> datetime
+    """
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            @wraps(view)
+            async def ainner(request, *args, **kwargs):
+                # Функции версии обращаются к кешу, БД и request.user (сессии),
+                # поэтому выполняются одним переходом в пул потоков
+                etag, last_modified, response = await sync_to_async(_check_conditions)(
+                    request, etag_func, last_modified_func, args, kwargs,
+                )
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return _finish_page(request, response, etag, last_modified)
+            return ainner
+
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            etag, last_modified, response = _check_conditions(
+                request, etag_func, last_modified_func, args, kwargs,
+            )
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return _finish_page(request, response, etag, last_modified)
+        return inner
+    return decorator
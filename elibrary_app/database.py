@@ -0,0 +1,138 @@
+"""
+Чтение страниц каталога с реплики базы данных.
+
+Страницы обзора, книги и списка книг пользователя только читают данные,
+поэтому их запросы можно направить на реплику (settings.DATABASE_REPLICA,
+например копию db.sqlite3, которую поддерживает Litestream или
+периодический sqlite3 .backup). Запись всегда идет в default.
+
+    - представление помечается декоратором use_replica; на время его
+      выполнения (включая вычисление ETag в conditional_page) чтение
+      направляется на реплику через ReplicaRouter
+    - после запроса с записью (POST, PUT, DELETE) ReadYourWritesMiddleware
+      ставит cookie на REPLICA_STICKY_SECONDS: пока она есть, клиент читает
+      из default и видит свои изменения, даже если реплика отстает
+    - сессии всегда читаются из default, чтобы вход и выход не зависели
+      от задержки реплики
+
+Реплика может отставать, поэтому данные, прочитанные с нее, кешируются
+не дольше REPLICA_STICKY_SECONDS (см. replica_cache_timeout).
+"""
+
+import asyncio
+import contextvars
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.deprecation import MiddlewareMixin
+
+# Имя cookie, по которой клиент после записи читает из default
+STICKY_COOKIE = 'db_primary'
+
+# Методы, не изменяющие данные
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+# Приложения, которые всегда читаются из default
+PRIMARY_ONLY_APPS = ('sessions',)
+
+# Псевдоним базы для чтения в текущем запросе (None - default)
+_read_alias = contextvars.ContextVar('elibrary_read_alias', default=None)
+
+
+def _replica_for(request):
+    """
+    Псевдоним реплики для запроса или None, если читать нужно из default.
+    """
+    alias = settings.DATABASE_REPLICA
+    if not alias or alias not in settings.DATABASES:
+        return None
+    if request.method not in SAFE_METHODS or STICKY_COOKIE in request.COOKIES:
+        return None
+    return alias
+
+
+def use_replica(view):
+    """
+    Декоратор представления, читающего данные с реплики.
+
+    Применяется поверх conditional_page, чтобы ETag и содержимое страницы
+    вычислялись по одной и той же базе.
+    """
+    if asyncio.iscoroutinefunction(view):
+        @wraps(view)
+        async def ainner(request, *args, **kwargs):
+            token = _read_alias.set(_replica_for(request))
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _read_alias.reset(token)
+        return ainner
+
+    @wraps(view)
+    def inner(request, *args, **kwargs):
+        token = _read_alias.set(_replica_for(request))
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+    return inner
+
+
+def replica_in_use():
+    """
+    Читает ли текущий запрос с реплики.
+    """
+    return _read_alias.get() is not None
+
+
+def replica_cache_timeout(timeout):
+    """
+    Время хранения в кеше данных, прочитанных в текущем запросе.
+
+    Args:
+        timeout (int | None): Обычное время хранения
+
+    Returns:
+        int | None: Не больше REPLICA_STICKY_SECONDS при чтении с реплики
+    """
+    if not replica_in_use():
+        return timeout
+    if timeout is None:
+        return settings.REPLICA_STICKY_SECONDS
+    return min(timeout, settings.REPLICA_STICKY_SECONDS)
+
+
+class ReplicaRouter:
+    """
+    Маршрутизатор: чтение на реплику внутри use_replica, запись в default.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return DEFAULT_DB_ALIAS
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        # Объект, прочитанный с реплики, сохраняется в default
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплика содержит те же данные, что и default
+        return True
+
+
+class ReadYourWritesMiddleware(MiddlewareMixin):
+    """
+    Cookie чтения из default после запроса с записью.
+    """
+
+    def process_response(self, request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 500:
+            response.set_cookie(
+                STICKY_COOKIE, '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
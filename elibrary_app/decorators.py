@@ -0,0 +1,63 @@
+"""
+Декораторы асинхронных представлений.
+
+В Django 4.2 login_required и require_http_methods оборачивают
+представление синхронной функцией и не могут применяться
+к async def-представлениям. Здесь собраны их асинхронные аналоги
+с тем же поведением.
+"""
+
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.http import HttpResponseNotAllowed
+from django.utils.log import log_response
+
+
+def _is_authenticated(request):
+    """
+    Проверка пользователя (чтение сессии и запрос к БД выполняются синхронно).
+    """
+    return request.user.is_authenticated
+
+
+def async_login_required(view):
+    """
+    Аналог login_required для асинхронного представления.
+
+    Неавторизованный пользователь перенаправляется на LOGIN_URL
+    с параметром next. После проверки request.user уже загружен,
+    и представление может обращаться к нему без перехода в пул потоков.
+    """
+    @wraps(view)
+    async def inner(request, *args, **kwargs):
+        if not await sync_to_async(_is_authenticated)(request):
+            return redirect_to_login(request.get_full_path())
+        return await view(request, *args, **kwargs)
+    return inner
+
+
+def async_require_http_methods(methods):
+    """
+    Аналог require_http_methods для асинхронного представления.
+
+    Args:
+        methods (list): Разрешенные методы в верхнем регистре
+    """
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            if request.method not in methods:
+                response = HttpResponseNotAllowed(methods)
+                log_response(
+                    'Method Not Allowed (%s): %s', request.method, request.path,
+                    response=response, request=request,
+                )
+                return response
+            return await view(request, *args, **kwargs)
+        return inner
+    return decorator
+
+
+async_require_safe = async_require_http_methods(['GET', 'HEAD'])
@@ -0,0 +1,334 @@
+"""
+Отдача PDF-файлов книг с поддержкой Range и условных запросов.
+
+Заменяет раздачу /media/ через django.conf.urls.static, которая читает
+файл целиком и не поддерживает частичные и условные запросы:
+
+    - Range: bytes=... -> 206 Partial Content (просмотр PDF в браузере
+      запрашивает только нужные части файла)
+    - ETag / Last-Modified -> 304 Not Modified без чтения файла
+    - файл передается как файловый объект: WSGI-сервер с поддержкой
+      wsgi.file_wrapper (gunicorn, uWSGI) отправляет его через sendfile
+      без копирования в память процесса
+    - под ASGI (aserve_file) файл читается асинхронно блоками, и медленные
+      клиенты не занимают потоки пула
+    - режим X-Accel-Redirect (nginx) или X-Sendfile (Apache, lighttpd):
+      Django проверяет условия запроса, а передачу выполняет прокси
+
+Режим передачи задается настройками PDF_SENDFILE_BACKEND и
+PDF_SENDFILE_URL_PREFIX.
+"""
+
+import asyncio
+import os
+import re
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date
+
+# Единичный диапазон байтов; несколько диапазонов не поддерживаются,
+# в этом случае отдается весь файл (допускается RFC 9110)
+RANGE_RE = re.compile(r'^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$', re.IGNORECASE)
+
+# Размер блока при чтении файла без sendfile
+BLOCK_SIZE = 64 * 1024
+
+
+class RangeNotSatisfiable(ValueError):
+    """
+    Запрошенный диапазон лежит за пределами файла (ответ 416).
+    """
+
+
+def parse_range(header, size):
+    """
+    Разбор заголовка Range.
+
+    Args:
+        header (str): Значение заголовка Range
+        size (int): Размер файла в байтах
+
+    Returns:
+        tuple | None: (начало, конец) включительно или None, если заголовок
+                      отсутствует или не поддерживается и нужно отдать весь файл
+
+    Raises:
+        RangeNotSatisfiable: Диапазон не пересекается с файлом
+    """
+    match = RANGE_RE.match(header or '')
+    if not match:
+        return None
+
+    start, end = match.groups()
+    if not start and not end:
+        return None
+
+    if not start:
+        # Суффиксный диапазон: последние N байт
+        length = int(end)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable(header)
+        return max(size - length, 0), size - 1
+
+    start = int(start)
+    end = int(end) if end else size - 1
+    if start >= size or end < start:
+        raise RangeNotSatisfiable(header)
+    return start, min(end, size - 1)
+
+
+def file_etag(stat):
+    """
+    Строгий ETag файла по размеру и времени изменения.
+
+    Args:
+        stat (os.stat_result): Результат os.stat для файла
+
+    Returns:
+        str: ETag в кавычках
+    """
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+class RangeFileWrapper:
+    """
+    Файловый объект, ограниченный диапазоном байтов.
+
+    Чтение не выходит за конец диапазона, поэтому ответ корректен
+    на любом сервере. Метод fileno() оставлен, чтобы сервер с sendfile
+    (gunicorn) передавал диапазон без копирования: файл уже спозиционирован
+    на начало диапазона, а длину сервер берет из Content-Length.
+    """
+
+    def __init__(self, filelike, start, length):
+        self.filelike = filelike
+        self.remaining = length
+        filelike.seek(start)
+
+    def read(self, size=-1):
+        """
+        Чтение очередного блока в пределах диапазона.
+        """
+        if self.remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.filelike.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        """
+        Файловый дескриптор для sendfile.
+        """
+        return self.filelike.fileno()
+
+    def close(self):
+        """
+        Закрытие исходного файла.
+        """
+        self.filelike.close()
+
+
+def _sendfile_response(path, content_type):
+    """
+    Ответ без тела с заголовком для передачи файла фронтовым прокси.
+    """
+    response = HttpResponse(content_type=content_type)
+    backend = settings.PDF_SENDFILE_BACKEND
+    if backend == 'nginx':
+        relative = os.path.relpath(path, settings.MEDIA_ROOT).replace(os.sep, '/')
+        response['X-Accel-Redirect'] = quote(settings.PDF_SENDFILE_URL_PREFIX + relative)
+    else:
+        response['X-Sendfile'] = path
+    return response
+
+
+def _prepare(request, path, stat, filename, as_attachment, content_type, etag):
+    """
+    Проверка условий запроса и разбор Range перед отдачей файла.
+
+    Общая часть синхронной (serve_file) и асинхронной (aserve_file) отдачи:
+    файл на этом шаге не открывается.
+
+    Returns:
+        tuple: (готовый ответ 304/412/416 или ответ для прокси либо None,
+                заголовки ответа, диапазон (начало, конец) или None для всего файла)
+    """
+    etag = etag or file_etag(stat)
+    last_modified = int(stat.st_mtime)
+
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(last_modified),
+        'Accept-Ranges': 'bytes',
+        # Браузер хранит файл, но перед использованием проверяет ETag
+        'Cache-Control': 'no-cache',
+    }
+
+    # 304 / 412 без открытия файла
+    conditional = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if conditional is not None:
+        for name, value in headers.items():
+            conditional[name] = value
+        return conditional, headers, None
+
+    disposition = content_disposition_header(as_attachment, filename)
+
+    # Передачу выполняет прокси, включая обработку Range
+    if settings.PDF_SENDFILE_BACKEND:
+        response = _sendfile_response(path, content_type)
+        for name, value in headers.items():
+            response[name] = value
+        response['Content-Disposition'] = disposition
+        return response, headers, None
+
+    # If-Range: диапазон применяется, только если файл не изменился
+    byte_range = None
+    if_range = request.META.get('HTTP_IF_RANGE', '').strip()
+    if not if_range or if_range in (etag, headers['Last-Modified']):
+        try:
+            byte_range = parse_range(request.META.get('HTTP_RANGE'), stat.st_size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            for name, value in headers.items():
+                response[name] = value
+            return response, headers, None
+
+    headers['Content-Disposition'] = disposition
+    return None, headers, byte_range
+
+
+def _finish(response, stat, headers, byte_range):
+    """
+    Заголовки длины и диапазона ответа с телом файла.
+    """
+    if byte_range is None:
+        response['Content-Length'] = stat.st_size
+    else:
+        start, end = byte_range
+        response.status_code = 206
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+
+    for name, value in headers.items():
+        response[name] = value
+    return response
+
+
+def serve_file(request, path, filename, as_attachment=False, content_type='application/pdf', etag=None):
+    """
+    Отдача файла с учетом Range, ETag и If-Modified-Since.
+
+    Args:
+        request (HttpRequest): Объект HTTP-запроса
+        path (str): Абсолютный путь к файлу
+        filename (str): Имя файла для заголовка Content-Disposition
+        as_attachment (bool): Скачивание вместо открытия в браузере
+        content_type (str): MIME-тип файла
+        etag (str): Готовый ETag (например, по хешу содержимого);
+                    по умолчанию вычисляется по размеру и времени изменения
+
+    Returns:
+        HttpResponse: 200, 206, 304, 412 или 416 ответ
+    """
+    stat = os.stat(path)
+    response, headers, byte_range = _prepare(
+        request, path, stat, filename, as_attachment, content_type, etag,
+    )
+    if response is not None:
+        return response
+
+    filelike = open(path, 'rb')
+    if byte_range is None:
+        response = FileResponse(filelike, content_type=content_type)
+    else:
+        start, end = byte_range
+        response = FileResponse(RangeFileWrapper(filelike, start, end - start + 1), content_type=content_type)
+
+    response.block_size = BLOCK_SIZE
+    return _finish(response, stat, headers, byte_range)
+
+
+async def aiter_file(path, start, length, block_size=BLOCK_SIZE):
+    """
+    Асинхронное чтение диапазона файла блоками.
+
+    Каждый блок читается в пуле потоков: поток занят только на время
+    чтения блока с диска, а пока медленный клиент принимает данные,
+    ожидание идет в цикле событий без занятого потока.
+
+    Args:
+        path (str): Абсолютный путь к файлу
+        start (int): Смещение начала диапазона
+        length (int): Длина диапазона в байтах
+        block_size (int): Размер блока
+
+    Yields:
+        bytes: Очередной блок файла
+    """
+    loop = asyncio.get_running_loop()
+    filelike = await loop.run_in_executor(None, open, path, 'rb')
+    try:
+        await loop.run_in_executor(None, filelike.seek, start)
+        remaining = length
+        while remaining > 0:
+            block = await loop.run_in_executor(None, filelike.read, min(block_size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+    finally:
+        filelike.close()
+
+
+async def aserve_file(request, path, filename, as_attachment=False, content_type='application/pdf', etag=None):
+    """
+    Асинхронная отдача файла для ASGI.
+
+    Под ASGI Django не передает FileResponse через sendfile, а читает
+    синхронный итератор целиком в память в пуле потоков. Здесь тело
+    ответа - асинхронный итератор (aiter_file), поэтому один процесс
+    обслуживает сотни одновременных медленных скачиваний без потоков
+    и без буферизации файла.
+
+    Под WSGI асинхронный итератор тоже был бы прочитан целиком, поэтому
+    для WSGI-запроса ответ строится как в serve_file (с wsgi.file_wrapper).
+
+    Args:
+        request (HttpRequest): Объект HTTP-запроса
+        path (str): Абсолютный путь к файлу
+        filename (str): Имя файла для заголовка Content-Disposition
+        as_attachment (bool): Скачивание вместо открытия в браузере
+        content_type (str): MIME-тип файла
+        etag (str): Готовый ETag; по умолчанию по размеру и времени изменения
+
+    Returns:
+        HttpResponse: 200, 206, 304, 412 или 416 ответ
+    """
+    if not isinstance(request, ASGIRequest):
+        return await sync_to_async(serve_file)(
+            request, path, filename,
+            as_attachment=as_attachment, content_type=content_type, etag=etag,
+        )
+
+    loop = asyncio.get_running_loop()
+    stat = await loop.run_in_executor(None, os.stat, path)
+    response, headers, byte_range = _prepare(
+        request, path, stat, filename, as_attachment, content_type, etag,
+    )
+    if response is not None:
+        return response
+
+    start, end = byte_range or (0, stat.st_size - 1)
+    response = StreamingHttpResponse(
+        aiter_file(path, start, end - start + 1),
+        content_type=content_type,
+    )
+    return _finish(response, stat, headers, byte_range)
@@ -0,0 +1,211 @@
+"""
+Потоковая выгрузка метаданных каталога книг.
+
+Используется представлением exportBooks и командой export_books.
+Строки читаются из базы данных итератором пачками по EXPORT_CHUNK_SIZE,
+форматируются и отдаются блоками, поэтому расход памяти не зависит
+от размера каталога.
+
+Форматы: CSV (с заголовком) и JSON Lines (объект на строку). При сжатии
+выходной поток кодируется gzip по мере формирования.
+
+Для инкрементальной выгрузки используется окно по updated_at:
+[modified_since, until), где until - время начала выгрузки; его значение
+передается следующему запуску как modified_since.
+"""
+
+import csv
+import datetime
+import io
+import json
+import zlib
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from elibrary_app.models import EBooksModel
+
+# Поля выгрузки в порядке столбцов CSV
+EXPORT_FIELDS = (
+    'id', 'title', 'summary', 'pages', 'category', 'author_id', 'author',
+    'pdf', 'pdf_sha256', 'created_at', 'updated_at',
+)
+
+# Столбцы, читаемые из базы (имя автора собирается из полей пользователя)
+_COLUMNS = (
+    'id', 'title', 'summary', 'pages', 'category', 'author_id',
+    'author__first_name', 'author__last_name', 'author__username', 'indexed_author',
+    'pdf', 'pdf_sha256', 'created_at', 'updated_at',
+)
+
+# Размер блока, которым данные отдаются клиенту
+BLOCK_SIZE = 64 * 1024
+
+# Форматы выгрузки: MIME-тип и расширение файла
+FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+}
+
+
+def parse_since(value):
+    """
+    Разбор границы modified_since.
+
+    Args:
+        value (str): Дата (YYYY-MM-DD) или дата и время в ISO 8601
+
+    Returns:
+        datetime | None: Время с часовым поясом или None для пустого значения
+
+    Raises:
+        ValueError: Значение не является датой
+    """
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f'Некорректная дата: {value}')
+        moment = datetime.datetime.combine(day, datetime.time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def export_queryset(category=None, author=None, modified_since=None, until=None):
+    """
+    Набор книг для выгрузки.
+
+    Args:
+        category (str): Категория книг
+        author (str): Идентификатор или логин пользователя-автора
+        modified_since (datetime): Нижняя граница updated_at (включительно)
+        until (datetime): Верхняя граница updated_at (не включительно)
+
+    Returns:
+        QuerySet: Кортежи значений _COLUMNS в порядке id
+    """
+    books = EBooksModel.objects.all()
+    if category:
+        books = books.filter(category=category)
+    if author:
+        books = books.filter(author_id=author) if str(author).isdigit() else books.filter(author__username=author)
+    if modified_since:
+        books = books.filter(updated_at__gte=modified_since)
+    if until:
+        books = books.filter(updated_at__lt=until)
+    return books.order_by('id').values_list(*_COLUMNS)
+
+
+def iter_records(queryset, chunk_size=None):
+    """
+    Записи выгрузки по одной, без загрузки всего набора в память.
+
+    Args:
+        queryset (QuerySet): Результат export_queryset
+        chunk_size (int): Количество строк, читаемых из базы за раз
+
+    Yields:
+        dict: Значения EXPORT_FIELDS одной книги
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    for row in queryset.iterator(chunk_size=chunk_size):
+        (book_id, title, summary, pages, category, author_id,
+         first_name, last_name, username, indexed_author,
+         pdf, pdf_sha256, created_at, updated_at) = row
+        if author_id:
+            author = f'{first_name} {last_name}'.strip() or username
+        else:
+            author = indexed_author
+        yield {
+            'id': book_id,
+            'title': title,
+            'summary': summary,
+            'pages': pages,
+            'category': category,
+            'author_id': author_id,
+            'author': author,
+            'pdf': pdf,
+            'pdf_sha256': pdf_sha256,
+            'created_at': created_at.isoformat() if created_at else None,
+            'updated_at': updated_at.isoformat() if updated_at else None,
+        }
+
+
+def _csv_lines(records):
+    """
+    Строки CSV: заголовок и по строке на книгу.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def line(values):
+        writer.writerow(values)
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text
+
+    yield line(EXPORT_FIELDS)
+    for record in records:
+        yield line(['' if record[field] is None else record[field] for field in EXPORT_FIELDS])
+
+
+def _jsonl_lines(records):
+    """
+    Строки JSON Lines: по объекту на книгу.
+    """
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + '\n'
+
+
+def iter_export(records, export_format='csv', compress=False):
+    """
+    Выгрузка в виде последовательности байтовых блоков.
+
+    Строки накапливаются в блоки около BLOCK_SIZE, чтобы не отправлять
+    клиенту (или не сжимать) каждую строку отдельно.
+
+    Args:
+        records (iterable): Записи из iter_records
+        export_format (str): 'csv' или 'jsonl'
+        compress (bool): Сжимать поток gzip
+
+    Yields:
+        bytes: Очередной блок выгрузки
+    """
+    lines = _csv_lines(records) if export_format == 'csv' else _jsonl_lines(records)
+    # wbits=31: заголовок и контрольная сумма формата gzip
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    block = []
+    size = 0
+    for text in lines:
+        data = text.encode('utf-8')
+        block.append(data)
+        size += len(data)
+        if size < BLOCK_SIZE:
+            continue
+        chunk = b''.join(block)
+        block, size = [], 0
+        if compressor:
+            chunk = compressor.compress(chunk)
+        if chunk:
+            yield chunk
+
+    chunk = b''.join(block)
+    if compressor:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
+
+
+def export_filename(export_format, compress=False):
+    """
+    Имя файла выгрузки для заголовка Content-Disposition.
+    """
+    name = f'books.{FORMATS[export_format][1]}'
+    return f'{name}.gz' if compress else name
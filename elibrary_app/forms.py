@@ -25,23 +25,13 @@ class EBookForm(forms.ModelForm):
         - summary: аннотация (TextField)
         - pages: количество страниц (CharField)
         - pdf: PDF-файл книги (FileField)
-        - category: категория книги (ChoiceField)
+        - category: категория книги (ModelChoiceField по таблице Category)
         
     Валидация:
         - Все поля обязательны для заполнения
         - PDF-файл должен быть в формате PDF
-        - Категория выбирается из предопределенного списка
+        - Категория выбирается из таблицы категорий (значение - имя категории)
     """
-    
-    # Определение категорий для выпадающего списка
-    CATEGORY_CHOICES = [
-        ('Education', 'Education'),    # Учебная литература
-        ('Fiction', 'Fiction'),        # Художественная литература
-        ('Science', 'Science')         # Научная литература
-    ]
-    
-    # Поле выбора категории с предопределенными вариантами
-    category = forms.ChoiceField(choices=CATEGORY_CHOICES)
 
     class Meta:
         """
@@ -90,7 +80,8 @@ class EBookForm(forms.ModelForm):
             'placeholder': 'Скачать PDF'
         })
         
-        # Настройка поля "Категория"
+        # Настройка поля "Категория": без пустого варианта, первая категория выбрана
+        self.fields['category'].empty_label = None
         self.fields['category'].widget.attrs.update({
             'class': 'form-control',
             'placeholder': 'Выбрать категорию книги'
@@ -98,4 +89,15 @@ class EBookForm(forms.ModelForm):
 
         # Установка обязательности всех полей формы
         for field_name, field in self.fields.items():
-            field.required = True
\ No newline at end of file
+            field.required = True
+
+    def _get_validation_exclusions(self):
+        """
+        Поля, не проверяемые моделью в full_clean().
+        
+        Категорию уже загрузило поле формы (ModelChoiceField): повторная
+        проверка внешнего ключа моделью была бы лишним запросом EXISTS.
+        """
+        exclude = super()._get_validation_exclusions()
+        exclude.add('category')
+        return exclude
\ No newline at end of file
@@ -0,0 +1,314 @@
+"""
+Массовый импорт каталога книг из каталога PDF-файлов и манифеста.
+
+Манифест описывает книги построчно в формате CSV (с заголовком) или
+JSON Lines (один объект на строку). Поля записи:
+
+    file      - путь к PDF-файлу относительно каталога импорта
+    title     - название книги
+    category  - имя категории из таблицы Category (Education, Fiction, ...)
+    summary   - аннотация (необязательно)
+    pages     - количество страниц (необязательно)
+    author    - логин пользователя-автора (необязательно)
+
+Чтение, проверка и хеширование файлов выполняются параллельно в пуле
+потоков (hashlib и файловый ввод-вывод освобождают GIL). Файл
+копируется в хранилище pdfs/ab/cd/<sha256>.pdf, только если такого
+содержимого там еще нет. Строки вставляются через bulk_create пакетами,
+каждый пакет в своей транзакции; книги, чей PDF уже есть в каталоге
+(совпадает pdf_sha256), пропускаются, поэтому прерванный импорт можно
+просто запустить повторно.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.contrib.auth.models import User
+from django.core.files import File
+from django.db import transaction
+
+from elibrary_app.caching import bump_generation_on_commit
+from elibrary_app.models import Category, EBooksModel, adjust_book_counts, author_display_name
+from elibrary_app.storage import CHUNK_SIZE, content_name, get_pdf_storage
+
+# Сигнатура PDF-файла
+PDF_MAGIC = b'%PDF-'
+
+# Каталог хранилища для PDF-файлов книг (upload_to поля pdf)
+PDF_PREFIX = 'pdfs'
+
+
+class ImportRecordError(ValueError):
+    """
+    Ошибка в записи манифеста или в файле книги (запись пропускается).
+    """
+
+
+def read_manifest(path, manifest_format=None):
+    """
+    Построчное чтение манифеста импорта.
+
+    Args:
+        path (str): Путь к файлу манифеста
+        manifest_format (str): 'csv' или 'jsonl'; по умолчанию определяется по расширению
+
+    Yields:
+        tuple: (номер строки, словарь полей записи или ImportRecordError)
+    """
+    if manifest_format is None:
+        manifest_format = 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+    with open(path, encoding='utf-8-sig', newline='') as stream:
+        if manifest_format == 'csv':
+            # Номер строки с учетом заголовка
+            for line, record in enumerate(csv.DictReader(stream), start=2):
+                yield line, record
+            return
+
+        for line, text in enumerate(stream, start=1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except ValueError as error:
+                yield line, ImportRecordError(f'Некорректный JSON: {error}')
+                continue
+            if not isinstance(record, dict):
+                yield line, ImportRecordError('Запись должна быть объектом JSON')
+                continue
+            yield line, record
+
+
+def validate_record(directory, record, categories):
+    """
+    Проверка полей записи манифеста (без обращения к файлу).
+
+    Args:
+        directory (str): Каталог импорта
+        record (dict): Запись манифеста
+        categories (set): Имена существующих категорий
+
+    Returns:
+        dict: Нормализованные поля книги и абсолютный путь к файлу
+
+    Raises:
+        ImportRecordError: Запись некорректна
+    """
+    fields = {key: str(record.get(key) or '').strip()
+              for key in ('file', 'title', 'category', 'summary', 'pages', 'author')}
+
+    if not fields['file'] or not fields['title']:
+        raise ImportRecordError('Не указаны file или title')
+    if fields['category'] not in categories:
+        raise ImportRecordError(f'Неизвестная категория: {fields["category"]!r}')
+    if len(fields['title']) > 150 or len(fields['pages']) > 100 or len(fields['summary']) > 2000:
+        raise ImportRecordError('Слишком длинное значение title, pages или summary')
+
+    # Путь из манифеста не должен выходить за пределы каталога импорта
+    root = os.path.realpath(directory)
+    path = os.path.realpath(os.path.join(root, fields['file']))
+    if os.path.commonpath([root, path]) != root:
+        raise ImportRecordError(f'Файл вне каталога импорта: {fields["file"]}')
+
+    fields['path'] = path
+    return fields
+
+
+def prepare_file(fields, storage):
+    """
+    Проверка PDF-файла, вычисление хеша и копирование в хранилище.
+
+    Выполняется в потоке пула. Файл читается один раз для хеша
+    и второй раз только при копировании нового содержимого.
+
+    Args:
+        fields (dict): Результат validate_record
+        storage (ContentAddressedStorage): Хранилище PDF-файлов
+
+    Returns:
+        dict: Поля записи с добавленными sha256, name (имя в хранилище) и size
+
+    Raises:
+        ImportRecordError: Файл отсутствует или не является PDF
+    """
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(fields['path'], 'rb') as stream:
+            head = stream.read(CHUNK_SIZE)
+            if not head.startswith(PDF_MAGIC):
+                raise ImportRecordError(f'Файл не является PDF: {fields["file"]}')
+            while head:
+                digest.update(head)
+                size += len(head)
+                head = stream.read(CHUNK_SIZE)
+
+            name = content_name(PDF_PREFIX, digest.hexdigest(), '.pdf')
+            if not storage.exists(name):
+                stream.seek(0)
+                name = storage.save(name, File(stream))
+    except OSError as error:
+        raise ImportRecordError(f'Файл недоступен: {fields["file"]} ({error.strerror})')
+
+    return dict(fields, sha256=digest.hexdigest(), name=name, size=size)
+
+
+class CatalogImport:
+    """
+    Импорт книг пакетами с параллельной обработкой файлов.
+
+    Атрибуты:
+        imported (int): Количество добавленных книг
+        skipped (int): Количество книг, чей PDF уже есть в каталоге
+        failed (int): Количество записей с ошибками
+        bytes (int): Объем прочитанных PDF-файлов
+        errors (list): Пары (номер строки манифеста, текст ошибки)
+    """
+
+    def __init__(self, directory, batch_size=500, workers=4, default_author=None, progress=None):
+        """
+        Args:
+            directory (str): Каталог с PDF-файлами
+            batch_size (int): Количество строк в одном bulk_create и транзакции
+            workers (int): Количество потоков для чтения и хеширования файлов
+            default_author (User): Автор книг без поля author в манифесте
+            progress (callable): Вызывается после каждого пакета с объектом импорта
+        """
+        self.directory = directory
+        self.batch_size = max(batch_size, 1)
+        self.workers = max(workers, 1)
+        self.default_author = default_author
+        self.progress = progress
+        self.storage = get_pdf_storage()
+
+        self.imported = self.skipped = self.failed = self.bytes = 0
+        self.errors = []
+        self.started = None
+        self._authors = {}
+
+    @property
+    def elapsed(self):
+        """
+        Время с начала импорта в секундах.
+        """
+        return time.monotonic() - self.started if self.started else 0.0
+
+    def _fail(self, line, error):
+        self.failed += 1
+        self.errors.append((line, str(error)))
+
+    def _author(self, username):
+        """
+        Пользователь-автор по логину (с кешированием на время импорта).
+        """
+        if not username:
+            return self.default_author
+        if username not in self._authors:
+            self._authors[username] = User.objects.filter(username=username).first()
+        author = self._authors[username]
+        if author is None:
+            raise ImportRecordError(f'Пользователь не найден: {username}')
+        return author
+
+    def run(self, records):
+        """
+        Импорт записей манифеста.
+
+        Args:
+            records (iterable): Пары (номер строки, запись), см. read_manifest
+
+        Returns:
+            CatalogImport: Этот же объект со статистикой
+        """
+        self.started = time.monotonic()
+        categories = set(Category.objects.values_list('name', flat=True))
+        # Ограничение числа задач в очереди: манифест не читается в память целиком
+        window = self.workers * 4
+        batch = []
+
+        def collect(futures):
+            for future in futures:
+                line, author = pending.pop(future)
+                try:
+                    prepared = future.result()
+                except ImportRecordError as error:
+                    self._fail(line, error)
+                    continue
+                self.bytes += prepared['size']
+                batch.append((prepared, author))
+                if len(batch) >= self.batch_size:
+                    self._flush(batch)
+                    batch.clear()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = {}
+            for line, record in records:
+                try:
+                    if isinstance(record, Exception):
+                        raise record
+                    fields = validate_record(self.directory, record, categories)
+                    author = self._author(fields['author'])
+                except ImportRecordError as error:
+                    self._fail(line, error)
+                    continue
+
+                if len(pending) >= window:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(finished)
+                pending[executor.submit(prepare_file, fields, self.storage)] = (line, author)
+
+            collect(wait(pending).done)
+
+        if batch:
+            self._flush(batch)
+        return self
+
+    def _flush(self, batch):
+        """
+        Вставка пакета книг одной транзакцией.
+
+        Книги, чей хеш PDF уже есть в каталоге или повторяется в пакете,
+        пропускаются. bulk_create не вызывает save() и сигналы моделей,
+        поэтому хеш, имя автора для поиска, счетчики книг категорий
+        и инвалидация кеша страницы обзора выполняются здесь; полнотекстовый индекс обновляют триггеры.
+        """
+        digests = {prepared['sha256'] for prepared, _ in batch}
+        existing = set(
+            EBooksModel.objects.filter(pdf_sha256__in=digests).values_list('pdf_sha256', flat=True)
+        )
+
+        books = []
+        for prepared, author in batch:
+            if prepared['sha256'] in existing:
+                self.skipped += 1
+                continue
+            existing.add(prepared['sha256'])
+            book = EBooksModel(
+                title=prepared['title'],
+                summary=prepared['summary'],
+                pages=prepared['pages'],
+                category_id=prepared['category'],
+                pdf=prepared['name'],
+                pdf_sha256=prepared['sha256'],
+                author=author,
+                indexed_author=author_display_name(author) if author else '',
+            )
+            # save() не вызывается: HTML аннотации формируется здесь
+            book.render_summary()
+            books.append(book)
+
+        if books:
+            with transaction.atomic():
+                EBooksModel.objects.bulk_create(books, batch_size=self.batch_size)
+                adjust_book_counts(Counter(book.category_id for book in books))
+                # Кеш обзора инвалидируется после фиксации пачки
+                bump_generation_on_commit(book.category_id for book in books)
+        self.imported += len(books)
+
+        if self.progress:
+            self.progress(self)
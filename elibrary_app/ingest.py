@@ -0,0 +1,144 @@
+"""
+Фоновая обработка загруженных PDF-файлов.
+
+После сохранения файла книги (addBook, editBook) текст PDF извлекается
+в пуле процессов и сохраняется постранично в таблицу BookPage, по которой
+работает полнотекстовый поиск с точностью до страницы.
+
+Разбор PDF занимает CPU, поэтому выполняется в отдельных процессах
+(несколько загрузок обрабатываются параллельно и не блокируют обработчик
+запроса). Дочерние процессы только извлекают текст; запись в базу данных
+выполняется в основном процессе.
+
+Настройка PDF_INGEST_WORKERS задает размер пула; значение 0 отключает
+пул, и текст извлекается синхронно (используется в тестах).
+"""
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from elibrary_app.models import BookPage, EBooksModel
+from elibrary_app.pdftext import extract_pages
+
+logger = logging.getLogger(__name__)
+
+# Размер пакета при записи страниц в базу данных
+PAGES_BATCH_SIZE = 500
+
+# Пул процессов создается при первой загрузке, а не при импорте модуля
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Получение общего пула процессов извлечения текста.
+
+    Returns:
+        ProcessPoolExecutor: Пул с PDF_INGEST_WORKERS процессами
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: дочерние процессы не наследуют соединения с БД и потоки сервера
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.PDF_INGEST_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _executor
+
+
+def store_pages(book_id, pdf_name, texts):
+    """
+    Сохранение извлеченного текста страниц книги.
+
+    Если за время извлечения у книги сменился файл или книга была удалена,
+    результат устарел и не сохраняется.
+
+    Args:
+        book_id (int): Идентификатор книги
+        pdf_name (str): Имя файла, из которого извлечен текст
+        texts (list): Тексты страниц по порядку
+
+    Returns:
+        bool: True, если текст сохранен
+    """
+    with transaction.atomic():
+        current = EBooksModel.objects.filter(id=book_id).values_list('pdf', flat=True).first()
+        if current != pdf_name:
+            return False
+
+        # Старый текст книги полностью заменяется новым
+        BookPage.objects.filter(book_id=book_id).delete()
+        BookPage.objects.bulk_create(
+            (
+                BookPage(book_id=book_id, number=number, text=text)
+                for number, text in enumerate(texts, start=1)
+            ),
+            batch_size=PAGES_BATCH_SIZE,
+        )
+    return True
+
+
+def ingest_book(book):
+    """
+    Синхронное извлечение и сохранение текста книги.
+
+    Args:
+        book (EBooksModel): Книга с сохраненным PDF-файлом
+
+    Returns:
+        int: Количество сохраненных страниц
+    """
+    texts = extract_pages(book.pdf.path)
+    store_pages(book.id, book.pdf.name, texts)
+    return len(texts)
+
+
+def _on_extracted(book_id, pdf_name, future):
+    """
+    Обработка результата дочернего процесса.
+
+    Вызывается в служебном потоке пула, поэтому по завершении закрывает
+    соединения с базой данных, открытые этим потоком.
+    """
+    try:
+        store_pages(book_id, pdf_name, future.result())
+    except Exception:
+        logger.exception('Не удалось извлечь текст книги %s (%s)', book_id, pdf_name)
+    finally:
+        connections.close_all()
+
+
+def schedule_ingest(book):
+    """
+    Постановка книги в очередь на извлечение текста.
+
+    Задача отправляется в пул после фиксации транзакции, чтобы дочерний
+    процесс работал с уже записанным на диск файлом.
+
+    Args:
+        book (EBooksModel): Книга с только что сохраненным PDF-файлом
+    """
+    if not book.pdf:
+        return
+
+    book_id, pdf_name, path = book.id, book.pdf.name, book.pdf.path
+
+    def submit():
+        if not settings.PDF_INGEST_WORKERS:
+            try:
+                store_pages(book_id, pdf_name, extract_pages(path))
+            except Exception:
+                logger.exception('Не удалось извлечь текст книги %s (%s)', book_id, pdf_name)
+            return
+        future = get_executor().submit(extract_pages, path)
+        future.add_done_callback(partial(_on_extracted, book_id, pdf_name))
+
+    transaction.on_commit(submit)
@@ -0,0 +1,30 @@
+"""
+Команда удаления брошенных загрузок по частям.
+
+Использование:
+    python manage.py clear_uploads
+
+Удаляет сеансы загрузки старше CHUNKED_UPLOAD_EXPIRY секунд вместе
+с собираемыми файлами и старые файлы .part без сеанса
+(elibrary_app.uploads.discard_expired_uploads). Запускайте по расписанию
+(например, раз в час из cron).
+"""
+
+from django.core.management.base import BaseCommand
+
+from elibrary_app.uploads import discard_expired_uploads
+
+
+class Command(BaseCommand):
+    """
+    Удаление брошенных сеансов загрузки и их файлов.
+    """
+
+    help = 'Удаляет брошенные сеансы загрузки по частям и их файлы'
+
+    def handle(self, *args, **options):
+        """
+        Выполнение команды.
+        """
+        sessions, orphans = discard_expired_uploads()
+        self.stdout.write(self.style.SUCCESS(f'Удалено сеансов: {sessions}, файлов без сеанса: {orphans}'))
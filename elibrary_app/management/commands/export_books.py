@@ -0,0 +1,85 @@
+"""
+Команда потоковой выгрузки метаданных каталога.
+
+Использование:
+    python manage.py export_books [--format csv|jsonl] [--gzip]
+        [--category КАТЕГОРИЯ] [--author ID|ЛОГИН] [--modified-since ДАТА]
+        [--output ФАЙЛ]
+
+Без --output выгрузка пишется в стандартный вывод. Время начала
+выгрузки выводится в stderr: его можно передать следующему запуску
+как --modified-since для инкрементальной выгрузки.
+"""
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from elibrary_app.export import FORMATS, export_queryset, iter_export, iter_records, parse_since
+
+
+class Command(BaseCommand):
+    """
+    Выгрузка книг в CSV или JSON Lines с постоянным расходом памяти.
+    """
+
+    help = 'Выгружает метаданные книг в CSV или JSON Lines (с фильтрами и gzip)'
+
+    def add_arguments(self, parser):
+        """
+        Определение аргументов командной строки.
+        """
+        parser.add_argument(
+            '--format',
+            choices=sorted(FORMATS),
+            default='csv',
+            help='Формат выгрузки',
+        )
+        parser.add_argument('--gzip', action='store_true', help='Сжать выгрузку gzip')
+        parser.add_argument('--category', help='Только книги категории')
+        parser.add_argument('--author', help='Идентификатор или логин автора')
+        parser.add_argument(
+            '--modified-since',
+            help='Только книги, измененные начиная с даты (ISO 8601)',
+        )
+        parser.add_argument('--output', help='Файл выгрузки (по умолчанию stdout)')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help='Количество строк, читаемых из базы за раз',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Выполнение команды.
+        """
+        try:
+            modified_since = parse_since(options['modified_since'])
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        until = timezone.now()
+        books = export_queryset(
+            category=options['category'],
+            author=options['author'],
+            modified_since=modified_since,
+            until=until,
+        )
+        blocks = iter_export(
+            iter_records(books, options['chunk_size']),
+            options['format'],
+            options['gzip'],
+        )
+
+        if options['output']:
+            with open(options['output'], 'wb') as output:
+                for block in blocks:
+                    output.write(block)
+        else:
+            output = getattr(self.stdout, 'buffer', None) or sys.stdout.buffer
+            for block in blocks:
+                output.write(block)
+            output.flush()
+
+        self.stderr.write(f'Выгрузка до {until.isoformat()}')
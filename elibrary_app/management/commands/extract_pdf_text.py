@@ -0,0 +1,88 @@
+"""
+Команда извлечения текста из PDF-файлов уже загруженных книг.
+
+Использование:
+    python manage.py extract_pdf_text [--all] [--workers N]
+
+По умолчанию обрабатываются только книги, для которых текст еще
+не извлечен. Файлы разбираются параллельно в пуле процессов,
+результаты сохраняются в основном процессе по мере готовности.
+"""
+
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
+
+from elibrary_app.ingest import store_pages
+from elibrary_app.models import BookPage, EBooksModel
+from elibrary_app.pdftext import extract_pages
+
+
+class Command(BaseCommand):
+    """
+    Заполнение постраничного текстового индекса для существующих книг.
+    """
+
+    help = 'Извлекает текст из PDF-файлов книг и сохраняет его постранично'
+
+    def add_arguments(self, parser):
+        """
+        Определение аргументов командной строки.
+        """
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Обработать все книги, включая уже проиндексированные',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.PDF_INGEST_WORKERS or 1,
+            help='Количество процессов для разбора PDF',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Выполнение команды.
+        """
+        books = EBooksModel.objects.exclude(pdf='').order_by('id')
+        if not options['all']:
+            books = books.filter(~Exists(BookPage.objects.filter(book=OuterRef('pk'))))
+
+        workers = max(options['workers'], 1)
+        # Ограничение числа задач в очереди, чтобы не держать в памяти весь каталог
+        window = workers * 4
+        done_count = failed_count = 0
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+        ) as executor:
+            pending = {}
+
+            def collect(futures):
+                nonlocal done_count, failed_count
+                for future in futures:
+                    book_id, pdf_name = pending.pop(future)
+                    try:
+                        store_pages(book_id, pdf_name, future.result())
+                        done_count += 1
+                    except Exception as error:
+                        failed_count += 1
+                        self.stderr.write(f'Книга {book_id} ({pdf_name}): {error}')
+
+            for book in books.only('id', 'pdf').iterator(chunk_size=500):
+                if len(pending) >= window:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(finished)
+                future = executor.submit(extract_pages, book.pdf.path)
+                pending[future] = (book.id, book.pdf.name)
+
+            collect(wait(pending).done)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Текст извлечен: {done_count}, ошибок: {failed_count}'
+        ))
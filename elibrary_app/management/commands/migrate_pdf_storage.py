@@ -0,0 +1,93 @@
+"""
+Команда переноса PDF-файлов в хранилище с адресацией по содержимому.
+
+Использование:
+    python manage.py migrate_pdf_storage [--dry-run]
+
+Файлы книг, загруженные до появления ContentAddressedStorage
+(pdfs/<имя>_<суффикс>.pdf), переносятся в pdfs/ab/cd/<sha256>.pdf.
+Одинаковые файлы сливаются в один, старый файл удаляется, когда
+на него больше не ссылается ни одна книга.
+"""
+
+from django.core.files import File
+from django.core.management.base import BaseCommand
+
+from elibrary_app.models import EBooksModel
+from elibrary_app.storage import digest_from_name
+
+# Количество книг, читаемых одним запросом
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    """
+    Перенос существующих PDF-файлов в адресуемое по хешу хранилище.
+    """
+
+    help = 'Переносит PDF-файлы книг в хранилище pdfs/ab/cd/<sha256>.pdf с дедупликацией'
+
+    def add_arguments(self, parser):
+        """
+        Определение аргументов командной строки.
+        """
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать количество книг для переноса',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Выполнение команды.
+        """
+        books = EBooksModel.objects.filter(pdf_sha256='').exclude(pdf='').only('id', 'pdf')
+
+        if options['dry_run']:
+            self.stdout.write(f'Книг для переноса: {books.count()}')
+            return
+
+        moved = missing = 0
+        digests = set()
+        for book in self._batches(books):
+            storage = book.pdf.storage
+            old_name = book.pdf.name
+            if not storage.exists(old_name):
+                missing += 1
+                self.stderr.write(f'Книга {book.id}: файл {old_name} не найден')
+                continue
+
+            # Хеш вычисляется при записи, итоговое имя возвращает хранилище
+            with storage.open(old_name, 'rb') as stream:
+                new_name = storage.save(old_name, File(stream))
+
+            digest = digest_from_name(new_name)
+            EBooksModel.objects.filter(id=book.id).update(pdf=new_name, pdf_sha256=digest)
+            digests.add(digest)
+            moved += 1
+
+            # Старый файл удаляется, если на него больше нет ссылок
+            if not EBooksModel.objects.filter(pdf=old_name).exists():
+                storage.delete(old_name)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Перенесено книг: {moved}, уникальных файлов: {len(digests)}, '
+            f'файлов не найдено: {missing}'
+        ))
+
+    def _batches(self, books):
+        """
+        Книги пачками по возрастанию id.
+
+        Каждая пачка читается целиком до обновления ее строк: запись
+        в таблицу при открытом курсоре iterator() в SQLite может
+        пропустить или повторить строки. Книги с ненайденным файлом
+        остаются в выборке, но следующая пачка начинается после них.
+        """
+        last_id = 0
+        while True:
+            batch = list(books.filter(id__gt=last_id).order_by('id')[:BATCH_SIZE])
+            if not batch:
+                return
+            yield from batch
+            last_id = batch[-1].id
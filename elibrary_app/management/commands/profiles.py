@@ -0,0 +1,59 @@
+"""
+Команда вывода сохраненных профилей запросов.
+
+Использование:
+    python manage.py profiles [представление ...] [--limit N] [--sort поле] [--clear]
+
+Профили каждого представления (см. elibrary_app.profiling) объединяются,
+и выводятся функции с наибольшим накопленным временем.
+"""
+
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from elibrary_app.profiling import get_store, view_directory
+
+# Допустимые ключи сортировки pstats
+SORT_KEYS = ('cumulative', 'tottime', 'calls', 'ncalls')
+
+
+class Command(BaseCommand):
+    """
+    Сводка профилей запросов по представлениям.
+    """
+
+    help = 'Объединяет сохраненные профили запросов по представлениям и выводит самые затратные функции'
+
+    def add_arguments(self, parser):
+        """
+        Определение аргументов командной строки.
+        """
+        parser.add_argument('views', nargs='*', help='Имена представлений (по умолчанию все)')
+        parser.add_argument('--limit', type=int, default=20, help='Количество выводимых функций')
+        parser.add_argument('--sort', choices=SORT_KEYS, default='cumulative', help='Ключ сортировки')
+        parser.add_argument('--clear', action='store_true', help='Удалить профили после вывода')
+
+    def handle(self, *args, **options):
+        """
+        Выполнение команды.
+        """
+        store = get_store()
+        views = store.views()
+        if options['views']:
+            wanted = [view_directory(name) for name in options['views']]
+            missing = [name for name in wanted if name not in views]
+            if missing:
+                raise CommandError(f'Нет профилей для представлений: {", ".join(missing)}')
+            views = {name: views[name] for name in wanted}
+        if not views:
+            self.stdout.write('Профилей нет')
+            return
+
+        for name, paths in views.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{name}: профилей {len(paths)}'))
+            stats = store.merged(paths, stream=self.stdout)
+            stats.strip_dirs().sort_stats(options['sort']).print_stats(options['limit'])
+            if options['clear']:
+                for path in paths:
+                    os.remove(path)
@@ -0,0 +1,31 @@
+"""
+Команда пересчета рейтинга популярных книг.
+
+Использование:
+    python manage.py rank_books
+
+Заново заполняет таблицу PopularBook по счетчикам просмотров
+и скачиваний (elibrary_app.popularity.rebuild_ranking). Серверные
+процессы пересчитывают рейтинг сами раз в POPULAR_REFRESH_INTERVAL
+секунд; команда нужна, чтобы обновить его сразу (например, после
+изменения POPULAR_LIMIT или POPULAR_DOWNLOAD_WEIGHT).
+"""
+
+from django.core.management.base import BaseCommand
+
+from elibrary_app.popularity import rebuild_ranking
+
+
+class Command(BaseCommand):
+    """
+    Пересчет таблицы рейтинга популярных книг.
+    """
+
+    help = 'Пересчитывает рейтинг популярных книг по счетчикам просмотров и скачиваний'
+
+    def handle(self, *args, **options):
+        """
+        Выполнение команды.
+        """
+        total = rebuild_ranking()
+        self.stdout.write(self.style.SUCCESS(f'Рейтинг пересчитан, строк: {total}'))
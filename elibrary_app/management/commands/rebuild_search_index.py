@@ -0,0 +1,33 @@
+"""
+Команда перестроения полнотекстового индекса книг.
+
+Использование:
+    python manage.py rebuild_search_index
+
+Заново заполняет таблицы FTS5 из EBooksModel и BookPage и оптимизирует их.
+Нужна после ручного изменения данных в обход триггеров
+или восстановления базы из резервной копии.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from elibrary_app.search import rebuild_index
+
+
+class Command(BaseCommand):
+    """
+    Перестроение полнотекстового индекса каталога с нуля.
+    """
+
+    help = 'Перестраивает полнотекстовые индексы (FTS5) книг и текста страниц PDF'
+
+    def handle(self, *args, **options):
+        """
+        Выполнение команды.
+        """
+        if connection.vendor != 'sqlite':
+            raise CommandError('Полнотекстовый индекс поддерживается только для SQLite')
+
+        total = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'Индекс перестроен, книг в индексе: {total}'))
@@ -0,0 +1,79 @@
+"""
+Команда заполнения HTML и краткой аннотации книг.
+
+Использование:
+    python manage.py render_summaries [--all] [--batch-size N]
+
+HTML аннотации (summary_html) и краткая аннотация для страницы обзора
+(summary_excerpt) формируются при сохранении книги. Команда заполняет их
+для книг, сохраненных до появления этих столбцов или вставленных
+в обход save(); с --all формирует их заново для всех книг (после
+изменения render_summary_html или SUMMARY_EXCERPT_LENGTH).
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from elibrary_app.models import EBooksModel
+
+
+def render_summaries(queryset, batch_size):
+    """
+    Заполнение summary_html и summary_excerpt пакетами по возрастанию id.
+
+    Args:
+        queryset (QuerySet): Книги для обработки
+        batch_size (int): Количество книг в одном UPDATE
+
+    Returns:
+        int: Количество обработанных книг
+    """
+    queryset = queryset.only('id', 'summary').order_by('id')
+    total = 0
+    last_id = 0
+    while True:
+        books = list(queryset.filter(id__gt=last_id)[:batch_size])
+        if not books:
+            return total
+        for book in books:
+            book.render_summary()
+        EBooksModel.objects.bulk_update(books, ['summary_html', 'summary_excerpt'])
+        total += len(books)
+        last_id = books[-1].id
+
+
+class Command(BaseCommand):
+    """
+    Заполнение summary_html и summary_excerpt книг.
+    """
+
+    help = 'Формирует HTML и краткую аннотацию книг, у которых они не заполнены'
+
+    def add_arguments(self, parser):
+        """
+        Определение аргументов командной строки.
+        """
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Сформировать заново для всех книг',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Количество книг в одном UPDATE',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Выполнение команды.
+        """
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть больше нуля')
+
+        books = EBooksModel.objects.all()
+        if not options['all']:
+            # Пустая аннотация дает пустой HTML: такие книги не выбираются
+            books = books.filter(summary_html='').exclude(summary='')
+        total = render_summaries(books, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Аннотаций сформировано: {total}'))
@@ -0,0 +1,64 @@
+"""
+Команда обновления сторонних статических файлов (Bootstrap) в static/vendor/.
+
+Использование:
+    python manage.py vendor_assets [--force]
+
+Файлы и их хеши SRI перечислены в elibrary_app.assets.VENDOR_ASSETS;
+закрепленные версии хранятся в репозитории. Команда нужна при смене
+версии (новые путь, URL и хеш в VENDOR_ASSETS) или если файлов нет.
+Скачанный файл сохраняется, только если его хеш совпал с ожидаемым;
+после скачивания файлы нужно добавить в репозиторий и выполнить collectstatic.
+"""
+
+import os
+import urllib.request
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from elibrary_app.assets import VENDOR_ASSETS, sri_digest, vendored
+
+
+class Command(BaseCommand):
+    """
+    Скачивание сторонних CSS и JavaScript с проверкой хеша.
+    """
+
+    help = 'Скачивает Bootstrap и другие сторонние файлы в static/vendor/ с проверкой SRI'
+
+    def add_arguments(self, parser):
+        """
+        Определение аргументов командной строки.
+        """
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Скачать заново уже сохраненные файлы',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Выполнение команды.
+        """
+        root = settings.STATICFILES_DIRS[0]
+        for name, (path, url, integrity) in VENDOR_ASSETS.items():
+            target = os.path.join(root, *path.split('/'))
+            if os.path.exists(target) and not options['force']:
+                self.stdout.write(f'{name}: уже скачан ({path})')
+                continue
+
+            with urllib.request.urlopen(url, timeout=30) as response:
+                content = response.read()
+
+            algorithm, expected = integrity.split('-', 1)
+            if sri_digest(content, algorithm) != expected:
+                raise CommandError(f'{name}: хеш {url} не совпадает с {integrity}')
+
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as stream:
+                stream.write(content)
+            self.stdout.write(f'{name}: сохранен {path} ({len(content)} байт)')
+
+        vendored.cache_clear()
+        self.stdout.write(self.style.SUCCESS('Готово; выполните collectstatic'))
@@ -0,0 +1,30 @@
+"""
+Команда прогрева: шаблоны, маршруты, доступность базы и кеш страницы обзора.
+
+Использование:
+    python manage.py warmup
+
+Выполняет те же шаги, что и прогрев воркера при запуске (elibrary_app.warmup),
+и выводит время каждого шага. Кеш приложения общий для процессов сервера,
+поэтому команда после развертывания заполняет его для всех воркеров.
+"""
+
+from django.core.management.base import BaseCommand
+
+from elibrary_app.warmup import warmup
+
+
+class Command(BaseCommand):
+    """
+    Прогрев приложения с выводом времени шагов.
+    """
+
+    help = 'Компилирует шаблоны, проверяет маршруты и доступность базы, заполняет кеш обзора'
+
+    def handle(self, *args, **options):
+        """
+        Выполнение команды.
+        """
+        for name, result, elapsed in warmup():
+            self.stdout.write(f'{name:<10} {result:>6}  {elapsed * 1000:8.1f} мс')
+        self.stdout.write(self.style.SUCCESS('Прогрев завершен'))
@@ -0,0 +1,373 @@
+"""
+Метрики обработки запросов: Server-Timing и эндпоинт /metrics.
+
+RequestMetricsMiddleware замеряет для каждого запроса:
+
+    - имя представления (resolver_match.view_name)
+    - число SQL-запросов и суммарное время в базе данных
+    - время рендеринга шаблонов
+    - полное время обработки
+
+Значения отдаются клиенту в заголовке Server-Timing (видны во вкладке
+Network инструментов разработчика) и накапливаются в гистограммах,
+которые эндпоинт /metrics отдает в текстовом формате Prometheus.
+
+SQL-запросы учитываются обработчиком connection.execute_wrapper,
+который ставится на каждое новое соединение (сигнал connection_created).
+Текущий запрос обработчик находит через contextvars, поэтому учитываются
+и запросы асинхронных представлений, выполняемые в пуле потоков.
+Время шаблонов измеряет бэкенд DjangoTemplates (settings.TEMPLATES).
+
+Счетчики ведутся отдельно для каждого потока и суммируются только при
+чтении /metrics: на пути запроса нет блокировок. Значения относятся
+к одному процессу сервера; при нескольких воркерах каждый собирается
+отдельно.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+
+from asgiref.sync import markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+from django.template.backends.django import DjangoTemplates
+
+# Границы корзин гистограмм
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Гистограммы с меткой view: имя -> (описание, границы корзин)
+HISTOGRAMS = {
+    'elibrary_request_duration_seconds': ('Полное время обработки запроса', DURATION_BUCKETS),
+    'elibrary_db_queries': ('Число SQL-запросов за запрос', QUERY_BUCKETS),
+    'elibrary_db_duration_seconds': ('Время SQL-запросов за запрос', DURATION_BUCKETS),
+    'elibrary_template_duration_seconds': ('Время рендеринга шаблонов за запрос', DURATION_BUCKETS),
+}
+
+# Счетчик запросов с метками view, method, status
+REQUESTS_TOTAL = 'elibrary_requests_total'
+
+# Счетчики: имя -> описание (значения добавляются через registry.inc)
+COUNTERS = {
+    REQUESTS_TOTAL: 'Число обработанных запросов',
+    'elibrary_throttle_attempts_total': 'Попытки входа и регистрации, проверенные ограничителем',
+    'elibrary_throttle_denied_total': 'Попытки, отклоненные ограничителем (ответ 429)',
+}
+
+# Тип содержимого текстового формата Prometheus
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Замеры текущего запроса (None вне обработки запроса)
+_current = contextvars.ContextVar('elibrary_request_stats', default=None)
+
+
+class RequestStats:
+    """
+    Замеры одного запроса.
+    """
+
+    __slots__ = ('started', 'queries', 'db_time', 'template_time')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+
+
+class Registry:
+    """
+    Гистограммы и счетчики процесса.
+
+    Каждый поток пишет в собственный словарь (shard); блокировка берется
+    только при первом обращении потока, чтобы добавить его словарь в список.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self):
+        """
+        Словарь замеров текущего потока.
+        """
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def inc(self, name, labels):
+        """
+        Увеличение счетчика.
+
+        Args:
+            name (str): Имя счетчика из COUNTERS
+            labels (tuple): Пары (метка, значение)
+        """
+        shard = self._shard()
+        key = (name, labels)
+        shard[key] = shard.get(key, 0) + 1
+
+    def observe(self, name, labels, value):
+        """
+        Добавление значения в гистограмму.
+
+        Args:
+            name (str): Имя гистограммы из HISTOGRAMS
+            labels (tuple): Пары (метка, значение)
+            value (float): Наблюдаемое значение
+        """
+        shard = self._shard()
+        key = (name, labels)
+        buckets = HISTOGRAMS[name][1]
+        state = shard.get(key)
+        if state is None:
+            # Счетчики корзин (не накопительные), сумма и количество
+            state = shard[key] = [[0] * len(buckets), 0.0, 0]
+        for position, bound in enumerate(buckets):
+            if value <= bound:
+                state[0][position] += 1
+                break
+        state[1] += value
+        state[2] += 1
+
+    def collect(self):
+        """
+        Сумма замеров всех потоков.
+
+        Returns:
+            tuple: (счетчики {(имя, метки): значение},
+                    гистограммы {(имя, метки): [корзины, сумма, количество]})
+        """
+        counters, histograms = {}, {}
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            for key, value in list(shard.items()):
+                if isinstance(value, int):
+                    counters[key] = counters.get(key, 0) + value
+                    continue
+                total = histograms.setdefault(key, [[0] * len(value[0]), 0.0, 0])
+                total[0] = [a + b for a, b in zip(total[0], value[0])]
+                total[1] += value[1]
+                total[2] += value[2]
+        return counters, histograms
+
+    def clear(self):
+        """
+        Сброс всех замеров (для тестов).
+        """
+        with self._shards_lock:
+            for shard in self._shards:
+                shard.clear()
+
+
+registry = Registry()
+
+
+def _format_labels(labels, extra=()):
+    """
+    Метки в формате Prometheus: {name="value",...}.
+    """
+    pairs = tuple(labels) + tuple(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def render_prometheus(source=None):
+    """
+    Текстовое представление метрик для Prometheus.
+
+    Args:
+        source (Registry): Реестр замеров (по умолчанию общий реестр процесса)
+
+    Returns:
+        str: Текст в формате exposition format 0.0.4
+    """
+    counters, histograms = (source or registry).collect()
+    lines = []
+    for name, description in COUNTERS.items():
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} counter')
+        for (metric, labels), value in sorted(counters.items()):
+            if metric == name:
+                lines.append(f'{name}{_format_labels(labels)} {value}')
+
+    for name, (description, buckets) in HISTOGRAMS.items():
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} histogram')
+        for (metric, labels), (counts, total, count) in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, bucket in zip(buckets, counts):
+                cumulative += bucket
+                lines.append(f'{name}_bucket{_format_labels(labels, [("le", bound)])} {cumulative}')
+            lines.append(f'{name}_bucket{_format_labels(labels, [("le", "+Inf")])} {count}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {total:.6f}')
+            lines.append(f'{name}_count{_format_labels(labels)} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+def _timed_execute(execute, sql, params, many, context):
+    """
+    Обработчик execute_wrapper: учет SQL-запроса в замерах текущего запроса.
+    """
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - start
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """
+    Подключение учета SQL-запросов к новому соединению (сигнал connection_created).
+    """
+    if _timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_timed_execute)
+
+
+class TimedTemplate:
+    """
+    Шаблон, время рендеринга которого учитывается в замерах запроса.
+    """
+
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        stats = _current.get()
+        if stats is None:
+            return self.template.render(context, request)
+        start = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            stats.template_time += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    Бэкенд DjangoTemplates с замером времени рендеринга.
+
+    Учитываются шаблоны верхнего уровня (render, render_to_string);
+    {% include %} и {% extends %} входят во время своего шаблона.
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
+
+
+def _view_name(request):
+    """
+    Имя представления для метки view (ограниченный набор значений).
+    """
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else 'unmatched'
+
+
+def _server_timing(stats, total):
+    """
+    Значение заголовка Server-Timing.
+    """
+    return (
+        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries", '
+        f'tpl;dur={stats.template_time * 1000:.1f}, '
+        f'total;dur={total * 1000:.1f}'
+    )
+
+
+class RequestMetricsMiddleware:
+    """
+    Замер запросов: заголовок Server-Timing и гистограммы для /metrics.
+
+    Работает и в синхронном (WSGI), и в асинхронном (ASGI) стеке
+    middleware. Время потоковых ответов учитывается до начала передачи тела.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = _current.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._record(request, response, stats)
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._record(request, response, stats)
+
+    def _record(self, request, response, stats):
+        """
+        Запись замеров запроса в реестр и заголовок ответа.
+        """
+        total = time.perf_counter() - stats.started
+        labels = (('view', _view_name(request)),)
+
+        registry.inc(REQUESTS_TOTAL, labels + (('method', request.method), ('status', response.status_code)))
+        registry.observe('elibrary_request_duration_seconds', labels, total)
+        registry.observe('elibrary_db_queries', labels, stats.queries)
+        registry.observe('elibrary_db_duration_seconds', labels, stats.db_time)
+        registry.observe('elibrary_template_duration_seconds', labels, stats.template_time)
+
+        if settings.SERVER_TIMING:
+            response['Server-Timing'] = _server_timing(stats, total)
+        return response
+
+
+def metrics_response(request):
+    """
+    Ответ эндпоинта /metrics.
+
+    Если задан settings.METRICS_TOKEN, требуется заголовок
+    Authorization: Bearer <токен>.
+
+    Args:
+        request (HttpRequest): Объект HTTP-запроса
+
+    Returns:
+        HttpResponse: Метрики в формате Prometheus или 403
+    """
+    token = settings.METRICS_TOKEN
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return HttpResponse('Доступ запрещен', status=403, content_type='text/plain; charset=utf-8')
+    return HttpResponse(render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elibrary_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ebooksmodel',
+            index=models.Index(fields=['category', 'title', 'id'], name='ebook_category_title_idx'),
+        ),
+    ]
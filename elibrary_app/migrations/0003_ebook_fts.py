@@ -0,0 +1,76 @@
+# Полнотекстовый индекс книг на базе SQLite FTS5
+
+from django.db import migrations
+
+
+# Таблица FTS5 с внешним содержимым: сам текст хранится только в
+# elibrary_app_ebooksmodel, индекс синхронизируется триггерами, поэтому
+# в него попадают и обычные save()/delete(), и массовые операции ORM.
+FTS_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS elibrary_app_ebook_fts USING fts5(
+        title, author, summary,
+        content='elibrary_app_ebooksmodel',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS elibrary_app_ebook_fts_ai
+    AFTER INSERT ON elibrary_app_ebooksmodel BEGIN
+        INSERT INTO elibrary_app_ebook_fts(rowid, title, author, summary)
+        VALUES (new.id, new.title, new.author, new.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS elibrary_app_ebook_fts_ad
+    AFTER DELETE ON elibrary_app_ebooksmodel BEGIN
+        INSERT INTO elibrary_app_ebook_fts(elibrary_app_ebook_fts, rowid, title, author, summary)
+        VALUES ('delete', old.id, old.title, old.author, old.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS elibrary_app_ebook_fts_au
+    AFTER UPDATE OF title, author, summary ON elibrary_app_ebooksmodel BEGIN
+        INSERT INTO elibrary_app_ebook_fts(elibrary_app_ebook_fts, rowid, title, author, summary)
+        VALUES ('delete', old.id, old.title, old.author, old.summary);
+        INSERT INTO elibrary_app_ebook_fts(rowid, title, author, summary)
+        VALUES (new.id, new.title, new.author, new.summary);
+    END
+    """,
+    # Индексация книг, добавленных до появления таблицы
+    "INSERT INTO elibrary_app_ebook_fts(elibrary_app_ebook_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS elibrary_app_ebook_fts_au",
+    "DROP TRIGGER IF EXISTS elibrary_app_ebook_fts_ad",
+    "DROP TRIGGER IF EXISTS elibrary_app_ebook_fts_ai",
+    "DROP TABLE IF EXISTS elibrary_app_ebook_fts",
+]
+
+
+def create_fts(apps, schema_editor):
+    # FTS5 есть только в SQLite; на других СУБД поиск не создается
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in FTS_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elibrary_app', '0002_ebook_category_title_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
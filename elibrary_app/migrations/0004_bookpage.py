@@ -0,0 +1,88 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Полнотекстовый индекс по тексту страниц, синхронизируемый триггерами
+# (аналогично elibrary_app_ebook_fts из миграции 0003_ebook_fts)
+FTS_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS elibrary_app_bookpage_fts USING fts5(
+        text,
+        content='elibrary_app_bookpage',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS elibrary_app_bookpage_fts_ai
+    AFTER INSERT ON elibrary_app_bookpage BEGIN
+        INSERT INTO elibrary_app_bookpage_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS elibrary_app_bookpage_fts_ad
+    AFTER DELETE ON elibrary_app_bookpage BEGIN
+        INSERT INTO elibrary_app_bookpage_fts(elibrary_app_bookpage_fts, rowid, text)
+        VALUES ('delete', old.id, old.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS elibrary_app_bookpage_fts_au
+    AFTER UPDATE OF text ON elibrary_app_bookpage BEGIN
+        INSERT INTO elibrary_app_bookpage_fts(elibrary_app_bookpage_fts, rowid, text)
+        VALUES ('delete', old.id, old.text);
+        INSERT INTO elibrary_app_bookpage_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS elibrary_app_bookpage_fts_au",
+    "DROP TRIGGER IF EXISTS elibrary_app_bookpage_fts_ad",
+    "DROP TRIGGER IF EXISTS elibrary_app_bookpage_fts_ai",
+    "DROP TABLE IF EXISTS elibrary_app_bookpage_fts",
+]
+
+
+def create_fts(apps, schema_editor):
+    # FTS5 есть только в SQLite; на других СУБД поиск не создается
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in FTS_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elibrary_app', '0003_ebook_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookPage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField()),
+                ('text', models.TextField(blank=True)),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='text_pages', to='elibrary_app.ebooksmodel')),
+            ],
+            options={
+                'ordering': ['book', 'number'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='bookpage',
+            constraint=models.UniqueConstraint(fields=('book', 'number'), name='bookpage_book_number_uniq'),
+        ),
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:30
+
+from django.db import migrations, models
+import elibrary_app.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elibrary_app', '0004_bookpage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ebooksmodel',
+            name='pdf_sha256',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='ebooksmodel',
+            name='pdf',
+            field=models.FileField(storage=elibrary_app.storage.get_pdf_storage, upload_to='pdfs/'),
+        ),
+    ]
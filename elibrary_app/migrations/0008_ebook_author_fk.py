@@ -0,0 +1,146 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:20
+
+from importlib import import_module
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+import django.db.models.deletion
+
+
+# Индекс пересоздается: столбец author теперь внешний ключ, а имя автора
+# для поиска хранится в indexed_author (синхронизируется с пользователем
+# сигналом, см. elibrary_app.signals). Триггеры ссылаются только на таблицу
+# книг, поэтому пересоздание других таблиц миграциями их не затрагивает.
+FTS_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS elibrary_app_ebook_fts USING fts5(
+        title, indexed_author, summary,
+        content='elibrary_app_ebooksmodel',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS elibrary_app_ebook_fts_ai
+    AFTER INSERT ON elibrary_app_ebooksmodel BEGIN
+        INSERT INTO elibrary_app_ebook_fts(rowid, title, indexed_author, summary)
+        VALUES (new.id, new.title, new.indexed_author, new.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS elibrary_app_ebook_fts_ad
+    AFTER DELETE ON elibrary_app_ebooksmodel BEGIN
+        INSERT INTO elibrary_app_ebook_fts(elibrary_app_ebook_fts, rowid, title, indexed_author, summary)
+        VALUES ('delete', old.id, old.title, old.indexed_author, old.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS elibrary_app_ebook_fts_au
+    AFTER UPDATE OF title, indexed_author, summary ON elibrary_app_ebooksmodel BEGIN
+        INSERT INTO elibrary_app_ebook_fts(elibrary_app_ebook_fts, rowid, title, indexed_author, summary)
+        VALUES ('delete', old.id, old.title, old.indexed_author, old.summary);
+        INSERT INTO elibrary_app_ebook_fts(rowid, title, indexed_author, summary)
+        VALUES (new.id, new.title, new.indexed_author, new.summary);
+    END
+    """,
+    "INSERT INTO elibrary_app_ebook_fts(elibrary_app_ebook_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS elibrary_app_ebook_fts_au",
+    "DROP TRIGGER IF EXISTS elibrary_app_ebook_fts_ad",
+    "DROP TRIGGER IF EXISTS elibrary_app_ebook_fts_ai",
+    "DROP TABLE IF EXISTS elibrary_app_ebook_fts",
+]
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_SQL:
+        schema_editor.execute(statement)
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in FTS_SQL:
+        schema_editor.execute(statement)
+
+
+def restore_old_fts(apps, schema_editor):
+    # Откат: индекс в виде из 0003_ebook_fts (по столбцу author)
+    import_module('elibrary_app.migrations.0003_ebook_fts').create_fts(apps, schema_editor)
+
+
+def copy_authors(apps, schema_editor):
+    # Перенос целочисленных идентификаторов; несуществующие пользователи
+    # (в том числе значение по умолчанию 0) становятся NULL, а у книг
+    # без пользователя остается скопированное ранее имя
+    alias = schema_editor.connection.alias
+    EBooksModel = apps.get_model('elibrary_app', 'EBooksModel')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    books = EBooksModel.objects.using(alias)
+    books.filter(
+        legacy_author_id__in=User.objects.using(alias).values('id'),
+    ).update(author_id=F('legacy_author_id'))
+
+    # Актуальное имя из пользователя, по одному UPDATE на автора
+    authors = User.objects.using(alias).filter(id__in=books.values('author_id'))
+    for user in authors.iterator():
+        name = f'{user.first_name} {user.last_name}'.strip() or user.username
+        books.filter(author_id=user.id).update(indexed_author=name[:300])
+
+
+def restore_authors(apps, schema_editor):
+    EBooksModel = apps.get_model('elibrary_app', 'EBooksModel')
+    EBooksModel.objects.using(schema_editor.connection.alias).exclude(
+        author_id=None,
+    ).update(legacy_author_id=F('author_id'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('elibrary_app', '0007_ebook_timestamps'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_fts, restore_old_fts),
+        migrations.RenameField(
+            model_name='ebooksmodel',
+            old_name='author_id',
+            new_name='legacy_author_id',
+        ),
+        migrations.RenameField(
+            model_name='ebooksmodel',
+            old_name='author',
+            new_name='indexed_author',
+        ),
+        migrations.AddField(
+            model_name='ebooksmodel',
+            name='author',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='books', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='ebooksmodel',
+            name='indexed_author',
+            field=models.CharField(blank=True, default='', editable=False, max_length=300),
+        ),
+        migrations.RunPython(copy_authors, restore_authors),
+        migrations.RemoveField(
+            model_name='ebooksmodel',
+            name='legacy_author_id',
+        ),
+        migrations.AddIndex(
+            model_name='ebooksmodel',
+            index=models.Index(fields=['author', 'title', 'id'], name='ebook_author_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ebooksmodel',
+            index=models.Index(fields=['author', '-created_at', '-id'], name='ebook_author_created_idx'),
+        ),
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:05
+
+from importlib import import_module
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+# Категории, которые раньше были заданы в коде (форма книги и страница
+# обзора): имя -> (заголовок раздела, цвет, значок, порядок)
+DEFAULT_CATEGORIES = {
+    'Education': ('Образовательные книги', 'primary', 'fa-graduation-cap', 0),
+    'Fiction': ('Художественные книги', 'success', 'fa-book-open', 1),
+    'Science': ('Научные книги', 'info', 'fa-flask', 2),
+    'Other': ('Другие книги', 'secondary', 'fa-book', 3),
+}
+
+
+def create_categories(apps, schema_editor):
+    # Строка категории создается для каждого значения, встречающегося
+    # в книгах, иначе внешний ключ нельзя будет создать; книги без
+    # категории переносятся в Other
+    alias = schema_editor.connection.alias
+    Category = apps.get_model('elibrary_app', 'Category')
+    EBooksModel = apps.get_model('elibrary_app', 'EBooksModel')
+    books = EBooksModel.objects.using(alias)
+    books.filter(category='').update(category='Other')
+
+    counts = dict(
+        books.values_list('category').annotate(total=Count('id')).order_by()
+    )
+    categories = [
+        Category(name=name, title=title, color=color, icon=icon, position=position)
+        for name, (title, color, icon, position) in DEFAULT_CATEGORIES.items()
+    ]
+    categories += [
+        Category(name=name, title=name, position=len(DEFAULT_CATEGORIES))
+        for name in sorted(counts) if name not in DEFAULT_CATEGORIES
+    ]
+    for category in categories:
+        category.book_count = counts.get(category.name, 0)
+    Category.objects.using(alias).bulk_create(categories)
+
+
+def restore_fts(apps, schema_editor):
+    # Пересоздание таблицы книг при смене типа столбца удаляет триггеры
+    # полнотекстового индекса
+    import_module('elibrary_app.migrations.0008_ebook_author_fk').create_fts(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elibrary_app', '0008_ebook_author_fk'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('title', models.CharField(max_length=150)),
+                ('color', models.CharField(default='secondary', max_length=20)),
+                ('icon', models.CharField(blank=True, default='fa-book', max_length=50)),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('book_count', models.PositiveIntegerField(default=0, editable=False)),
+            ],
+            options={
+                'verbose_name_plural': 'categories',
+                'ordering': ['position', 'name'],
+            },
+        ),
+        migrations.RunPython(create_categories, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='ebooksmodel',
+            name='category',
+            field=models.ForeignKey(db_column='category', db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='books', to='elibrary_app.category', to_field='name'),
+        ),
+        migrations.RunPython(restore_fts, migrations.RunPython.noop),
+    ]
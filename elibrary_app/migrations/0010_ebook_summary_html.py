@@ -0,0 +1,56 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:50
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+
+def render_summaries(apps, schema_editor):
+    # Заполнение новых столбцов для существующих книг; позже то же
+    # делает команда render_summaries
+    from elibrary_app.models import render_summary_html, summary_excerpt
+
+    EBooksModel = apps.get_model('elibrary_app', 'EBooksModel')
+    books = EBooksModel.objects.using(schema_editor.connection.alias).exclude(summary='')
+    batch = []
+    for book in books.only('id', 'summary').iterator(chunk_size=500):
+        book.summary_html = render_summary_html(book.summary)
+        book.summary_excerpt = summary_excerpt(book.summary)
+        batch.append(book)
+        if len(batch) == 500:
+            EBooksModel.objects.using(schema_editor.connection.alias).bulk_update(
+                batch, ['summary_html', 'summary_excerpt'],
+            )
+            batch = []
+    if batch:
+        EBooksModel.objects.using(schema_editor.connection.alias).bulk_update(
+            batch, ['summary_html', 'summary_excerpt'],
+        )
+
+
+def restore_fts(apps, schema_editor):
+    # Добавление столбца с NOT NULL пересоздает таблицу книг и удаляет
+    # триггеры полнотекстового индекса
+    import_module('elibrary_app.migrations.0008_ebook_author_fk').create_fts(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elibrary_app', '0009_category'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ebooksmodel',
+            name='summary_excerpt',
+            field=models.CharField(blank=True, default='', editable=False, max_length=110),
+        ),
+        migrations.AddField(
+            model_name='ebooksmodel',
+            name='summary_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(restore_fts, migrations.RunPython.noop),
+        migrations.RunPython(render_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elibrary_app', '0010_ebook_summary_html'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookStats',
+            fields=[
+                ('book', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='elibrary_app.ebooksmodel')),
+                ('views', models.PositiveBigIntegerField(default=0)),
+                ('downloads', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'book stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='PopularBook',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveIntegerField()),
+                ('views', models.PositiveBigIntegerField()),
+                ('downloads', models.PositiveBigIntegerField()),
+                ('score', models.PositiveBigIntegerField()),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='elibrary_app.ebooksmodel')),
+                ('category', models.ForeignKey(db_column='category', db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='elibrary_app.category', to_field='name')),
+            ],
+            options={
+                'ordering': ['category', 'rank'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='popularbook',
+            constraint=models.UniqueConstraint(fields=('category', 'rank'), name='popularbook_category_rank_uniq'),
+        ),
+    ]
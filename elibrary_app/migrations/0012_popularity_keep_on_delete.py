@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elibrary_app', '0011_popularity'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='bookstats',
+            name='book',
+            field=models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='stats', serialize=False, to='elibrary_app.ebooksmodel'),
+        ),
+        migrations.AlterField(
+            model_name='popularbook',
+            name='book',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='elibrary_app.ebooksmodel'),
+        ),
+    ]
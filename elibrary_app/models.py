@@ -2,11 +2,127 @@
 Модели данных приложения электронной библиотеки.
 
 Определяет структуру данных для хранения информации об электронных книгах.
-Модель EBooksModel содержит все необходимые поля для описания книги
-и управления библиотекой.
+Модель Category - категории книг со счетчиком книг, модель EBooksModel
+содержит все необходимые поля для описания книги и управления
+библиотекой, модель BookPage - извлеченный из PDF текст
+книги по страницам, модели ChunkedUpload и UploadChunk - сеансы
+загрузки больших PDF-файлов по частям.
 """
 
-from django.db import models
+import os
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, models, router, transaction
+from django.db.models import F
+from django.template.defaultfilters import linebreaksbr
+
+from elibrary_app.storage import digest_from_name, get_pdf_storage
+
+
+def author_display_name(user):
+    """
+    Отображаемое имя пользователя-автора.
+    
+    Args:
+        user (User): Пользователь
+        
+    Returns:
+        str: Имя и фамилия или логин, если они не заполнены
+    """
+    return (user.get_full_name() or user.username)[:300]
+
+
+# Длина краткой аннотации в карточке книги на странице обзора
+SUMMARY_EXCERPT_LENGTH = 100
+
+
+def render_summary_html(summary):
+    """
+    HTML аннотации для страницы книги.
+    
+    Текст экранируется (HTML, введенный пользователем, выводится как
+    текст), переносы строк заменяются на <br>.
+    
+    Args:
+        summary (str): Аннотация
+        
+    Returns:
+        str: Безопасный HTML
+    """
+    return str(linebreaksbr(summary, autoescape=True))
+
+
+def summary_excerpt(summary):
+    """
+    Краткая аннотация для карточки книги (первые SUMMARY_EXCERPT_LENGTH символов).
+    
+    Args:
+        summary (str): Аннотация
+        
+    Returns:
+        str: Начало аннотации с многоточием, если она длиннее
+    """
+    if len(summary) > SUMMARY_EXCERPT_LENGTH:
+        return summary[:SUMMARY_EXCERPT_LENGTH] + '...'
+    return summary
+
+
+def adjust_book_counts(changes, using=DEFAULT_DB_ALIAS):
+    """
+    Изменение счетчиков книг категорий.
+
+    Счетчик меняется выражением F() в одном UPDATE, поэтому одновременные
+    изменения из разных процессов не теряются.
+
+    Args:
+        changes (dict): Имя категории -> изменение количества книг
+        using (str): Псевдоним базы данных
+    """
+    for name, delta in changes.items():
+        if delta:
+            Category.objects.using(using).filter(name=name).update(book_count=F('book_count') + delta)
+
+
+class Category(models.Model):
+    """
+    Категория книг.
+    
+    Новая категория добавляется строкой в таблице (через админку),
+    без изменения кода: страница обзора, форма книги и импорт берут
+    список категорий из базы. Имя (name) хранится в строках книг,
+    поэтому после создания категории не меняется.
+        
+    Атрибуты:
+        name (CharField): Идентификатор категории (в URL, курсорах и внешнем ключе книг)
+        title (CharField): Заголовок раздела на странице обзора
+        color (CharField): Цвет оформления раздела (класс Bootstrap: primary, success, ...)
+        icon (CharField): Значок раздела (класс Font Awesome)
+        position (PositiveIntegerField): Порядок раздела на странице обзора
+        book_count (PositiveIntegerField): Количество книг категории; обновляется
+                                           при сохранении и удалении книг (adjust_book_counts)
+    """
+    
+    name = models.CharField(max_length=100, unique=True)              # Идентификатор
+    title = models.CharField(max_length=150)                          # Заголовок раздела
+    color = models.CharField(max_length=20, default='secondary')      # Цвет Bootstrap
+    icon = models.CharField(max_length=50, blank=True, default='fa-book')  # Значок
+    position = models.PositiveIntegerField(default=0)                 # Порядок вывода
+    book_count = models.PositiveIntegerField(default=0, editable=False)  # Количество книг
+    
+    class Meta:
+        """
+        Мета-класс модели: категории выводятся по position, затем по имени.
+        """
+        ordering = ['position', 'name']
+        verbose_name_plural = 'categories'
+    
+    def __str__(self):
+        """
+        Строковое представление категории (заголовок раздела).
+        """
+        return self.title
 
 
 class EBooksModel(models.Model):
@@ -22,13 +138,28 @@ class EBooksModel(models.Model):
     Атрибуты:
         title (CharField): Название книги (макс. 150 символов)
         summary (TextField): Аннотация книги (макс. 2000 символов)
+        summary_html (TextField): Экранированный HTML аннотации для страницы книги
+        summary_excerpt (CharField): Краткая аннотация для карточки на странице обзора
         pages (CharField): Количество страниц (макс. 100 символов)
-        pdf (FileField): PDF-файл книги (загружается в 'pdfs/')
-        author (CharField): Имя автора (макс. 100 символов)
-        category (CharField): Категория книги (макс. 300 символов)
-        author_id (IntegerField): Идентификатор автора-пользователя
+        pdf (FileField): PDF-файл книги (хранится в 'pdfs/ab/cd/<sha256>.pdf')
+        pdf_sha256 (CharField): SHA-256 содержимого PDF-файла (индекс для поиска дубликатов)
+        created_at (DateTimeField): Время добавления книги
+        updated_at (DateTimeField): Время последнего изменения (индекс для ETag/Last-Modified)
+        author (ForeignKey): Пользователь, добавивший книгу (имя для отображения
+                             берется из пользователя через select_related)
+        indexed_author (CharField): Имя автора для полнотекстового индекса
+                                    (синхронизируется с пользователем)
+        category (ForeignKey): Категория книги; ссылается на Category.name, поэтому
+                               в столбце category хранится имя категории, а фильтр
+                               filter(category='Science') не требует соединения таблиц
         
     Методы:
+        from_db(): Загрузка из БД с запоминанием исходной категории
+        save(): Сохранение с записью хеша PDF-файла, имени автора для поиска
+                и HTML аннотации
+        render_summary(): Заполнение summary_html и summary_excerpt из summary
+        duplicates(): Другие книги с тем же PDF-файлом
+        author_name: Полное имя автора
         __str__(): Строковое представление объекта (название книги)
     """
     
@@ -37,13 +168,129 @@ class EBooksModel(models.Model):
     summary = models.TextField(max_length=2000)       # Аннотация/описание
     pages = models.CharField(max_length=100)          # Количество страниц
     
+    # Аннотация, подготовленная для вывода (заполняется при сохранении)
+    summary_html = models.TextField(blank=True, default='', editable=False)
+    summary_excerpt = models.CharField(max_length=110, blank=True, default='', editable=False)
+    
     # Файловое представление
-    pdf = models.FileField(upload_to='pdfs/')         # PDF-файл книги
+    pdf = models.FileField(upload_to='pdfs/', storage=get_pdf_storage)  # PDF-файл книги
+    pdf_sha256 = models.CharField(
+        max_length=64, blank=True, editable=False, db_index=True,
+    )                                                 # Хеш содержимого PDF
     
     # Информация об авторе
-    author = models.CharField(max_length=100)         # Имя автора для отображения
-    category = models.CharField(max_length=300)       # Категория книги
-    author_id = models.IntegerField(default=0)        # Связь с пользователем-автором
+    author = models.ForeignKey(
+        User, null=True, blank=True, on_delete=models.SET_NULL, related_name='books',
+    )                                                 # Пользователь-автор
+    indexed_author = models.CharField(
+        max_length=300, blank=True, default='', editable=False,
+    )                                                 # Имя автора для поиска
+    # Отдельный индекс не нужен: его заменяет составной индекс (category, title, id)
+    category = models.ForeignKey(
+        Category, to_field='name', db_column='category', db_index=False,
+        on_delete=models.PROTECT, related_name='books',
+    )                                                 # Категория книги
+    
+    # Время добавления и изменения (версия книги для условных GET-запросов)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    
+    class Meta:
+        """
+        Мета-класс модели.
+        
+        Определяет:
+            - indexes: составной индекс (category, title, id) для постраничного
+              вывода категорий на странице обзора без сортировки в памяти;
+              индексы (author, title, id) и (author, -created_at, -id) для
+              постраничного вывода книг пользователя по названию и по дате
+        """
+        indexes = [
+            models.Index(fields=['category', 'title', 'id'], name='ebook_category_title_idx'),
+            models.Index(fields=['author', 'title', 'id'], name='ebook_author_title_idx'),
+            models.Index(fields=['author', '-created_at', '-id'], name='ebook_author_created_idx'),
+        ]
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Создание объекта из строки БД.
+        
+        Запоминает загруженную категорию, чтобы при переносе книги
+        в другую категорию инвалидировать кеш обеих (см. elibrary_app.signals).
+        """
+        instance = super().from_db(db, field_names, values)
+        if 'category_id' in field_names:
+            instance._loaded_category = instance.category_id
+        return instance
+    
+    def save(self, *args, **kwargs):
+        """
+        Сохранение книги.
+        
+        Новый PDF-файл записывается в хранилище до сохранения строки,
+        чтобы хеш его содержимого (часть имени файла) попал в pdf_sha256
+        тем же запросом INSERT/UPDATE. Имя автора для полнотекстового
+        индекса берется из пользователя (при смене имени пользователя
+        книги обновляются сигналом, см. elibrary_app.signals). HTML
+        и краткая аннотация формируются здесь один раз, и представления
+        выводят готовые значения.
+        
+        Строка книги и счетчики категорий (обработчик post_save)
+        изменяются в одной транзакции. Внутри уже открытой транзакции
+        точка сохранения не создается (два лишних запроса SAVEPOINT
+        и RELEASE): ошибка откатывает внешнюю транзакцию целиком.
+        """
+        if self.pdf and not self.pdf._committed:
+            self.pdf.save(self.pdf.name, self.pdf.file, save=False)
+        self.pdf_sha256 = digest_from_name(self.pdf.name)
+        if self.author_id:
+            self.indexed_author = self.author_name
+        self.render_summary()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'summary' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'summary_html', 'summary_excerpt'}
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+    
+    def render_summary(self):
+        """
+        Заполнение summary_html и summary_excerpt из summary.
+        
+        Вызывается из save(); при вставке через bulk_create (импорт)
+        вызывается явно.
+        """
+        self.summary_html = render_summary_html(self.summary)
+        self.summary_excerpt = summary_excerpt(self.summary)
+    
+    def duplicates(self):
+        """
+        Другие книги с тем же содержимым PDF-файла.
+        
+        Returns:
+            QuerySet: Книги с совпадающим pdf_sha256 (поиск по индексу)
+        """
+        if not self.pdf_sha256:
+            return EBooksModel.objects.none()
+        return EBooksModel.objects.filter(pdf_sha256=self.pdf_sha256).exclude(id=self.id)
+    
+    @property
+    def author_name(self):
+        """
+        Полное имя автора для отображения.
+        
+        Берется из текущих данных пользователя, поэтому смена имени сразу
+        видна во всех книгах. В списках книг пользователь загружается
+        через select_related('author'), без отдельного запроса на книгу.
+        
+        Returns:
+            str: Имя и фамилия, логин, если они не заполнены, или имя,
+                 сохраненное до появления связи с пользователем
+        """
+        if self.author is None:
+            return self.indexed_author
+        return author_display_name(self.author)
     
     def __str__(self):
         """
@@ -53,4 +300,249 @@ class EBooksModel(models.Model):
             str: Название книги для удобного отображения в административной панели
                 и при выводе объектов
         """
-        return f"{self.title}"
\ No newline at end of file
+        return f"{self.title}"
+
+
+class BookPage(models.Model):
+    """
+    Текст одной страницы PDF-файла книги.
+    
+    Заполняется фоновым извлечением текста (elibrary_app.ingest)
+    и индексируется полнотекстовым поиском, чтобы результат поиска
+    мог указывать на конкретную страницу книги.
+        
+    Атрибуты:
+        book (ForeignKey): Книга, которой принадлежит страница
+        number (PositiveIntegerField): Номер страницы в PDF, начиная с 1
+        text (TextField): Извлеченный текст страницы
+    """
+    
+    book = models.ForeignKey(
+        EBooksModel,
+        on_delete=models.CASCADE,
+        related_name='text_pages',
+    )                                                 # Книга
+    number = models.PositiveIntegerField()            # Номер страницы
+    text = models.TextField(blank=True)               # Текст страницы
+    
+    class Meta:
+        """
+        Мета-класс модели.
+        
+        Определяет:
+            - constraints: одна запись на каждую страницу книги
+            - ordering: страницы по порядку
+        """
+        constraints = [
+            models.UniqueConstraint(fields=['book', 'number'], name='bookpage_book_number_uniq'),
+        ]
+        ordering = ['book', 'number']
+    
+    def __str__(self):
+        """
+        Строковое представление страницы.
+        
+        Returns:
+            str: Идентификатор книги и номер страницы
+        """
+        return f"{self.book_id}: стр. {self.number}"
+
+
+class BookStats(models.Model):
+    """
+    Счетчики просмотров и скачиваний книги.
+    
+    Хранятся отдельно от строки книги: частая запись счетчиков не
+    переписывает строку с аннотацией и не меняет updated_at (ETag страницы
+    книги). Обращения накапливаются в памяти процесса и записываются
+    пакетами (elibrary_app.popularity); строка создается при первой записи.
+    
+    Удаление книги строку не удаляет (лишний DELETE на каждое удаление):
+    строки удаленных книг не попадают в рейтинг (соединение с книгами)
+    и удаляются при его пересчете. Идентификаторы книг не используются
+    повторно (AUTOINCREMENT), поэтому такая строка не достанется новой книге.
+        
+    Атрибуты:
+        book (OneToOneField): Книга (первичный ключ)
+        views (PositiveBigIntegerField): Просмотры страницы книги
+        downloads (PositiveBigIntegerField): Скачивания PDF-файла
+    """
+    
+    book = models.OneToOneField(
+        EBooksModel,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        primary_key=True,
+        related_name='stats',
+    )                                                 # Книга
+    views = models.PositiveBigIntegerField(default=0)      # Просмотры
+    downloads = models.PositiveBigIntegerField(default=0)  # Скачивания
+    
+    class Meta:
+        """
+        Мета-класс модели.
+        """
+        verbose_name_plural = 'book stats'
+    
+    def __str__(self):
+        """
+        Строковое представление счетчиков.
+        
+        Returns:
+            str: Идентификатор книги и значения счетчиков
+        """
+        return f"{self.book_id}: {self.views} просмотров, {self.downloads} скачиваний"
+
+
+class PopularBook(models.Model):
+    """
+    Строка рейтинга популярных книг категории.
+    
+    Таблица пересчитывается целиком (elibrary_app.popularity.rebuild_ranking),
+    а страница популярных книг только читает ее по индексу (category, rank):
+    сортировка по счетчикам при запросе страницы не выполняется. Строки
+    удаленных книг отсекает соединение с книгами до следующего пересчета.
+        
+    Атрибуты:
+        category (ForeignKey): Категория книги на момент пересчета
+        rank (PositiveIntegerField): Место в категории, начиная с 1
+        book (ForeignKey): Книга
+        views (PositiveBigIntegerField): Просмотры на момент пересчета
+        downloads (PositiveBigIntegerField): Скачивания на момент пересчета
+        score (PositiveBigIntegerField): Оценка популярности
+    """
+    
+    category = models.ForeignKey(
+        Category,
+        to_field='name',
+        db_column='category',
+        db_index=False,
+        on_delete=models.CASCADE,
+        related_name='+',
+    )                                                 # Категория (индекс - ограничение ниже)
+    rank = models.PositiveIntegerField()              # Место в категории
+    book = models.ForeignKey(
+        EBooksModel,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+    )                                                 # Книга
+    views = models.PositiveBigIntegerField()          # Просмотры
+    downloads = models.PositiveBigIntegerField()      # Скачивания
+    score = models.PositiveBigIntegerField()          # Оценка популярности
+    
+    class Meta:
+        """
+        Мета-класс модели.
+        
+        Определяет:
+            - constraints: одно место в категории занимает одна книга;
+              индекс ограничения используется для вывода рейтинга
+            - ordering: категории, затем места
+        """
+        constraints = [
+            models.UniqueConstraint(fields=['category', 'rank'], name='popularbook_category_rank_uniq'),
+        ]
+        ordering = ['category', 'rank']
+    
+    def __str__(self):
+        """
+        Строковое представление строки рейтинга.
+        
+        Returns:
+            str: Категория, место и идентификатор книги
+        """
+        return f"{self.category_id} #{self.rank}: {self.book_id}"
+
+
+class ChunkedUpload(models.Model):
+    """
+    Сеанс загрузки PDF-файла по частям.
+    
+    Файл собирается на диске в MEDIA_ROOT/uploads/<id>.part: каждая часть
+    записывается по своему смещению, поэтому части можно отправлять
+    в любом порядке и повторно, а прерванную загрузку - продолжить.
+        
+    Атрибуты:
+        id (UUIDField): Идентификатор сеанса (используется в URL)
+        user (ForeignKey): Пользователь, начавший загрузку
+        filename (CharField): Исходное имя файла
+        size (PositiveBigIntegerField): Полный размер файла в байтах
+        chunk_size (PositiveIntegerField): Размер части в байтах
+        sha256 (CharField): Ожидаемый хеш всего файла (необязательно)
+        completed (BooleanField): Все части получены и проверены
+        created_at (DateTimeField): Время начала загрузки
+    """
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='chunked_uploads')
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64, blank=True)
+    completed = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    @property
+    def chunk_count(self):
+        """
+        Количество частей файла.
+        """
+        return max((self.size + self.chunk_size - 1) // self.chunk_size, 1)
+    
+    @property
+    def path(self):
+        """
+        Путь к собираемому файлу на диске.
+        """
+        return os.path.join(settings.MEDIA_ROOT, 'uploads', f'{self.id}.part')
+    
+    def chunk_length(self, number):
+        """
+        Ожидаемая длина части с указанным номером (последняя может быть короче).
+        """
+        return min(self.chunk_size, self.size - number * self.chunk_size)
+    
+    def __str__(self):
+        """
+        Строковое представление сеанса загрузки.
+        
+        Returns:
+            str: Имя файла и идентификатор сеанса
+        """
+        return f"{self.filename} ({self.id})"
+
+
+class UploadChunk(models.Model):
+    """
+    Полученная и проверенная часть файла в сеансе загрузки.
+        
+    Атрибуты:
+        upload (ForeignKey): Сеанс загрузки
+        number (PositiveIntegerField): Номер части, начиная с 0
+        sha256 (CharField): Хеш содержимого части
+    """
+    
+    upload = models.ForeignKey(ChunkedUpload, on_delete=models.CASCADE, related_name='chunks')
+    number = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64)
+    
+    class Meta:
+        """
+        Мета-класс модели.
+        
+        Определяет:
+            - constraints: каждая часть учитывается один раз
+        """
+        constraints = [
+            models.UniqueConstraint(fields=['upload', 'number'], name='uploadchunk_upload_number_uniq'),
+        ]
+    
+    def __str__(self):
+        """
+        Строковое представление части.
+        
+        Returns:
+            str: Идентификатор сеанса и номер части
+        """
+        return f"{self.upload_id}: часть {self.number}"
\ No newline at end of file
@@ -0,0 +1,211 @@
+"""
+Keyset-пагинация списков книг.
+
+Вместо OFFSET, стоимость которого растет вместе с номером страницы,
+следующая страница выбирается условием по ключу сортировки (title, id)
+последней показанной книги. Такой запрос обслуживается индексом
+и работает одинаково быстро на любой глубине каталога.
+
+Курсор передается клиенту в непрозрачном виде (base64 от JSON),
+чтобы формат ключа можно было менять без изменения URL-схемы.
+
+Поле ключа с префиксом '-' сортируется по убыванию, как в order_by().
+
+Первые страницы нескольких списков (книги всех категорий на странице
+обзора) выбираются одним запросом: id строк каждой страницы выбирает
+отдельный подзапрос с LIMIT по индексу списка. Оконная функция
+ROW_NUMBER() (Prefetch со срезом) нумеровала бы все строки каждой
+группы, и время запроса росло бы вместе с каталогом.
+"""
+
+import base64
+import binascii
+import datetime
+import json
+
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+# Диапазон целых в базе (64 бита): у SQLite Django не проверяет его
+# валидаторами полей, а большее число вызывает OverflowError при запросе
+INTEGER_RANGE = range(-2 ** 63, 2 ** 63)
+
+
+class InvalidCursor(ValueError):
+    """
+    Поврежденный курсор или курсор другого ключа сортировки.
+    """
+
+
+def encode_cursor(values):
+    """
+    Кодирование значений ключа сортировки в непрозрачный курсор.
+
+    Args:
+        values (list): Значения полей ключа сортировки последней строки
+
+    Returns:
+        str: Курсор, безопасный для использования в URL
+    """
+    raw = json.dumps(values, ensure_ascii=False, separators=(',', ':'), default=_encode_value)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _encode_value(value):
+    """
+    Сериализация значений ключа, которых нет в JSON.
+
+    Дата и время записываются полностью, с микросекундами: усечение
+    (как в DjangoJSONEncoder) пропускало бы строки на границе страниц.
+    """
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    raise TypeError(f'Значение {value!r} нельзя записать в курсор')
+
+
+def decode_cursor(cursor, fields):
+    """
+    Декодирование курсора, полученного от клиента.
+
+    Значения приводятся к типам полей ключа (to_python) и проверяются
+    их валидаторами: строка вместо числа или даты в правильно
+    закодированном курсоре иначе дошла бы до запроса к базе.
+
+    Args:
+        cursor (str): Курсор из параметров запроса
+        fields (list): Поля модели в порядке ключа сортировки
+
+    Returns:
+        list | None: Значения ключа или None, если курсор пуст
+
+    Raises:
+        InvalidCursor: Курсор поврежден
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeError, binascii.Error):
+        raise InvalidCursor('Некорректный курсор') from None
+    if not isinstance(values, list) or len(values) != len(fields):
+        raise InvalidCursor('Некорректный курсор')
+    try:
+        values = [field.to_python(value) for field, value in zip(fields, values)]
+        for field, value in zip(fields, values):
+            field.run_validators(value)
+    except (TypeError, ValueError, ValidationError):
+        raise InvalidCursor('Некорректный курсор') from None
+    if any(isinstance(value, int) and value not in INTEGER_RANGE for value in values):
+        raise InvalidCursor('Некорректный курсор')
+    return values
+
+
+def _after_cursor(queryset, cursor, ordering, strict=False):
+    """
+    Набор строк после позиции курсора в порядке ключа сортировки.
+
+    Поврежденный курсор дает первую страницу, а при strict=True
+    вызывает InvalidCursor.
+    """
+    queryset = queryset.order_by(*ordering)
+
+    fields = [queryset.model._meta.get_field(field.lstrip('-')) for field in ordering]
+    try:
+        values = decode_cursor(cursor, fields)
+    except InvalidCursor:
+        if strict:
+            raise
+        values = None
+    if values is not None:
+        # Условие (a, b) > (x, y), развернутое для SQLite и индекса
+        condition = Q()
+        for position, field in enumerate(ordering):
+            name, lookup = (field[1:], 'lt') if field.startswith('-') else (field, 'gt')
+            step = Q(**{f'{name}__{lookup}': values[position]})
+            for previous, value in zip(ordering[:position], values[:position]):
+                step &= Q(**{previous.lstrip('-'): value})
+            condition |= step
+        queryset = queryset.filter(condition)
+    return queryset
+
+
+def _split_page(rows, page_size, ordering):
+    """
+    Отделение лишней строки и курсор следующей страницы.
+    """
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, field.lstrip('-')) for field in ordering])
+    return rows, next_cursor
+
+
+def keyset_page(queryset, cursor, page_size, ordering=('title', 'id'), strict=False):
+    """
+    Выборка одной страницы по ключу сортировки.
+
+    Args:
+        queryset (QuerySet): Исходный набор книг (уже отфильтрованный)
+        cursor (str): Курсор предыдущей страницы или пустое значение
+        page_size (int): Количество книг на странице
+        ordering (tuple): Поля ключа сортировки ('-' - по убыванию);
+                          последнее поле должно быть уникальным
+        strict (bool): Поврежденный курсор - ошибка, а не первая страница
+
+    Returns:
+        tuple: (список книг страницы, курсор следующей страницы или None)
+
+    Raises:
+        InvalidCursor: Курсор поврежден (только при strict=True)
+    """
+    # Одна лишняя строка показывает, есть ли следующая страница, без COUNT(*)
+    rows = list(_after_cursor(queryset, cursor, ordering, strict)[:page_size + 1])
+    return _split_page(rows, page_size, ordering)
+
+
+async def akeyset_page(queryset, cursor, page_size, ordering=('title', 'id')):
+    """
+    Асинхронная выборка одной страницы по ключу сортировки.
+
+    Аргументы и результат такие же, как у keyset_page.
+    """
+    queryset = _after_cursor(queryset, cursor, ordering)[:page_size + 1]
+    rows = [row async for row in queryset]
+    return _split_page(rows, page_size, ordering)
+
+
+def prefetch_first_pages(instances, lookup, queryset, page_size, ordering=('title', 'id')):
+    """
+    Первые страницы связанных списков нескольких объектов одним запросом.
+
+    Args:
+        instances (list): Объекты, для которых выбираются списки (например, категории)
+        lookup (str): Имя обратной связи (related_name), например 'books'
+        queryset (QuerySet): Набор связанных строк (select_related и т.п.)
+        page_size (int): Количество строк на странице
+        ordering (tuple): Поля ключа сортировки, как в keyset_page
+
+    Returns:
+        list: Пары (список строк страницы, курсор следующей страницы или None)
+              в порядке instances
+    """
+    if not instances:
+        return []
+    # Внешний ключ связанной модели (EBooksModel.category) и значение,
+    # на которое он ссылается у каждого объекта (Category.name)
+    field = instances[0]._meta.get_field(lookup).field
+    keys = [getattr(instance, field.target_field.attname) for instance in instances]
+    ordered = queryset.order_by(*ordering)
+    pages = [
+        Q(pk__in=ordered.filter(**{field.attname: key}).values('pk')[:page_size + 1])
+        for key in keys
+    ]
+    rows = {key: [] for key in keys}
+    for row in ordered.filter(reduce(or_, pages)):
+        rows[getattr(row, field.attname)].append(row)
+    return [_split_page(rows[key], page_size, ordering) for key in keys]
@@ -0,0 +1,59 @@
+"""
+Извлечение текста из PDF-файлов книг.
+
+Модуль не зависит от Django и выполняется в дочерних процессах пула
+извлечения (см. elibrary_app.ingest). PDF разбирается постранично:
+читаются только таблица ссылок и объекты текущей страницы, поэтому
+файл целиком в память не загружается.
+
+Для разбора используется библиотека pypdf. Если она не установлена,
+извлечение текста недоступно, а остальное приложение работает как обычно.
+"""
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pragma: no cover - зависит от окружения
+    PdfReader = None
+
+
+class PdfTextUnavailable(RuntimeError):
+    """
+    Извлечение текста невозможно: не установлен pypdf.
+    """
+
+
+def iter_pages(path):
+    """
+    Постраничный разбор PDF-файла.
+
+    Args:
+        path (str): Путь к PDF-файлу на диске
+
+    Yields:
+        tuple: (номер страницы начиная с 1, текст страницы)
+    """
+    if PdfReader is None:
+        raise PdfTextUnavailable('Для извлечения текста установите пакет pypdf')
+
+    with open(path, 'rb') as stream:
+        reader = PdfReader(stream)
+        for number, page in enumerate(reader.pages, start=1):
+            text = page.extract_text() or ''
+            # NUL-символы встречаются в битых PDF и не нужны в индексе
+            yield number, text.replace('\x00', '').strip()
+
+
+def extract_pages(path):
+    """
+    Извлечение текста всех страниц PDF-файла.
+
+    Точка входа для дочернего процесса пула: возвращает только текст,
+    сам файл между процессами не передается.
+
+    Args:
+        path (str): Путь к PDF-файлу на диске
+
+    Returns:
+        list: Тексты страниц в порядке следования (пустые страницы сохраняются)
+    """
+    return [text for _, text in iter_pages(path)]
@@ -0,0 +1,296 @@
+"""
+Счетчики просмотров и скачиваний книг и рейтинг популярных книг.
+
+Запись UPDATE ... SET views = views + 1 при каждом открытии книги
+выстраивала бы запросы в очередь на единственной блокировке записи
+SQLite. Поэтому обращения накапливаются в памяти процесса (HitBuffer:
+id книги -> [просмотры, скачивания]) и записываются пакетами:
+
+    - фоновый поток процесса записывает накопленное раз в
+      settings.COUNTER_FLUSH_INTERVAL секунд или сразу, когда накоплено
+      settings.COUNTER_FLUSH_MAX_BOOKS книг
+    - запись - одна транзакция: INSERT ... ON CONFLICT DO UPDATE
+      с прибавлением к счетчикам, до FLUSH_BATCH_SIZE книг в запросе
+      (SQLite 3.24+ и PostgreSQL)
+    - при завершении процесса накопленное записывается (atexit); при
+      аварийном завершении теряются обращения последнего интервала
+
+Каждый воркер записывает свои обращения: значения прибавляются
+к строке BookStats, поэтому записи процессов не мешают друг другу.
+
+Рейтинг популярных книг (PopularBook) пересчитывается целиком
+rebuild_ranking(): оценка книги - просмотры плюс скачивания с весом
+settings.POPULAR_DOWNLOAD_WEIGHT, в каждой категории сохраняются
+settings.POPULAR_LIMIT первых мест. Фоновый поток пересчитывает рейтинг
+не чаще раза в settings.POPULAR_REFRESH_INTERVAL секунд (на все процессы
+через общий кеш); команда manage.py rank_books пересчитывает его сразу.
+"""
+
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, router, transaction
+from django.db.models import Exists, F, OuterRef, Window
+from django.db.models.functions import RowNumber
+
+from elibrary_app.models import BookStats, EBooksModel, PopularBook
+
+logger = logging.getLogger(__name__)
+
+# Позиции счетчиков в буфере
+VIEWS = 0
+DOWNLOADS = 1
+
+# Количество книг в одном INSERT при записи счетчиков
+FLUSH_BATCH_SIZE = 300
+
+# Ключ кеша: рейтинг пересчитан недавно (живет POPULAR_REFRESH_INTERVAL)
+RANKING_REFRESH_KEY = 'elibrary:popular:refreshed'
+
+
+class HitBuffer:
+    """
+    Обращения к книгам, еще не записанные в базу данных.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hits = {}
+
+    def add(self, book_id, kind, count=1):
+        """
+        Учет обращения к книге.
+
+        Args:
+            book_id (int): Идентификатор книги
+            kind (int): VIEWS или DOWNLOADS
+            count (int): Количество обращений
+
+        Returns:
+            int: Количество книг в буфере
+        """
+        with self._lock:
+            hits = self._hits.get(book_id)
+            if hits is None:
+                hits = self._hits[book_id] = [0, 0]
+            hits[kind] += count
+            return len(self._hits)
+
+    def drain(self):
+        """
+        Извлечение всех накопленных обращений.
+
+        Returns:
+            dict: id книги -> [просмотры, скачивания]
+        """
+        with self._lock:
+            hits, self._hits = self._hits, {}
+        return hits
+
+    def merge(self, hits):
+        """
+        Возврат обращений в буфер (запись не удалась).
+        """
+        with self._lock:
+            for book_id, (views, downloads) in hits.items():
+                current = self._hits.setdefault(book_id, [0, 0])
+                current[VIEWS] += views
+                current[DOWNLOADS] += downloads
+
+    def __len__(self):
+        with self._lock:
+            return len(self._hits)
+
+
+buffer = HitBuffer()
+
+# Фоновый поток записи создается при первом обращении, а не при импорте
+_flusher = None
+_flusher_lock = threading.Lock()
+_wake = threading.Event()
+
+
+def record_view(book_id):
+    """
+    Учет просмотра страницы книги.
+    """
+    _record(book_id, VIEWS)
+
+
+def record_download(book_id):
+    """
+    Учет скачивания PDF-файла книги.
+    """
+    _record(book_id, DOWNLOADS)
+
+
+def _record(book_id, kind):
+    pending = buffer.add(book_id, kind)
+    if not settings.COUNTER_FLUSH_INTERVAL:
+        return
+    _start_flusher()
+    if pending >= settings.COUNTER_FLUSH_MAX_BOOKS:
+        _wake.set()
+
+
+def _start_flusher():
+    """
+    Запуск фонового потока записи счетчиков (один на процесс).
+    """
+    global _flusher
+    if _flusher is not None:
+        return
+    with _flusher_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_loop, name='elibrary-counters', daemon=True)
+            _flusher.start()
+            atexit.register(_flush_at_exit)
+
+
+def _flush_loop():
+    """
+    Периодическая запись счетчиков и пересчет рейтинга.
+    """
+    while True:
+        _wake.wait(settings.COUNTER_FLUSH_INTERVAL)
+        _wake.clear()
+        try:
+            flush_hits()
+            refresh_ranking_if_due()
+        except Exception:
+            logger.exception('Счетчики обращений не записаны')
+        finally:
+            # Соединения потока не закрываются обработчиком запроса
+            connections.close_all()
+
+
+def _flush_at_exit():
+    try:
+        flush_hits()
+    except Exception:
+        logger.exception('Счетчики обращений не записаны')
+
+
+def _upsert_sql(connection, rows):
+    """
+    INSERT ... ON CONFLICT с прибавлением к счетчикам для rows строк.
+    """
+    quote = connection.ops.quote_name
+    table = quote(BookStats._meta.db_table)
+    views, downloads = quote('views'), quote('downloads')
+    values = ', '.join(['(%s, %s, %s)'] * rows)
+    return (
+        f'INSERT INTO {table} ({quote("book_id")}, {views}, {downloads}) VALUES {values} '
+        f'ON CONFLICT ({quote("book_id")}) DO UPDATE SET '
+        f'{views} = {table}.{views} + excluded.{views}, '
+        f'{downloads} = {table}.{downloads} + excluded.{downloads}'
+    )
+
+
+def write_hits(hits):
+    """
+    Прибавление обращений к счетчикам BookStats в одной транзакции.
+
+    Обращения к книгам, удаленным до записи, отбрасываются.
+
+    Args:
+        hits (dict): id книги -> [просмотры, скачивания]
+
+    Returns:
+        int: Количество книг, счетчики которых изменены
+    """
+    using = router.db_for_write(BookStats)
+    connection = connections[using]
+    items = sorted(hits.items())
+    written = 0
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        for start in range(0, len(items), FLUSH_BATCH_SIZE):
+            batch = items[start:start + FLUSH_BATCH_SIZE]
+            existing = set(
+                EBooksModel.objects.using(using)
+                .filter(pk__in=[book_id for book_id, _ in batch])
+                .values_list('pk', flat=True)
+            )
+            rows = [(book_id, views, downloads) for book_id, (views, downloads) in batch if book_id in existing]
+            if rows:
+                cursor.execute(_upsert_sql(connection, len(rows)), [value for row in rows for value in row])
+                written += len(rows)
+    return written
+
+
+def flush_hits():
+    """
+    Запись обращений, накопленных процессом.
+
+    Если запись не удалась, обращения возвращаются в буфер
+    и записываются следующей попыткой.
+
+    Returns:
+        int: Количество книг, счетчики которых изменены
+    """
+    hits = buffer.drain()
+    if not hits:
+        return 0
+    try:
+        return write_hits(hits)
+    except Exception:
+        buffer.merge(hits)
+        raise
+
+
+def rebuild_ranking():
+    """
+    Пересчет таблицы рейтинга популярных книг.
+
+    Места в категориях вычисляются одним запросом с ROW_NUMBER()
+    по категориям; таблица заменяется в одной транзакции, поэтому
+    страница популярных книг не видит ее частично заполненной.
+    Заодно удаляются счетчики книг, удаленных после прошлого пересчета.
+
+    Returns:
+        int: Количество строк рейтинга
+    """
+    using = router.db_for_write(PopularBook)
+    score = F('views') + settings.POPULAR_DOWNLOAD_WEIGHT * F('downloads')
+    ranked = (
+        BookStats.objects.using(using)
+        .annotate(category=F('book__category'), score=score)
+        .annotate(rank=Window(
+            RowNumber(),
+            partition_by=F('book__category'),
+            order_by=[F('score').desc(), F('book_id').asc()],
+        ))
+        .filter(score__gt=0, rank__lte=settings.POPULAR_LIMIT)
+        .values_list('book_id', 'category', 'rank', 'views', 'downloads', 'score')
+    )
+    entries = [
+        PopularBook(
+            book_id=book_id, category_id=category, rank=rank,
+            views=views, downloads=downloads, score=value,
+        )
+        for book_id, category, rank, views, downloads, value in ranked
+    ]
+    with transaction.atomic(using=using):
+        BookStats.objects.using(using).filter(
+            ~Exists(EBooksModel.objects.filter(pk=OuterRef('book_id'))),
+        ).delete()
+        PopularBook.objects.using(using).all().delete()
+        PopularBook.objects.using(using).bulk_create(entries)
+    return len(entries)
+
+
+def refresh_ranking_if_due():
+    """
+    Пересчет рейтинга, если он не пересчитывался последние
+    POPULAR_REFRESH_INTERVAL секунд (в любом процессе).
+
+    Returns:
+        bool: True - рейтинг пересчитан
+    """
+    if not cache.add(RANKING_REFRESH_KEY, True, timeout=settings.POPULAR_REFRESH_INTERVAL):
+        return False
+    rebuild_ranking()
+    return True
@@ -0,0 +1,267 @@
+"""
+Профилирование отдельных запросов cProfile по требованию.
+
+ProfilingMiddleware профилирует запрос, если:
+
+    - передан заголовок X-Profile с токеном settings.PROFILE_TOKEN
+      (пустой токен отключает заголовок)
+    - запрос попал в случайную выборку с долей settings.PROFILE_SAMPLE_RATE
+    - сотрудник (is_staff) добавил к адресу параметр ?_profile=1
+
+Остальные запросы проходят без накладных расходов профилировщика.
+
+Профили сохраняются в формате pstats в каталог settings.PROFILE_DIR,
+в подкаталог с именем представления из elibrary_app/urls.py
+(explore, addBook, ...). Для каждого представления хранятся только
+PROFILE_MAX_FILES последних профилей: более старые удаляются при записи.
+Команда manage.py profiles объединяет профили каждого представления
+и выводит функции с наибольшим накопленным временем.
+
+cProfile видит только поток, в котором включен: для асинхронных
+представлений в профиль попадает работа цикла событий (в том числе
+других запросов, выполняемых одновременно), но не код, переданный
+в пул потоков через sync_to_async.
+"""
+
+import asyncio
+import cProfile
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.conf import settings
+
+# Заголовок запроса с токеном профилирования
+PROFILE_HEADER = 'X-Profile'
+
+# Параметр адреса для профилирования запроса сотрудником
+PROFILE_QUERY_FLAG = '_profile'
+
+# Заголовок ответа с именем сохраненного профиля
+PROFILE_RESPONSE_HEADER = 'X-Profile-Name'
+
+# Расширение файлов профилей
+PROFILE_EXTENSION = '.prof'
+
+# Символы, недопустимые в имени каталога представления
+UNSAFE_NAME_RE = re.compile(r'[^\w.-]')
+
+# В одном потоке активен только один профилировщик
+_active = threading.local()
+
+
+def view_directory(view_name):
+    """
+    Имя каталога профилей представления.
+
+    Args:
+        view_name (str): Имя представления (resolver_match.view_name)
+
+    Returns:
+        str: Безопасное имя каталога (admin:index -> admin_index)
+    """
+    return UNSAFE_NAME_RE.sub('_', view_name) or 'unmatched'
+
+
+class ProfileStore:
+    """
+    Каталог профилей с ограничением количества файлов на представление.
+
+    Args:
+        root (str): Каталог хранилища (settings.PROFILE_DIR)
+        max_files (int): Сколько последних профилей хранить для представления
+    """
+
+    def __init__(self, root, max_files):
+        self.root = os.fspath(root)
+        self.max_files = max(max_files, 1)
+
+    def save(self, view_name, profiler):
+        """
+        Запись профиля и удаление самых старых профилей представления.
+
+        Имя файла начинается со времени записи, поэтому сортировка имен
+        совпадает с порядком записи.
+
+        Args:
+            view_name (str): Имя представления
+            profiler (cProfile.Profile): Остановленный профилировщик
+
+        Returns:
+            str: Имя файла профиля
+        """
+        directory = os.path.join(self.root, view_directory(view_name))
+        os.makedirs(directory, exist_ok=True)
+        name = f'{time.time_ns()}-{uuid.uuid4().hex[:8]}{PROFILE_EXTENSION}'
+        path = os.path.join(directory, name)
+        # Запись во временный файл: команда profiles не прочитает недописанный профиль
+        profiler.dump_stats(path + '.tmp')
+        os.replace(path + '.tmp', path)
+        self._rotate(directory)
+        return name
+
+    def _rotate(self, directory):
+        """
+        Удаление профилей сверх max_files (одновременная запись из
+        нескольких процессов может удалить файл дважды - это не ошибка).
+        """
+        for name in self.files(directory)[:-self.max_files]:
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def files(directory):
+        """
+        Имена профилей каталога в порядке записи.
+        """
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name for name in names if name.endswith(PROFILE_EXTENSION))
+
+    def views(self):
+        """
+        Каталоги представлений с профилями: имя -> список путей к файлам.
+        """
+        try:
+            directories = sorted(os.listdir(self.root))
+        except FileNotFoundError:
+            return {}
+        result = {}
+        for directory in directories:
+            path = os.path.join(self.root, directory)
+            files = self.files(path)
+            if files:
+                result[directory] = [os.path.join(path, name) for name in files]
+        return result
+
+    def merged(self, paths, stream=None):
+        """
+        Объединенная статистика нескольких профилей.
+
+        Args:
+            paths (list): Пути к файлам профилей
+            stream: Поток вывода для print_stats
+
+        Returns:
+            pstats.Stats: Суммарная статистика
+        """
+        stats = pstats.Stats(paths[0], stream=stream)
+        for path in paths[1:]:
+            stats.add(path)
+        return stats
+
+
+def get_store():
+    """
+    Хранилище профилей из настроек.
+    """
+    return ProfileStore(settings.PROFILE_DIR, settings.PROFILE_MAX_FILES)
+
+
+def should_profile(request):
+    """
+    Нужно ли профилировать запрос (заголовок, выборка или флаг сотрудника).
+
+    Args:
+        request (HttpRequest): Объект HTTP-запроса
+
+    Returns:
+        bool: True - профилировать
+    """
+    token = settings.PROFILE_TOKEN
+    if token and request.headers.get(PROFILE_HEADER) == token:
+        return True
+    if PROFILE_QUERY_FLAG in request.GET:
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_staff:
+            return True
+    rate = settings.PROFILE_SAMPLE_RATE
+    return rate > 0 and random.random() < rate
+
+
+def _view_name(request):
+    """
+    Имя представления запроса (тег профиля).
+    """
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else 'unmatched'
+
+
+class ProfilingMiddleware:
+    """
+    Профилирование выбранных запросов (см. should_profile).
+
+    Ставится после AuthenticationMiddleware: флаг ?_profile=1
+    проверяет request.user. Работает и в синхронном (WSGI),
+    и в асинхронном (ASGI) стеке middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def _start(self, selected):
+        """
+        Запуск профилировщика, если запрос выбран и в потоке нет другого.
+        """
+        if not selected or getattr(_active, 'profiler', None) is not None:
+            return None
+        profiler = cProfile.Profile()
+        _active.profiler = profiler
+        profiler.enable()
+        return profiler
+
+    def _finish(self, request, response, profiler):
+        """
+        Остановка профилировщика и запись профиля.
+        """
+        profiler.disable()
+        _active.profiler = None
+        name = get_store().save(_view_name(request), profiler)
+        response[PROFILE_RESPONSE_HEADER] = name
+        return response
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        profiler = self._start(should_profile(request))
+        if profiler is None:
+            return self.get_response(request)
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            profiler.disable()
+            _active.profiler = None
+            raise
+        return self._finish(request, response, profiler)
+
+    async def __acall__(self, request):
+        if PROFILE_QUERY_FLAG in request.GET:
+            # Загрузка пользователя из сессии - синхронный ORM
+            selected = await sync_to_async(should_profile)(request)
+        else:
+            selected = should_profile(request)
+        profiler = self._start(selected)
+        if profiler is None:
+            return await self.get_response(request)
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            profiler.disable()
+            _active.profiler = None
+            raise
+        return self._finish(request, response, profiler)
@@ -0,0 +1,274 @@
+"""
+Полнотекстовый поиск по каталогу книг.
+
+Поиск выполняется по виртуальной таблице SQLite FTS5 elibrary_app_ebook_fts,
+которая зеркалирует поля title, indexed_author и summary модели EBooksModel.
+Таблица создается миграциями 0003_ebook_fts и 0008_ebook_author_fk и
+поддерживается в актуальном состоянии триггерами базы данных при
+сохранении и удалении книг.
+
+Результаты ранжируются функцией BM25: совпадение в названии весит больше,
+чем в имени автора, а совпадение в имени автора больше, чем в аннотации.
+
+Текст страниц PDF (модель BookPage) индексируется отдельной таблицей
+elibrary_app_bookpage_fts, чтобы находить книгу с точностью до страницы.
+
+SQLite удаляет триггеры вместе с таблицей, а Django при изменении полей
+модели пересоздает ее таблицу. Поэтому после каждого migrate триггеры
+проверяются и при необходимости создаются заново (ensure_search_triggers).
+"""
+
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.models.expressions import RawSQL
+
+from elibrary_app.models import EBooksModel
+
+
+# Имя виртуальной таблицы полнотекстового индекса
+FTS_TABLE = 'elibrary_app_ebook_fts'
+
+# Имя виртуальной таблицы индекса текста страниц
+PAGES_FTS_TABLE = 'elibrary_app_bookpage_fts'
+
+# Столбцы индексов, на которые рассчитаны триггеры FTS_TRIGGERS
+FTS_COLUMNS = {
+    FTS_TABLE: ('title', 'indexed_author', 'summary'),
+    PAGES_FTS_TABLE: ('text',),
+}
+
+# Веса столбцов для BM25 в порядке объявления: title, indexed_author, summary
+BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+# Триггеры синхронизации индексов с исходными таблицами
+# (те же, что создаются миграциями 0008_ebook_author_fk и 0004_bookpage)
+FTS_TRIGGERS = {
+    FTS_TABLE: {
+        'elibrary_app_ebook_fts_ai': """
+            CREATE TRIGGER IF NOT EXISTS elibrary_app_ebook_fts_ai
+            AFTER INSERT ON elibrary_app_ebooksmodel BEGIN
+                INSERT INTO elibrary_app_ebook_fts(rowid, title, indexed_author, summary)
+                VALUES (new.id, new.title, new.indexed_author, new.summary);
+            END
+        """,
+        'elibrary_app_ebook_fts_ad': """
+            CREATE TRIGGER IF NOT EXISTS elibrary_app_ebook_fts_ad
+            AFTER DELETE ON elibrary_app_ebooksmodel BEGIN
+                INSERT INTO elibrary_app_ebook_fts(elibrary_app_ebook_fts, rowid, title, indexed_author, summary)
+                VALUES ('delete', old.id, old.title, old.indexed_author, old.summary);
+            END
+        """,
+        'elibrary_app_ebook_fts_au': """
+            CREATE TRIGGER IF NOT EXISTS elibrary_app_ebook_fts_au
+            AFTER UPDATE OF title, indexed_author, summary ON elibrary_app_ebooksmodel BEGIN
+                INSERT INTO elibrary_app_ebook_fts(elibrary_app_ebook_fts, rowid, title, indexed_author, summary)
+                VALUES ('delete', old.id, old.title, old.indexed_author, old.summary);
+                INSERT INTO elibrary_app_ebook_fts(rowid, title, indexed_author, summary)
+                VALUES (new.id, new.title, new.indexed_author, new.summary);
+            END
+        """,
+    },
+    PAGES_FTS_TABLE: {
+        'elibrary_app_bookpage_fts_ai': """
+            CREATE TRIGGER IF NOT EXISTS elibrary_app_bookpage_fts_ai
+            AFTER INSERT ON elibrary_app_bookpage BEGIN
+                INSERT INTO elibrary_app_bookpage_fts(rowid, text) VALUES (new.id, new.text);
+            END
+        """,
+        'elibrary_app_bookpage_fts_ad': """
+            CREATE TRIGGER IF NOT EXISTS elibrary_app_bookpage_fts_ad
+            AFTER DELETE ON elibrary_app_bookpage BEGIN
+                INSERT INTO elibrary_app_bookpage_fts(elibrary_app_bookpage_fts, rowid, text)
+                VALUES ('delete', old.id, old.text);
+            END
+        """,
+        'elibrary_app_bookpage_fts_au': """
+            CREATE TRIGGER IF NOT EXISTS elibrary_app_bookpage_fts_au
+            AFTER UPDATE OF text ON elibrary_app_bookpage BEGIN
+                INSERT INTO elibrary_app_bookpage_fts(elibrary_app_bookpage_fts, rowid, text)
+                VALUES ('delete', old.id, old.text);
+                INSERT INTO elibrary_app_bookpage_fts(rowid, text) VALUES (new.id, new.text);
+            END
+        """,
+    },
+}
+
+# Слова запроса: буквы и цифры любого алфавита
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def build_match_query(query):
+    """
+    Преобразование пользовательского запроса в выражение MATCH для FTS5.
+
+    Каждое слово берется в кавычки, чтобы символы синтаксиса FTS5
+    из пользовательского ввода не ломали запрос. Последнее слово
+    ищется по префиксу, чтобы поиск работал во время набора.
+
+    Args:
+        query (str): Строка поиска, введенная пользователем
+
+    Returns:
+        str: Выражение MATCH или пустая строка, если слов в запросе нет
+    """
+    words = WORD_RE.findall(query or '')
+    if not words:
+        return ''
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def search_books(query, page=1, page_size=20):
+    """
+    Поиск книг с ранжированием по BM25.
+
+    Args:
+        query (str): Строка поиска
+        page (int): Номер страницы, начиная с 1
+        page_size (int): Количество результатов на странице
+
+    Returns:
+        tuple: (список книг страницы в порядке релевантности,
+                признак наличия следующей страницы)
+    """
+    match = build_match_query(query)
+    if not match or connection.vendor != 'sqlite':
+        return [], False
+
+    offset = (max(page, 1) - 1) * page_size
+    weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+    sql = (
+        f'SELECT rowid FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s '
+        f'ORDER BY bm25({FTS_TABLE}, {weights}) '
+        f'LIMIT %s OFFSET %s'
+    )
+
+    # Одна лишняя строка показывает наличие следующей страницы без COUNT(*)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [match, page_size + 1, offset])
+        ids = [row[0] for row in cursor.fetchall()]
+
+    has_next = len(ids) > page_size
+    ids = ids[:page_size]
+
+    # Загрузка книг по первичному ключу с сохранением порядка релевантности;
+    # HTML аннотации результатам поиска не нужен
+    books = EBooksModel.objects.select_related('author').defer('summary_html').in_bulk(ids)
+    return [books[book_id] for book_id in ids if book_id in books], has_next
+
+
+def filter_books(queryset, query):
+    """
+    Отбор книг выборки, найденных полнотекстовым поиском (без ранжирования).
+
+    Условие добавляется к запросу подзапросом к индексу FTS5, поэтому
+    выборку можно дальше фильтровать, сортировать и считать, а база
+    не просматривает все строки книг, как при icontains.
+
+    Args:
+        queryset (QuerySet): Книги
+        query (str): Строка поиска
+
+    Returns:
+        QuerySet | None: Отфильтрованная выборка или None, если слов
+                         в запросе нет или база не SQLite
+    """
+    match = build_match_query(query)
+    if not match or connections[queryset.db].vendor != 'sqlite':
+        return None
+    return queryset.filter(id__in=RawSQL(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match],
+    ))
+
+
+def search_pages(query, limit=10):
+    """
+    Поиск по тексту страниц PDF с указанием номера страницы.
+
+    Args:
+        query (str): Строка поиска
+        limit (int): Максимальное количество найденных страниц
+
+    Returns:
+        list: Словари с ключами book (EBooksModel), number (номер страницы)
+              и snippet (фрагмент текста вокруг совпадения)
+    """
+    match = build_match_query(query)
+    if not match or connection.vendor != 'sqlite':
+        return []
+
+    sql = (
+        f'SELECT page.book_id, page.number, '
+        f"snippet({PAGES_FTS_TABLE}, 0, '', '', '...', 16) "
+        f'FROM {PAGES_FTS_TABLE} '
+        f'JOIN elibrary_app_bookpage AS page ON page.id = {PAGES_FTS_TABLE}.rowid '
+        f'WHERE {PAGES_FTS_TABLE} MATCH %s '
+        f'ORDER BY bm25({PAGES_FTS_TABLE}) '
+        f'LIMIT %s'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [match, limit])
+        rows = cursor.fetchall()
+
+    books = EBooksModel.objects.select_related('author').in_bulk({book_id for book_id, _, _ in rows})
+    return [
+        {'book': books[book_id], 'number': number, 'snippet': snippet}
+        for book_id, number, snippet in rows
+        if book_id in books
+    ]
+
+
+def ensure_search_triggers(sender=None, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    Восстановление триггеров полнотекстовых индексов после миграций.
+
+    Подключается к сигналу post_migrate. Если триггеры индекса пропали
+    (таблица модели была пересоздана миграцией), они создаются заново,
+    а индекс перестраивается, чтобы учесть изменения, сделанные без них.
+
+    Индекс с другим набором столбцов (база откачена к более ранней
+    миграции) пропускается: триггеры из кода ему не подходят.
+
+    Args:
+        sender (AppConfig): Приложение, для которого выполнен migrate
+        using (str): Псевдоним базы данных
+    """
+    target = connections[using]
+    if target.vendor != 'sqlite':
+        return
+
+    with target.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        existing = {row[0] for row in cursor.fetchall()}
+
+        for table, triggers in FTS_TRIGGERS.items():
+            # Миграция с таблицей индекса еще не применена
+            if table not in existing:
+                continue
+            missing = [name for name in triggers if name not in existing]
+            if not missing:
+                continue
+            cursor.execute(f'PRAGMA table_info({table})')
+            if tuple(row[1] for row in cursor.fetchall()) != FTS_COLUMNS[table]:
+                continue
+            for name in missing:
+                cursor.execute(triggers[name])
+            cursor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+
+
+def rebuild_index():
+    """
+    Полное перестроение полнотекстовых индексов книг и страниц.
+
+    Returns:
+        int: Количество книг в индексе после перестроения
+    """
+    with connection.cursor() as cursor:
+        for table in (FTS_TABLE, PAGES_FTS_TABLE):
+            cursor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+            cursor.execute(f"INSERT INTO {table}({table}) VALUES ('optimize')")
+        cursor.execute(f'SELECT COUNT(*) FROM {FTS_TABLE}')
+        return cursor.fetchone()[0]
@@ -0,0 +1,89 @@
+"""
+Обработчики сигналов моделей приложения электронной библиотеки.
+
+Подключаются в ElibraryAppConfig.ready().
+"""
+
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from elibrary_app.caching import bump_generation_on_commit
+from elibrary_app.models import Category, EBooksModel, adjust_book_counts, author_display_name
+from elibrary_app.users import invalidate_user
+
+# Поля пользователя, из которых складывается имя автора
+AUTHOR_NAME_FIELDS = {'first_name', 'last_name', 'username'}
+
+
+@receiver(post_save, sender=EBooksModel)
+def invalidate_explore_on_save(sender, instance, created, using, **kwargs):
+    """
+    Счетчики категорий и инвалидация кеша страницы обзора после сохранения книги.
+
+    Если книга перенесена в другую категорию, инвалидируются обе категории.
+    Выполняется в транзакции EBooksModel.save(); кеш инвалидируется
+    после ее фиксации.
+    """
+    category = instance.category_id
+    loaded = getattr(instance, '_loaded_category', None)
+    if created:
+        adjust_book_counts({category: 1}, using)
+    elif loaded is not None and loaded != category:
+        adjust_book_counts({loaded: -1, category: 1}, using)
+
+    changed = {category} if loaded is None else {category, loaded}
+    bump_generation_on_commit(changed, instance.updated_at, using)
+    instance._loaded_category = category
+
+
+@receiver(post_delete, sender=EBooksModel)
+def invalidate_explore_on_delete(sender, instance, using, **kwargs):
+    """
+    Счетчик категории и инвалидация кеша страницы обзора после удаления книги.
+    """
+    adjust_book_counts({instance.category_id: -1}, using)
+    bump_generation_on_commit([instance.category_id], using=using)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_explore_on_category_change(sender, instance, using, **kwargs):
+    """
+    Инвалидация страницы обзора после изменения категории (заголовок, цвет, порядок).
+    """
+    bump_generation_on_commit([instance.name], using=using)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    Удаление пользователя из кеша CachedModelBackend после изменения.
+    """
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def sync_author_name(sender, instance, update_fields=None, **kwargs):
+    """
+    Обновление имени автора в книгах пользователя после смены имени.
+
+    Имя для отображения берется из пользователя напрямую, а копия
+    в indexed_author нужна полнотекстовому индексу: одно UPDATE по индексу
+    author обновляет книги, а триггеры базы - индекс поиска.
+    """
+    # Например, обновление last_login при входе
+    if update_fields is not None and not AUTHOR_NAME_FIELDS & set(update_fields):
+        return
+
+    name = author_display_name(instance)
+    books = EBooksModel.objects.filter(author=instance).exclude(indexed_author=name)
+    categories = set(books.order_by().values_list('category', flat=True).distinct())
+    if not categories:
+        return
+
+    changed_at = timezone.now()
+    books.update(indexed_author=name, updated_at=changed_at)
+    bump_generation_on_commit(categories, changed_at, books.db)
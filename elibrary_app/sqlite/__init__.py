@@ -0,0 +1,3 @@
+"""
+Бэкенд SQLite с настройкой соединений (см. elibrary_app.sqlite.base).
+"""
@@ -0,0 +1,60 @@
+"""
+Бэкенд базы данных SQLite с настройкой соединения.
+
+Стандартный бэкенд django.db.backends.sqlite3 в Django 4.2 открывает
+соединение с настройками SQLite по умолчанию: журнал отката вместо WAL,
+без ожидания блокировки и с отложенными (DEFERRED) транзакциями.
+При одновременной записи (загрузки, регистрация, сохранение сессий)
+это дает ошибки "database is locked", а чтение ждет записи.
+
+Параметры задаются в DATABASES[...]['OPTIONS']:
+
+    'pragmas': {'journal_mode': 'WAL', 'busy_timeout': 5000, ...}
+        PRAGMA, выполняемые при открытии каждого соединения
+    'transaction_mode': 'IMMEDIATE'
+        режим BEGIN для transaction.atomic: блокировка записи берется
+        в начале транзакции, и ожидание busy_timeout работает; при DEFERRED
+        транзакция, начавшая с чтения, получает SQLITE_BUSY без ожидания
+        при попытке записи
+
+Остальные параметры OPTIONS передаются в sqlite3.connect как обычно.
+Названия совпадают с параметрами init_command/transaction_mode,
+появившимися в Django 5.1, поэтому переход на встроенный бэкенд
+сводится к замене ENGINE.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+# Параметры OPTIONS, которые обрабатывает этот бэкенд, а не sqlite3.connect
+BACKEND_OPTIONS = ('pragmas', 'transaction_mode')
+
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Соединение SQLite с PRAGMA из настроек и режимом начала транзакций.
+    """
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        for name in BACKEND_OPTIONS:
+            params.pop(name, None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        for name, value in self.settings_dict['OPTIONS'].get('pragmas', {}).items():
+            if not name.isidentifier():
+                raise ImproperlyConfigured(f'Некорректное имя PRAGMA: {name!r}')
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict['OPTIONS'].get('transaction_mode')
+        if mode is None:
+            return super()._start_transaction_under_autocommit()
+        if mode.upper() not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(f'Некорректный transaction_mode: {mode!r}')
+        self.cursor().execute(f'BEGIN {mode.upper()}')
@@ -0,0 +1,126 @@
+"""
+Хранилище PDF-файлов с адресацией по содержимому.
+
+Файл сохраняется под именем, производным от SHA-256 его содержимого:
+
+    pdfs/ab/cd/abcd...ef.pdf
+
+Хеш вычисляется в процессе записи загруженного файла на диск, поэтому
+файл читается один раз. Одинаковые файлы, загруженные разными
+пользователями, хранятся в одном экземпляре, а двухуровневое
+разбиение по первым символам хеша не дает одному каталогу разрастись
+до десятков тысяч файлов.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.core.files.utils import validate_file_name
+
+# Имя файла в адресуемом хранилище: <префикс>/ab/cd/<sha256>.pdf
+CONTENT_NAME_RE = re.compile(r'(?:^|/)[0-9a-f]{2}/[0-9a-f]{2}/(?P<digest>[0-9a-f]{64})\.[\w]+$')
+
+# Размер блока при записи файла на диск
+CHUNK_SIZE = 1024 * 1024
+
+
+def digest_from_name(name):
+    """
+    Получение SHA-256 файла из его имени в хранилище.
+
+    Args:
+        name (str): Имя файла относительно MEDIA_ROOT
+
+    Returns:
+        str: Хеш в шестнадцатеричном виде или пустая строка для файлов,
+             сохраненных до перехода на адресацию по содержимому
+    """
+    match = CONTENT_NAME_RE.search(name or '')
+    return match.group('digest') if match else ''
+
+
+def content_name(prefix, digest, extension):
+    """
+    Построение имени файла по хешу содержимого.
+
+    Args:
+        prefix (str): Каталог верхнего уровня (например, 'pdfs')
+        digest (str): SHA-256 в шестнадцатеричном виде
+        extension (str): Расширение файла с точкой
+
+    Returns:
+        str: Имя вида <prefix>/ab/cd/<digest><extension>
+    """
+    return f'{prefix}/{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Файловое хранилище с именами по SHA-256 и дедупликацией.
+
+    Имя, предложенное полем модели (upload_to), задает только каталог
+    верхнего уровня и расширение; итоговое имя определяется содержимым.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        """
+        Имя не подбирается заранее: конфликт имен означает одинаковое
+        содержимое, и такой файл просто не записывается повторно.
+        """
+        return name
+
+    def _save(self, name, content):
+        """
+        Запись файла с одновременным вычислением хеша.
+
+        Файл пишется во временный файл рядом с итоговым каталогом, затем
+        атомарно переименовывается. Если файл с таким хешем уже есть,
+        временный файл удаляется.
+        """
+        prefix = os.path.dirname(name).replace('\\', '/').split('/')[0] or 'files'
+        extension = os.path.splitext(name)[1].lower() or '.bin'
+
+        directory = self.path(prefix)
+        os.makedirs(directory, exist_ok=True)
+
+        digest = hashlib.sha256()
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.upload')
+        try:
+            with os.fdopen(descriptor, 'wb') as temp_file:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks(CHUNK_SIZE):
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+
+            final_name = content_name(prefix, digest.hexdigest(), extension)
+            validate_file_name(final_name, allow_relative_path=True)
+            final_path = self.path(final_name)
+
+            if os.path.exists(final_path):
+                # Такое содержимое уже хранится - повторная копия не нужна
+                os.remove(temp_path)
+            else:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(temp_path, self.file_permissions_mode)
+                os.replace(temp_path, final_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return final_name
+
+
+def get_pdf_storage():
+    """
+    Хранилище для поля EBooksModel.pdf.
+
+    Вызывается Django при загрузке модели; функция вместо экземпляра
+    не дает параметрам хранилища попасть в миграции.
+    """
+    return ContentAddressedStorage()
@@ -0,0 +1,38 @@
+"""
+Тег подключения сторонних CSS и JavaScript (Bootstrap).
+
+    {% load vendor %}
+    {% vendor_asset 'bootstrap-css' %}
+
+Если файл скачан командой vendor_assets, ссылка ведет на статический
+файл с хешем в имени; иначе - на CDN. В обоих случаях браузер проверяет
+содержимое по хешу integrity (elibrary_app.assets.VENDOR_ASSETS).
+"""
+
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+from elibrary_app.assets import VENDOR_ASSETS, vendored
+
+register = template.Library()
+
+
+@register.simple_tag
+def vendor_asset(name):
+    """
+    Тег <link> или <script> для стороннего файла.
+
+    Args:
+        name (str): Имя файла из VENDOR_ASSETS
+
+    Returns:
+        SafeString: HTML-тег подключения
+    """
+    path, cdn_url, integrity = VENDOR_ASSETS[name]
+    url = static(path) if vendored(path) else cdn_url
+    if path.endswith('.css'):
+        return format_html(
+            '<link href="{}" rel="stylesheet" integrity="{}" crossorigin="anonymous">', url, integrity,
+        )
+    return format_html('<script src="{}" integrity="{}" crossorigin="anonymous"></script>', url, integrity)
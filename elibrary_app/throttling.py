@@ -0,0 +1,167 @@
+"""
+Ограничение частоты попыток входа и регистрации.
+
+Вход (auth.authenticate) и регистрация (User.objects.create_user)
+вычисляют хеш пароля PBKDF2 - это сотни миллисекунд процессорного
+времени на попытку. Перебор паролей с одного адреса или по одному
+email может занять все ядра сервера, поэтому декоратор throttle
+проверяет лимиты до вызова представления, то есть до хеширования.
+
+Лимиты работают по алгоритму token bucket: у каждого ключа (IP-адрес
+или email из формы) есть корзина на N попыток, которая равномерно
+пополняется за период. Это скользящее окно без резких границ: после
+исчерпания лимита следующая попытка становится доступна через
+period / N секунд, а не в начале следующей минуты.
+
+Состояние корзин хранится в кеше Django, общем для всех процессов
+сервера. Чтение и запись корзины не атомарны: при одновременных
+запросах с одного ключа лимит может быть превышен на несколько
+попыток, что для защиты от перебора несущественно.
+
+Настройки (settings.py):
+
+    THROTTLE_RATES      - {область: {'ip' | 'email': (попыток, за секунд)}}
+    THROTTLE_IP_HEADER  - заголовок META с адресом клиента за прокси
+                          (например 'HTTP_X_REAL_IP'); по умолчанию REMOTE_ADDR
+
+Отклоненные попытки получают ответ 429 с заголовком Retry-After
+и учитываются в счетчиках /metrics (elibrary_app.metrics).
+"""
+
+import hashlib
+import logging
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from elibrary_app.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Проверяются только запросы, выполняющие хеширование пароля
+THROTTLED_METHODS = ('POST',)
+
+
+def _client_ip(request):
+    """
+    Адрес клиента (с учетом THROTTLE_IP_HEADER за обратным прокси).
+    """
+    header = settings.THROTTLE_IP_HEADER
+    address = request.META.get(header) if header else None
+    return (address or request.META.get('REMOTE_ADDR') or '').split(',')[0].strip()
+
+
+def _identity(request, limit):
+    """
+    Значение, по которому считаются попытки для лимита ('ip' или 'email').
+    """
+    if limit == 'ip':
+        return _client_ip(request)
+    if limit == 'email':
+        return request.POST.get('email', '').strip().lower()
+    raise ValueError(f'Неизвестный лимит: {limit}')
+
+
+def _bucket_key(scope, limit, identity):
+    """
+    Ключ корзины в кеше (email хранится в виде хеша).
+    """
+    digest = hashlib.sha256(identity.encode('utf-8')).hexdigest()[:32]
+    return f'throttle:{scope}:{limit}:{digest}'
+
+
+def _refill(state, capacity, period, now):
+    """
+    Количество токенов в корзине на момент now.
+
+    Args:
+        state (tuple | None): (токены, время обновления) из кеша
+        capacity (int): Размер корзины (попыток за период)
+        period (float): Время полного пополнения корзины в секундах
+        now (float): Текущее время (time.time)
+
+    Returns:
+        float: Доступные токены
+    """
+    if state is None:
+        return float(capacity)
+    tokens, updated = state
+    return min(float(capacity), tokens + max(0.0, now - updated) * capacity / period)
+
+
+def consume(buckets, now=None):
+    """
+    Попытка взять по токену из каждой корзины.
+
+    Токены берутся только если их хватает во всех корзинах: отклоненная
+    попытка не расходует лимиты и не продлевает блокировку.
+
+    Args:
+        buckets (list): Тройки (ключ, попыток, за секунд)
+        now (float): Текущее время (по умолчанию time.time())
+
+    Returns:
+        tuple: (0.0 или время ожидания в секундах, индекс исчерпанной корзины или None)
+    """
+    now = time.time() if now is None else now
+    states = cache.get_many([key for key, capacity, period in buckets])
+
+    available = []
+    for position, (key, capacity, period) in enumerate(buckets):
+        tokens = _refill(states.get(key), capacity, period, now)
+        if tokens < 1:
+            return (1 - tokens) * period / capacity, position
+        available.append(tokens)
+
+    # Корзина хранится, пока не пополнится полностью
+    for (key, capacity, period), tokens in zip(buckets, available):
+        cache.set(key, (tokens - 1, now), timeout=math.ceil(period))
+    return 0.0, None
+
+
+def throttle(scope):
+    """
+    Декоратор представления с лимитами THROTTLE_RATES[scope].
+
+    Args:
+        scope (str): Область лимитов ('login', 'register')
+    """
+    def decorator(view):
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            if request.method not in THROTTLED_METHODS:
+                return view(request, *args, **kwargs)
+
+            limits = [
+                (limit, _identity(request, limit), capacity, period)
+                for limit, (capacity, period) in settings.THROTTLE_RATES.get(scope, {}).items()
+            ]
+            # Пустой email не ограничивается отдельно (его покрывает лимит по IP)
+            limits = [item for item in limits if item[1]]
+            registry.inc('elibrary_throttle_attempts_total', (('scope', scope),))
+
+            wait, exhausted = consume([
+                (_bucket_key(scope, limit, identity), capacity, period)
+                for limit, identity, capacity, period in limits
+            ])
+            if exhausted is None:
+                return view(request, *args, **kwargs)
+
+            limit = limits[exhausted][0]
+            registry.inc('elibrary_throttle_denied_total', (('scope', scope), ('limit', limit)))
+            logger.warning('Превышен лимит попыток', extra={'scope': scope, 'limit': limit})
+
+            retry_after = max(1, math.ceil(wait))
+            response = HttpResponse(
+                f'Слишком много попыток. Повторите через {retry_after} с.',
+                status=429,
+                content_type='text/plain; charset=utf-8',
+            )
+            response['Retry-After'] = str(retry_after)
+            return response
+        return inner
+    return decorator
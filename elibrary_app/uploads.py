@@ -0,0 +1,297 @@
+"""
+Загрузка больших PDF-файлов по частям с возможностью продолжения.
+
+Порядок работы клиента:
+
+    1. POST /uploads/                      - начало сеанса (имя, размер файла)
+    2. PUT  /uploads/<id>/chunks/<номер>/  - отправка частей с заголовком
+                                             X-Chunk-SHA256 (в любом порядке)
+    3. GET  /uploads/<id>/                 - список полученных частей
+                                             (для продолжения после обрыва)
+    4. POST /uploads/<id>/complete/        - проверка и завершение сеанса
+    5. addBook/editBook с полем upload_id  - файл прикрепляется к книге
+                                             через обычную валидацию EBookForm
+
+Часть читается из тела запроса блоками фиксированного размера во
+временный файл (без буферизации всей части в памяти) с вычислением
+хеша и копируется в собираемый файл по своему смещению, только если
+хеш совпал: повторная отправка уже принятой части с искаженным
+содержимым не портит файл.
+
+Сеанс, не завершенный и не прикрепленный к книге за
+CHUNKED_UPLOAD_EXPIRY секунд, считается брошенным: он больше не
+принимает части, а команда manage.py clear_uploads удаляет его вместе
+с собираемым файлом.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.utils import timezone
+
+from elibrary_app.models import ChunkedUpload, UploadChunk
+
+# Размер блока при чтении тела запроса и записи на диск
+BLOCK_SIZE = 64 * 1024
+
+# SHA-256 в шестнадцатеричном виде
+SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+class UploadError(ValueError):
+    """
+    Ошибка загрузки части или завершения сеанса (ответ 400).
+    """
+
+
+def active_uploads():
+    """
+    Сеансы загрузки, начатые не раньше CHUNKED_UPLOAD_EXPIRY секунд назад.
+
+    Returns:
+        QuerySet: Сеансы, с которыми можно продолжать работу
+    """
+    return ChunkedUpload.objects.filter(created_at__gte=_expiry_cutoff())
+
+
+def _expiry_cutoff():
+    """
+    Время начала, раньше которого сеанс считается брошенным.
+    """
+    return timezone.now() - timedelta(seconds=settings.CHUNKED_UPLOAD_EXPIRY)
+
+
+def start_upload(user, filename, size, chunk_size, sha256=''):
+    """
+    Создание сеанса загрузки и файла для сборки.
+
+    Args:
+        user (User): Пользователь, загружающий файл
+        filename (str): Исходное имя файла
+        size (int): Полный размер файла в байтах
+        chunk_size (int): Размер части в байтах
+        sha256 (str): Ожидаемый хеш всего файла (необязательно)
+
+    Returns:
+        ChunkedUpload: Новый сеанс загрузки
+    """
+    sha256 = (sha256 or '').lower()
+    if sha256 and not SHA256_RE.match(sha256):
+        raise UploadError('Некорректный SHA-256 файла')
+
+    upload = ChunkedUpload.objects.create(
+        user=user,
+        filename=os.path.basename(filename)[:255] or 'book.pdf',
+        size=size,
+        chunk_size=chunk_size,
+        sha256=sha256,
+    )
+
+    # Файл сразу создается нужного размера (разреженный), части пишутся по смещениям
+    os.makedirs(os.path.dirname(upload.path), exist_ok=True)
+    with open(upload.path, 'wb') as assembly:
+        assembly.truncate(size)
+    return upload
+
+
+def write_chunk(upload, number, stream, length, expected_sha256):
+    """
+    Проверка части из потока тела запроса и запись в собираемый файл.
+
+    Args:
+        upload (ChunkedUpload): Сеанс загрузки
+        number (int): Номер части, начиная с 0
+        stream: Файловый объект с телом запроса (HttpRequest)
+        length (int): Длина тела запроса (Content-Length)
+        expected_sha256 (str): Хеш части из заголовка X-Chunk-SHA256
+
+    Raises:
+        UploadError: Номер, длина или хеш части не совпадают с ожидаемыми
+    """
+    expected_sha256 = (expected_sha256 or '').lower()
+    if not SHA256_RE.match(expected_sha256):
+        raise UploadError('Не указан SHA-256 части (заголовок X-Chunk-SHA256)')
+    if number >= upload.chunk_count:
+        raise UploadError('Номер части вне диапазона')
+    if length != upload.chunk_length(number):
+        raise UploadError('Размер части не совпадает с ожидаемым')
+
+    digest = hashlib.sha256()
+    remaining = length
+    with tempfile.TemporaryFile(dir=os.path.dirname(upload.path)) as buffer:
+        while remaining:
+            block = stream.read(min(BLOCK_SIZE, remaining))
+            if not block:
+                break
+            digest.update(block)
+            buffer.write(block)
+            remaining -= len(block)
+
+        if remaining:
+            raise UploadError('Часть получена не полностью')
+        if digest.hexdigest() != expected_sha256:
+            # Часть не записывается и должна быть отправлена повторно;
+            # ранее принятое содержимое части остается в файле
+            raise UploadError('SHA-256 части не совпадает')
+
+        buffer.seek(0)
+        with open(upload.path, 'r+b') as assembly:
+            assembly.seek(number * upload.chunk_size)
+            shutil.copyfileobj(buffer, assembly, BLOCK_SIZE)
+
+    UploadChunk.objects.update_or_create(
+        upload=upload, number=number, defaults={'sha256': expected_sha256},
+    )
+
+
+def received_chunks(upload):
+    """
+    Номера уже полученных частей.
+
+    Args:
+        upload (ChunkedUpload): Сеанс загрузки
+
+    Returns:
+        list: Номера частей по возрастанию
+    """
+    return list(upload.chunks.order_by('number').values_list('number', flat=True))
+
+
+def complete_upload(upload):
+    """
+    Проверка полноты файла и завершение сеанса.
+
+    Args:
+        upload (ChunkedUpload): Сеанс загрузки
+
+    Raises:
+        UploadError: Получены не все части или не совпал хеш всего файла
+    """
+    if upload.completed:
+        return
+    if upload.chunks.count() != upload.chunk_count:
+        raise UploadError('Получены не все части файла')
+
+    if upload.sha256:
+        digest = hashlib.sha256()
+        with open(upload.path, 'rb') as assembly:
+            for block in iter(lambda: assembly.read(BLOCK_SIZE), b''):
+                digest.update(block)
+        if digest.hexdigest() != upload.sha256:
+            raise UploadError('SHA-256 файла не совпадает')
+
+    upload.completed = True
+    upload.save(update_fields=['completed'])
+
+
+def upload_status(upload):
+    """
+    Состояние сеанса загрузки для ответа API.
+
+    Args:
+        upload (ChunkedUpload): Сеанс загрузки
+
+    Returns:
+        dict: Данные для JsonResponse
+    """
+    return {
+        'id': str(upload.id),
+        'filename': upload.filename,
+        'size': upload.size,
+        'chunk_size': upload.chunk_size,
+        'chunk_count': upload.chunk_count,
+        'received': received_chunks(upload),
+        'completed': upload.completed,
+    }
+
+
+@contextmanager
+def attach_upload(request):
+    """
+    Файлы формы книги с учетом завершенной загрузки по частям.
+
+    Если в форме нет PDF-файла, но указан upload_id завершенного сеанса
+    текущего пользователя, собранный файл подставляется в поле pdf
+    и дальше проходит обычную валидацию EBookForm. Открытый файл
+    закрывается при выходе из блока with, в том числе если форма
+    не прошла валидацию или сохранение завершилось исключением.
+
+    Args:
+        request (HttpRequest): Объект HTTP-запроса с формой книги
+
+    Yields:
+        tuple: (словарь файлов для формы, сеанс загрузки или None)
+    """
+    upload_id = request.POST.get('upload_id')
+    if request.FILES.get('pdf') or not upload_id:
+        yield request.FILES, None
+        return
+
+    try:
+        upload = active_uploads().get(id=upload_id, user=request.user, completed=True)
+    except (ChunkedUpload.DoesNotExist, ValueError):
+        yield request.FILES, None
+        return
+
+    files = request.FILES.copy()
+    files['pdf'] = UploadedFile(
+        file=open(upload.path, 'rb'),
+        name=upload.filename,
+        content_type='application/pdf',
+        size=upload.size,
+    )
+    try:
+        yield files, upload
+    finally:
+        files['pdf'].close()
+
+
+def discard_upload(upload):
+    """
+    Удаление сеанса загрузки и собранного файла.
+
+    Args:
+        upload (ChunkedUpload): Сеанс загрузки
+    """
+    if os.path.exists(upload.path):
+        os.remove(upload.path)
+    upload.delete()
+
+
+def discard_expired_uploads():
+    """
+    Удаление брошенных сеансов загрузки и их файлов.
+
+    Удаляются сеансы старше CHUNKED_UPLOAD_EXPIRY секунд и такие же
+    старые файлы .part без сеанса (сеансы удаленных пользователей
+    удаляются каскадом без файлов).
+
+    Returns:
+        tuple: (количество удаленных сеансов, количество файлов без сеанса)
+    """
+    sessions = 0
+    for upload in ChunkedUpload.objects.filter(created_at__lt=_expiry_cutoff()).iterator():
+        discard_upload(upload)
+        sessions += 1
+
+    orphans = 0
+    directory = os.path.join(settings.MEDIA_ROOT, 'uploads')
+    if os.path.isdir(directory):
+        known = {f'{upload_id}.part' for upload_id in ChunkedUpload.objects.values_list('id', flat=True)}
+        # Файл создается после строки сеанса: свежий файл может принадлежать
+        # сеансу, начатому уже после выборки known
+        stale = time.time() - settings.CHUNKED_UPLOAD_EXPIRY
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.endswith('.part') and name not in known and os.path.getmtime(path) < stale:
+                os.remove(path)
+                orphans += 1
+    return sessions, orphans
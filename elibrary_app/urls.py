@@ -22,6 +22,15 @@ urlpatterns = [
     # Страница обзора книг по категориям
     path('explore/', views.explore, name='explore'),
     
+    # Подгрузка следующей страницы книг одной категории
+    path('explore/<str:category>/', views.exploreCategory, name='exploreCategory'),
+    
+    # Популярные книги каждой категории (из таблицы рейтинга)
+    path('popular/', views.popular, name='popular'),
+    
+    # Полнотекстовый поиск книг
+    path('search/', views.search, name='search'),
+    
     # Страница регистрации нового пользователя
     path('register/', views.register, name='register'),
     
@@ -40,9 +49,31 @@ urlpatterns = [
     # Просмотр детальной информации о книге (требует ID книги)
     path('viewBook/<int:book_id>/', views.viewBook, name='viewBook'),
     
+    # Скачивание и просмотр PDF-файла книги (поддерживает Range и ETag)
+    path('viewBook/<int:book_id>/pdf/', views.downloadBook, name='downloadBook'),
+    
     # Просмотр книг, добавленных конкретным пользователем (требует ID пользователя)
     path('contri/<int:user_id>/', views.contri, name='contri'),
     
+    # Загрузка больших PDF-файлов по частям
+    path('uploads/', views.uploadStart, name='uploadStart'),
+    path('uploads/<uuid:upload_id>/', views.uploadStatus, name='uploadStatus'),
+    path('uploads/<uuid:upload_id>/chunks/<int:number>/', views.uploadChunk, name='uploadChunk'),
+    path('uploads/<uuid:upload_id>/complete/', views.uploadComplete, name='uploadComplete'),
+    
+    # Потоковая выгрузка каталога (CSV / JSON Lines)
+    path('export/', views.exportBooks, name='exportBooks'),
+    
+    # JSON API каталога (только чтение)
+    path('api/books/', views.apiBooks, name='apiBooks'),
+    path('api/books/<int:book_id>/', views.apiBook, name='apiBook'),
+    
+    # Метрики обработки запросов в формате Prometheus
+    path('metrics', views.metrics, name='metrics'),
+    
+    # Проверка готовности процесса (после прогрева)
+    path('ready', views.readiness, name='readiness'),
+    
     # Выход из системы (завершение сессии)
     path('logout/', views.logout, name='logout')
 ]
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""
+Кеширование пользователя, выполнившего вход.
+
+AuthenticationMiddleware на каждом запросе с сессией загружает
+пользователя из базы (SELECT по auth_user), хотя данные пользователя
+меняются редко. CachedModelBackend хранит объект User в кеше
+USER_CACHE_TIMEOUT секунд; вместе с сессиями cached_db или signed_cookies
+(settings.SESSION_ENGINE) страница авторизованного пользователя
+не обращается к базе ради сессии и пользователя.
+
+Запись удаляется из кеша при сохранении и удалении пользователя
+(сигналы в elibrary_app.signals): смена пароля, имени или is_active
+видна со следующего запроса. Изменения в обход save() (update(),
+права и группы) видны после истечения USER_CACHE_TIMEOUT.
+"""
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from elibrary_app.database import replica_cache_timeout
+
+
+def user_cache_key(user_id):
+    """
+    Ключ кеша пользователя.
+    """
+    return f'auth:user:{user_id}'
+
+
+def invalidate_user(user_id):
+    """
+    Удаление пользователя из кеша.
+
+    Args:
+        user_id (int): Идентификатор пользователя
+    """
+    cache.delete(user_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend, загружающий пользователя сессии через кеш.
+
+    Проверка пароля при входе (authenticate) не кешируется.
+    """
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            cache.set(key, user, replica_cache_timeout(settings.USER_CACHE_TIMEOUT))
+        return user if self.user_can_authenticate(user) else None
@@ -4,16 +4,64 @@
 Этот модуль содержит все представления Django для обработки
 HTTP-запросов в приложении электронной библиотеки. Включает функции
 для регистрации, аутентификации, управления книгами и навигации.
+
+Страницы обзора, книги, списка книг пользователя и отдача PDF-файла
+асинхронные (async def): под ASGI ожидание БД и медленных клиентов
+не занимает потоки пула. Шаблоны страниц рендерятся через
+sync_to_async, потому что контекстные процессоры читают сессию.
 """
 
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
-from elibrary_app.models import EBooksModel
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.views.decorators.http import require_GET, require_http_methods, require_POST, require_safe
+from elibrary_app.models import EBooksModel, PopularBook
 from elibrary_app.forms import EBookForm
+from elibrary_app.pagination import InvalidCursor, akeyset_page, keyset_page, prefetch_first_pages
+from elibrary_app.caching import acached_fragments, acategory_list, cached_fragment, category_list
+from elibrary_app.conditional import (
+    book_etag, book_last_modified, catalog_etag, catalog_last_modified, conditional_page,
+)
+from elibrary_app.database import use_replica
+from elibrary_app.decorators import async_login_required, async_require_safe
+from elibrary_app.downloads import aserve_file
+from elibrary_app.ingest import schedule_ingest
+from elibrary_app.uploads import (
+    UploadError, active_uploads, attach_upload, complete_upload, discard_upload,
+    start_upload, upload_status, write_chunk,
+)
+from elibrary_app.search import search_books, search_pages
+from elibrary_app.export import (
+    FORMATS, export_filename, export_queryset, iter_export, iter_records, parse_since,
+)
+from elibrary_app import api
+from elibrary_app.metrics import metrics_response
+from elibrary_app.popularity import record_download, record_view
+from elibrary_app.throttling import throttle
+from elibrary_app.warmup import is_ready
 from django.contrib.auth.models import User, auth
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 
+logger = logging.getLogger(__name__)
+
+
+# Сортировки списка книг пользователя: ключ keyset-пагинации для каждой
+CONTRI_ORDERINGS = {
+    'new': ('-created_at', '-id'),
+    'title': ('title', 'id'),
+}
 
+# Столбцы, не нужные карточкам страницы обзора (выводится summary_excerpt)
+CARD_DEFERRED = ('summary', 'summary_html')
+
+
+@throttle('register')
 def register(request):
     """
     Обработка регистрации новых пользователей.
@@ -54,6 +102,7 @@ def register(request):
     return render(request, 'register.html')
 
 
+@throttle('login')
 def login(request):
     """
     Обработка аутентификации пользователей.
@@ -79,7 +128,7 @@ def login(request):
         if user is not None:
             # Успешная аутентификация - вход в систему
             auth.login(request, user)
-            print('Вход выполнен')
+            logger.info('Вход выполнен', extra={'user_id': user.id})
             return redirect('home')
         else:
             # Неверные учетные данные
@@ -103,7 +152,96 @@ def home(request):
     return render(request, 'home.html')
 
 
-def explore(request):
+def _render_fragment(category, books, next_cursor):
+    """
+    HTML карточек одной страницы книг категории (фрагмент exploreBooks.html).
+    
+    Args:
+        category (Category): Категория
+        books (list): Книги страницы
+        next_cursor (str): Курсор следующей страницы или None
+        
+    Returns:
+        str: HTML фрагмента
+    """
+    return render_to_string('exploreBooks.html', {
+        'books': books,
+        'next_cursor': next_cursor,
+        'category': category.name,
+        'color': category.color,
+    })
+
+
+def _category_fragment(category, cursor):
+    """
+    HTML карточек одной страницы книг категории (из кеша фрагментов).
+    
+    Args:
+        category (Category): Категория
+        cursor (str): Курсор страницы или пустая строка для первой страницы
+        
+    Returns:
+        SafeString: HTML фрагмента exploreBooks.html
+    """
+    def render():
+        books, next_cursor = keyset_page(
+            EBooksModel.objects.filter(category=category.name).select_related('author').defer(*CARD_DEFERRED),
+            cursor,
+            settings.EXPLORE_PAGE_SIZE,
+        )
+        return _render_fragment(category, books, next_cursor)
+
+    return cached_fragment(category.name, cursor, render)
+
+
+async def _acategory_fragments(categories, cursors, context):
+    """
+    HTML страниц книг всех категорий страницы обзора.
+    
+    Фрагменты берутся из кеша одним обращением. Первые страницы категорий,
+    которых нет в кеше, выбираются одним запросом (prefetch_first_pages),
+    страницы после курсора - отдельным запросом на категорию.
+    
+    Args:
+        categories (list): Категории с книгами
+        cursors (dict): Имя категории -> курсор (пустой для первой страницы)
+        context (dict): Контекст страницы обзора; при промахе кеша в
+            context['pages'] и context['next_cursors'] добавляются книги
+            страницы и курсор следующей страницы категории
+        
+    Returns:
+        dict: Имя категории -> SafeString с HTML фрагмента
+    """
+    by_name = {category.name: category for category in categories}
+
+    def render(missing):
+        books = EBooksModel.objects.select_related('author').defer(*CARD_DEFERRED)
+        first = [by_name[name] for name, cursor in missing if not cursor]
+        pages = dict(zip(
+            [(category.name, '') for category in first],
+            prefetch_first_pages(first, 'books', books, settings.EXPLORE_PAGE_SIZE) if first else [],
+        ))
+        for name, cursor in missing:
+            if cursor:
+                pages[(name, cursor)] = keyset_page(
+                    books.filter(category=name), cursor, settings.EXPLORE_PAGE_SIZE,
+                )
+
+        rendered = {}
+        for (name, cursor), (page_books, next_cursor) in pages.items():
+            context['pages'][name] = page_books
+            context['next_cursors'][name] = next_cursor
+            rendered[(name, cursor)] = _render_fragment(by_name[name], page_books, next_cursor)
+        return rendered
+
+    pages = [(category.name, cursors[category.name]) for category in categories]
+    fragments = await acached_fragments(pages, sync_to_async(render))
+    return {name: html for (name, cursor), html in fragments.items()}
+
+
+@use_replica
+@conditional_page(catalog_etag, catalog_last_modified)
+async def explore(request):
     """
     Отображение страницы обзора книг по категориям.
     
@@ -113,20 +251,120 @@ def explore(request):
     Returns:
         HttpResponse: Страница с книгами, распределенными по категориям
         
-    Категории:
-        - Education: учебная литература
-        - Fiction: художественная литература  
-        - Science: научная литература
+    Категории берутся из таблицы Category в порядке position: новая
+    категория появляется на странице без изменения кода.
+        
+    Особенности:
+        - Каждая категория выводится постранично (keyset по title/id),
+          позиция задается параметром cursor_<категория>
+        - Список категорий со счетчиками книг - один запрос (или из кеша),
+          первые страницы всех категорий - еще один запрос
+        - Карточки категорий берутся из кеша фрагментов, который
+          инвалидируется при изменении книг этой категории
+        - Поддерживает ETag и If-Modified-Since: если каталог не менялся,
+          возвращается 304 без рендеринга
+    """
+    categories = await acategory_list()
+    context = {
+        'counts': {category.name: category.book_count for category in categories},
+        'pages': {},
+        'next_cursors': {},
+    }
+
+    # Карточки выводятся только для категорий, в которых есть книги
+    filled = [category for category in categories if category.book_count]
+    cursors = {category.name: request.GET.get(f'cursor_{category.name}', '') for category in filled}
+    fragments = await _acategory_fragments(filled, cursors, context)
+    context['sections'] = [(category, fragments.get(category.name)) for category in categories]
+
+    return await sync_to_async(render)(request, 'explore.html', context)
+
+
+@conditional_page(catalog_etag, catalog_last_modified)
+def exploreCategory(request, category):
+    """
+    Следующая страница книг одной категории для подгрузки на странице обзора.
+    
+    Args:
+        request (HttpRequest): Объект HTTP-запроса
+        category (str): Имя категории
+        
+    Returns:
+        HttpResponse: HTML-фрагмент с карточками книг и кнопкой следующей страницы
+    """
+    found = {item.name: item for item in category_list()}.get(category)
+    if found is None:
+        raise Http404('Категория не найдена')
+
+    return HttpResponse(_category_fragment(found, request.GET.get('cursor', '')))
+
+
+@use_replica
+@async_require_safe
+async def popular(request):
+    """
+    Популярные книги каждой категории.
+    
+    Args:
+        request (HttpRequest): Объект HTTP-запроса
+        
+    Returns:
+        HttpResponse: Страница с рейтингом книг по категориям
+        
+    Рейтинг читается из таблицы PopularBook, которая пересчитывается
+    фоном (elibrary_app.popularity): один запрос по индексу
+    (category, rank), без сортировки по счетчикам при запросе.
+    """
+    categories = await acategory_list()
+    entries = PopularBook.objects.select_related('book__author').defer(
+        *(f'book__{name}' for name in CARD_DEFERRED),
+    )
+    rankings = {}
+    async for entry in entries:
+        rankings.setdefault(entry.category_id, []).append(entry)
+    sections = [(category, rankings[category.name]) for category in categories if category.name in rankings]
+
+    return await sync_to_async(render)(request, 'popular.html', {'sections': sections})
+
+
+def search(request):
     """
-    # Получение книг по категориям
-    edu_books = EBooksModel.objects.filter(category='Education')
-    fiction_books = EBooksModel.objects.filter(category='Fiction')
-    science_books = EBooksModel.objects.filter(category='Science')
+    Полнотекстовый поиск книг по названию, автору и аннотации.
     
-    return render(request, 'explore.html', {
-        'edu_books': edu_books,
-        'fiction_books': fiction_books,
-        'science_books': science_books
+    Args:
+        request (HttpRequest): Объект HTTP-запроса
+        
+    Returns:
+        HttpResponse: Страница с результатами поиска
+        
+    Параметры запроса:
+        - q: строка поиска
+        - page: номер страницы результатов (начиная с 1)
+        
+    Особенности:
+        - На первой странице дополнительно выводятся совпадения в тексте PDF
+          с номером страницы книги
+    """
+    query = request.GET.get('q', '').strip()
+
+    # Некорректный номер страницы считается первой страницей
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page = 1
+
+    books, has_next = search_books(query, page, settings.SEARCH_PAGE_SIZE)
+
+    # Совпадения в тексте книг показываются только на первой странице
+    page_hits = search_pages(query, settings.SEARCH_PAGE_HITS) if page == 1 else []
+
+    return render(request, 'search.html', {
+        'query': query,
+        'books': books,
+        'page_hits': page_hits,
+        'page': page,
+        'previous_page': page - 1 if page > 1 else None,
+        'next_page': page + 1 if has_next else None,
     })
 
 
@@ -150,30 +388,46 @@ def addBook(request, user_id):
     user = User.objects.get(id=user_id)
     
     if request.method == 'POST':
-        # Создание формы с данными из запроса
-        form = EBookForm(request.POST, request.FILES)
-        
-        if form.is_valid():
-            # Сохранение книги с указанием автора
-            book = form.save(commit=False)
-            book.author = f"{user.first_name} {user.last_name}"
-            book.author_id = user.id
-            print(book.author)
-            book.save()
-            print('Книга добавлена')
-            return redirect('home')
-        else:
-            # Вывод ошибок валидации формы
-            print(form.errors)
+        # Создание формы с данными из запроса (PDF может быть загружен по частям)
+        with attach_upload(request) as (files, upload):
+            form = EBookForm(request.POST, files)
+            
+            if form.is_valid():
+                # Сохранение книги с указанием автора
+                book = form.save(commit=False)
+                book.author = user
+                book.save()
+                # Одинаковый файл хранится один раз; дубликат находится по индексу хеша
+                if book.duplicates().exists():
+                    messages.info(request, 'Такой PDF-файл уже есть в библиотеке')
+                # Извлечение текста PDF в фоне
+                schedule_ingest(book)
+                # Файл сохранен в хранилище, сеанс загрузки по частям больше не нужен
+                if upload:
+                    files['pdf'].close()
+                    discard_upload(upload)
+                logger.info('Книга добавлена', extra={
+                    'book_id': book.id, 'user_id': user.id, 'category': book.category_id,
+                })
+                return redirect('home')
+            else:
+                # Запись ошибок валидации формы в журнал
+                logger.warning('Ошибка в форме добавления книги', extra={
+                    'user_id': user.id, 'errors': form.errors.get_json_data(),
+                })
     else:
         # Создание пустой формы для GET-запроса
         form = EBookForm()
     
-    return render(request, 'addBook.html', {'form': form})
+    return render(request, 'addBook.html', {
+        'form': form,
+        'chunked_upload_threshold': settings.CHUNKED_UPLOAD_THRESHOLD,
+    })
 
 
-@login_required
-def contri(request, user_id):
+@async_login_required
+@use_replica
+async def contri(request, user_id):
     """
     Просмотр книг, добавленных конкретным пользователем.
     
@@ -183,10 +437,34 @@ def contri(request, user_id):
         
     Returns:
         HttpResponse: Страница со списком книг пользователя
+        
+    Параметры запроса:
+        - sort: порядок вывода (new - сначала новые, title - по названию)
+        - cursor: курсор следующей страницы
+        
+    Особенности:
+        - Постраничный вывод по ключу сортировки (keyset) с использованием
+          составных индексов (author, -created_at, -id) и (author, title, id)
     """
-    # Фильтрация книг по автору
-    books = EBooksModel.objects.filter(author_id=user_id)
-    return render(request, 'contri.html', {'books': books})
+    sort = request.GET.get('sort')
+    if sort not in CONTRI_ORDERINGS:
+        sort = 'new'
+    
+    # Книги автора: одна страница по индексу и общее количество для статистики
+    # HTML аннотации списку не нужен (выводится начало summary)
+    books = EBooksModel.objects.filter(author_id=user_id).defer('summary_html')
+    page, next_cursor = await akeyset_page(
+        books,
+        request.GET.get('cursor', ''),
+        settings.CONTRI_PAGE_SIZE,
+        ordering=CONTRI_ORDERINGS[sort],
+    )
+    return await sync_to_async(render)(request, 'contri.html', {
+        'books': page,
+        'next_cursor': next_cursor,
+        'sort': sort,
+        'total': await books.acount(),
+    })
 
 
 def logout(request):
@@ -245,16 +523,27 @@ def editBook(request, book_id):
     
     if request.method == 'POST':
         # Создание формы с данными и прикрепленным файлом
-        form = EBookForm(request.POST, request.FILES, instance=book)
-        
-        if form.is_valid():
-            # Сохранение изменений
-            form.save()
-            print('Данные о книге изменены')
-            return redirect('contri', user_id=request.user.id)
-        else:
-            # Вывод ошибок валидации
-            print(form.errors)
+        with attach_upload(request) as (files, upload):
+            form = EBookForm(request.POST, files, instance=book)
+            
+            if form.is_valid():
+                # Сохранение изменений
+                book = form.save()
+                # Текст извлекается заново только при замене PDF-файла
+                if 'pdf' in form.changed_data:
+                    schedule_ingest(book)
+                if upload:
+                    files['pdf'].close()
+                    discard_upload(upload)
+                logger.info('Данные о книге изменены', extra={
+                    'book_id': book.id, 'user_id': request.user.id, 'changed': form.changed_data,
+                })
+                return redirect('contri', user_id=request.user.id)
+            else:
+                # Запись ошибок валидации в журнал
+                logger.warning('Ошибка в форме редактирования книги', extra={
+                    'book_id': book.id, 'user_id': request.user.id, 'errors': form.errors.get_json_data(),
+                })
     else:
         # Создание формы с текущими данными книги
         form = EBookForm(instance=book)
@@ -265,7 +554,9 @@ def editBook(request, book_id):
     })
 
 
-def viewBook(request, book_id):
+@use_replica
+@conditional_page(book_etag, book_last_modified)
+async def viewBook(request, book_id):
     """
     Просмотр детальной информации о книге.
     
@@ -277,13 +568,343 @@ def viewBook(request, book_id):
         HttpResponse: Страница с полной информацией о книге
         
     Особенности:
-        - Преобразует переносы строк в аннотации в HTML-теги <br/>
+        - Выводит аннотацию из summary_html (HTML формируется при сохранении книги)
         - Предоставляет ссылки для скачивания PDF-файла
+        - Поддерживает ETag и If-Modified-Since по времени изменения книги:
+          если книга не менялась, возвращается 304 без рендеринга
+        - Учитывает просмотр (elibrary_app.popularity); ответы 304
+          повторных просмотров из кеша браузера не учитываются
     """
-    # Получение книги из базы данных
-    book = get_object_or_404(EBooksModel, id=book_id)
+    # Получение книги вместе с автором одним запросом
+    try:
+        book = await EBooksModel.objects.select_related('author').aget(id=book_id)
+    except EBooksModel.DoesNotExist:
+        raise Http404('Книга не найдена')
+    
+    # Просмотр учитывается в памяти процесса и записывается пакетом
+    record_view(book.id)
     
-    # Форматирование аннотации для HTML-отображения
-    book.summary = book.summary.replace('\n', '<br/>')
+    # Аннотация выводится из summary_html: экранирована и размечена при сохранении
+    return await sync_to_async(render)(request, 'viewBook.html', {'book': book})
+
+
+@async_require_safe
+async def downloadBook(request, book_id):
+    """
+    Отдача PDF-файла книги.
     
-    return render(request, 'viewBook.html', {'book': book})
\ No newline at end of file
+    Args:
+        request (HttpRequest): Объект HTTP-запроса
+        book_id (int): Идентификатор книги
+        
+    Returns:
+        HttpResponse: Файл книги (целиком или запрошенный диапазон байтов)
+        
+    Особенности:
+        - Поддерживает Range (206), ETag и If-Modified-Since (304)
+        - Параметр download=1 отдает файл как вложение для скачивания
+        - При настроенном PDF_SENDFILE_BACKEND передачу выполняет веб-сервер
+        - Под ASGI файл передается асинхронно блоками, не занимая поток
+          на все время скачивания
+        - Учитывает скачивание (elibrary_app.popularity), кроме ответов 304
+          и запросов частей файла после первой
+    """
+    try:
+        book = await EBooksModel.objects.only('id', 'title', 'pdf', 'pdf_sha256').aget(id=book_id)
+    except EBooksModel.DoesNotExist:
+        raise Http404('Книга не найдена')
+    if not book.pdf:
+        raise Http404('Файл книги не найден')
+
+    try:
+        response = await aserve_file(
+            request,
+            book.pdf.path,
+            filename=f"{book.title}.pdf",
+            as_attachment=bool(request.GET.get('download')),
+            # Хеш содержимого - готовый строгий ETag
+            etag=f'"{book.pdf_sha256}"' if book.pdf_sha256 else None,
+        )
+    except FileNotFoundError:
+        raise Http404('Файл книги не найден')
+
+    # Просмотрщик PDF запрашивает файл частями: скачивание учитывается
+    # один раз - по запросу с начала файла (так же и в режиме X-Accel-Redirect,
+    # где диапазон обрабатывает прокси)
+    first_part = request.headers.get('Range', 'bytes=0-').replace(' ', '').startswith('bytes=0-')
+    if request.method == 'GET' and response.status_code in (200, 206) and first_part:
+        record_download(book.id)
+    return response
+
+
+@login_required
+@require_POST
+def uploadStart(request):
+    """
+    Начало загрузки PDF-файла по частям.
+    
+    Args:
+        request (HttpRequest): Объект HTTP-запроса с полями filename, size
+            и необязательным sha256 (хеш всего файла)
+        
+    Returns:
+        JsonResponse: Состояние нового сеанса (id, chunk_size, chunk_count)
+    """
+    try:
+        size = int(request.POST.get('size', ''))
+    except ValueError:
+        return JsonResponse({'error': 'Не указан размер файла'}, status=400)
+    if size <= 0 or size > settings.CHUNKED_UPLOAD_MAX_SIZE:
+        return JsonResponse({'error': 'Недопустимый размер файла'}, status=400)
+
+    try:
+        upload = start_upload(
+            request.user,
+            request.POST.get('filename', ''),
+            size,
+            settings.CHUNKED_UPLOAD_CHUNK_SIZE,
+            request.POST.get('sha256', ''),
+        )
+    except UploadError as error:
+        return JsonResponse({'error': str(error)}, status=400)
+
+    return JsonResponse(upload_status(upload), status=201)
+
+
+@login_required
+@require_GET
+def uploadStatus(request, upload_id):
+    """
+    Состояние загрузки по частям (для продолжения прерванной загрузки).
+    
+    Args:
+        request (HttpRequest): Объект HTTP-запроса
+        upload_id (UUID): Идентификатор сеанса загрузки
+        
+    Returns:
+        JsonResponse: Размеры и номера уже полученных частей
+    """
+    upload = get_object_or_404(active_uploads(), id=upload_id, user=request.user)
+    return JsonResponse(upload_status(upload))
+
+
+@login_required
+@require_http_methods(['PUT'])
+def uploadChunk(request, upload_id, number):
+    """
+    Прием одной части файла.
+    
+    Args:
+        request (HttpRequest): Объект HTTP-запроса; тело - содержимое части,
+            заголовок X-Chunk-SHA256 - ее хеш
+        upload_id (UUID): Идентификатор сеанса загрузки
+        number (int): Номер части, начиная с 0
+        
+    Returns:
+        JsonResponse: Номер принятой части или описание ошибки
+    """
+    upload = get_object_or_404(active_uploads(), id=upload_id, user=request.user, completed=False)
+
+    try:
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+        # Тело читается потоком из request, а не через request.body
+        write_chunk(upload, number, request, length, request.headers.get('X-Chunk-SHA256'))
+    except UploadError as error:
+        return JsonResponse({'error': str(error)}, status=400)
+
+    return JsonResponse({'number': number})
+
+
+@login_required
+@require_POST
+def uploadComplete(request, upload_id):
+    """
+    Завершение загрузки по частям.
+    
+    Args:
+        request (HttpRequest): Объект HTTP-запроса
+        upload_id (UUID): Идентификатор сеанса загрузки
+        
+    Returns:
+        JsonResponse: Состояние сеанса; после завершения его id передается
+            в форму книги в поле upload_id
+    """
+    upload = get_object_or_404(active_uploads(), id=upload_id, user=request.user)
+
+    try:
+        complete_upload(upload)
+    except UploadError as error:
+        return JsonResponse({'error': str(error), **upload_status(upload)}, status=400)
+
+    return JsonResponse(upload_status(upload))
+
+
+@login_required
+@require_safe
+def exportBooks(request):
+    """
+    Потоковая выгрузка метаданных каталога.
+    
+    Args:
+        request (HttpRequest): Объект HTTP-запроса
+        
+    Returns:
+        StreamingHttpResponse: Файл выгрузки, формируемый по мере отправки
+        
+    Параметры запроса:
+        - format: csv (по умолчанию) или jsonl
+        - gzip: 1 - сжать выгрузку (файл .gz)
+        - category: только книги категории
+        - author: идентификатор или логин автора
+        - modified_since: только книги, измененные начиная с этого времени
+        
+    Особенности:
+        - Строки читаются итератором и отдаются блоками, память не зависит
+          от размера каталога
+        - Заголовок X-Export-Until содержит верхнюю границу выгрузки; ее
+          значение передается следующему запросу как modified_since
+    """
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in FORMATS:
+        return HttpResponse('Неизвестный формат выгрузки', status=400)
+    try:
+        modified_since = parse_since(request.GET.get('modified_since'))
+    except ValueError as error:
+        return HttpResponse(str(error), status=400)
+
+    compress = request.GET.get('gzip') == '1'
+    until = timezone.now()
+    books = export_queryset(
+        category=request.GET.get('category'),
+        author=request.GET.get('author'),
+        modified_since=modified_since,
+        until=until,
+    )
+
+    response = StreamingHttpResponse(
+        iter_export(iter_records(books), export_format, compress),
+        content_type='application/gzip' if compress else FORMATS[export_format][0],
+    )
+    response['Content-Disposition'] = f'attachment; filename="{export_filename(export_format, compress)}"'
+    response['X-Export-Until'] = until.isoformat()
+    return response
+
+
+@require_safe
+@api.api_view(api.list_etag)
+def apiBooks(request):
+    """
+    Список книг в JSON.
+    
+    Args:
+        request (HttpRequest): Объект HTTP-запроса
+        
+    Returns:
+        HttpResponse: {"results": [...], "next": курсор или null}
+        
+    Параметры запроса:
+        - fields: поля ответа через запятую (по умолчанию все, кроме summary)
+        - category, author (идентификатор), modified_since: фильтры
+        - sort: id (по умолчанию), title или updated (сначала измененные)
+        - cursor: курсор следующей страницы из поля next
+        - limit: количество книг (не больше API_MAX_PAGE_SIZE)
+    """
+    try:
+        fields = api.parse_fields(request.GET.get('fields'), api.DEFAULT_LIST_FIELDS)
+        ordering = api.API_ORDERINGS.get(request.GET.get('sort') or 'id')
+        if ordering is None:
+            raise api.ApiError('Неизвестная сортировка')
+        limit = int(request.GET.get('limit') or settings.API_PAGE_SIZE)
+        if not 1 <= limit <= settings.API_MAX_PAGE_SIZE:
+            raise api.ApiError(f'limit должен быть от 1 до {settings.API_MAX_PAGE_SIZE}')
+        modified_since = parse_since(request.GET.get('modified_since'))
+    except ValueError as error:
+        return api.json_response({'error': str(error)}, status=400)
+
+    books = EBooksModel.objects.all()
+    if request.GET.get('category'):
+        books = books.filter(category=request.GET['category'])
+    if request.GET.get('author', '').isdigit():
+        books = books.filter(author_id=request.GET['author'])
+    if modified_since:
+        books = books.filter(updated_at__gte=modified_since)
+
+    try:
+        page, next_cursor = keyset_page(
+            api.select_fields(books, fields, ordering),
+            request.GET.get('cursor', ''),
+            limit,
+            ordering=ordering,
+            strict=True,
+        )
+    except InvalidCursor as error:
+        return api.json_response({'error': str(error)}, status=400)
+    return api.json_response({
+        'results': [api.serialize_book(book, fields) for book in page],
+        'next': next_cursor,
+    })
+
+
+@require_safe
+@api.api_view(api.book_etag)
+def apiBook(request, book_id):
+    """
+    Одна книга в JSON.
+    
+    Args:
+        request (HttpRequest): Объект HTTP-запроса
+        book_id (int): Идентификатор книги
+        
+    Returns:
+        HttpResponse: Поля книги (параметр fields ограничивает их набор)
+    """
+    try:
+        fields = api.parse_fields(request.GET.get('fields'), tuple(api.API_FIELDS))
+    except ValueError as error:
+        return api.json_response({'error': str(error)}, status=400)
+
+    book = api.select_fields(EBooksModel.objects.filter(id=book_id), fields).first()
+    if book is None:
+        return api.json_response({'error': 'Книга не найдена'}, status=404)
+    return api.json_response(api.serialize_book(book, fields))
+
+
+@require_GET
+def metrics(request):
+    """
+    Метрики обработки запросов в текстовом формате Prometheus.
+    
+    Args:
+        request (HttpRequest): Объект HTTP-запроса
+        
+    Returns:
+        HttpResponse: Гистограммы времени, числа SQL-запросов и рендеринга
+            шаблонов по представлениям (см. elibrary_app.metrics)
+        
+    Особенности:
+        - При заданном METRICS_TOKEN требуется заголовок Authorization: Bearer
+    """
+    return metrics_response(request)
+
+
+@require_GET
+def readiness(request):
+    """
+    Проверка готовности процесса к приему запросов (readiness probe).
+    
+    Args:
+        request (HttpRequest): Объект HTTP-запроса
+        
+    Returns:
+        HttpResponse: 200 после прогрева процесса (elibrary_app.warmup), иначе 503
+        
+    Особенности:
+        - Если прогрев при запуске не удался, проверка повторяет его
+        - Ответ не кешируется
+    """
+    if is_ready():
+        response = HttpResponse('ok', content_type='text/plain; charset=utf-8')
+    else:
+        response = HttpResponse('Прогрев не завершен', status=503, content_type='text/plain; charset=utf-8')
+    response['Cache-Control'] = 'no-store'
+    return response
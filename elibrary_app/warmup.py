@@ -0,0 +1,250 @@
+"""
+Прогрев процесса сервера перед приемом запросов.
+
+Первые запросы к новому воркеру заметно медленнее последующих: шаблоны
+читаются с диска и компилируются, строится таблица маршрутов,
+а кеш страницы обзора пуст. warmup() выполняет эту работу заранее:
+
+    1. templates - компиляция всех шаблонов проекта через кеширующий
+       загрузчик (последующие get_template берут готовый объект)
+    2. urls      - построение таблицы маршрутов, reverse и resolve
+       каждого именованного маршрута
+    3. database  - проверка доступности основной базы и реплики (SELECT 1)
+    4. caches    - список категорий со счетчиками, время изменения
+       каталога и первые страницы категорий страницы обзора
+
+wsgi.py и asgi.py вызывают warmup_on_start() после создания приложения,
+то есть до того, как воркер начнет принимать запросы (отключается
+настройкой WARMUP_ON_START). При запуске gunicorn с --preload приложение
+создается в главном процессе до fork: соединения с базой нельзя
+разделять между процессами, поэтому в этом случае вызывайте warmup()
+в хуке post_fork. Команда manage.py warmup выполняет те же шаги
+и выводит их время.
+
+Соединения Django принадлежат потоку: соединение, открытое шагом
+database, используется только запросами того же потока (синхронный
+воркер gunicorn), а потоки многопоточного сервера и ASGI открывают
+свои соединения на первом запросе. Поэтому шаг database - только
+проверка доступности базы, а не прогрев соединений обработчиков.
+
+Проверка готовности (маршрут readiness) отвечает 200 только после
+успешного прогрева; если прогрев не удался (например, база недоступна
+при старте), проверка повторяет его.
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.urls import NoReverseMatch, URLPattern, URLResolver, converters, get_resolver, resolve, reverse
+
+logger = logging.getLogger(__name__)
+
+# Значения параметров маршрутов для reverse по типу конвертера
+SAMPLE_VALUES = {
+    converters.IntConverter: 1,
+    converters.StringConverter: 'warmup',
+    converters.SlugConverter: 'warmup',
+    converters.PathConverter: 'warmup',
+    converters.UUIDConverter: uuid.UUID(int=0),
+}
+
+# Прогрев завершен успешно
+_ready = threading.Event()
+
+# Одновременно выполняется только один прогрев
+_lock = threading.Lock()
+
+
+def warm_templates():
+    """
+    Компиляция шаблонов проекта (каталоги внутри BASE_DIR).
+
+    Returns:
+        int: Количество загруженных шаблонов
+    """
+    root = os.fspath(settings.BASE_DIR)
+    loaded = 0
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        for directory in backend.template_dirs:
+            directory = os.fspath(directory)
+            if not directory.startswith(root) or not os.path.isdir(directory):
+                continue
+            for current, _, filenames in os.walk(directory):
+                for filename in filenames:
+                    if not filename.endswith(('.html', '.txt')):
+                        continue
+                    name = os.path.relpath(os.path.join(current, filename), directory)
+                    backend.get_template(name.replace(os.sep, '/'))
+                    loaded += 1
+    return loaded
+
+
+def _named_patterns(resolver, namespace=''):
+    """
+    Именованные маршруты: пары (полное имя, конвертеры параметров).
+    """
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            prefix = f'{namespace}{pattern.namespace}:' if pattern.namespace else namespace
+            outer = pattern.pattern.converters
+            for name, inner in _named_patterns(pattern, prefix):
+                yield name, {**outer, **inner}
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield f'{namespace}{pattern.name}', pattern.pattern.converters
+
+
+def warm_urls():
+    """
+    Построение таблицы маршрутов и проверка каждого именованного маршрута.
+
+    Маршруты с параметрами без известного конвертера (регулярные
+    выражения админки) пропускаются: для них строится только таблица.
+
+    Returns:
+        int: Количество маршрутов, для которых выполнены reverse и resolve
+    """
+    resolver = get_resolver()
+    # Обращение к reverse_dict строит таблицы маршрутов всех пространств имен
+    resolver.reverse_dict
+    checked = 0
+    for name, params in _named_patterns(resolver):
+        kwargs = {}
+        for param, converter in params.items():
+            if type(converter) not in SAMPLE_VALUES:
+                break
+            kwargs[param] = SAMPLE_VALUES[type(converter)]
+        else:
+            try:
+                resolve(reverse(name, kwargs=kwargs))
+            except NoReverseMatch:
+                continue
+            checked += 1
+    return checked
+
+
+def check_database():
+    """
+    Проверка доступности основной базы и реплики запросом SELECT 1.
+
+    Соединения открываются в текущем потоке и не прогревают соединения
+    потоков, обрабатывающих запросы (см. описание модуля).
+
+    Returns:
+        int: Количество проверенных баз
+    """
+    aliases = {DEFAULT_DB_ALIAS, settings.DATABASE_REPLICA} - {None}
+    for alias in aliases:
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SELECT 1')
+    return len(aliases)
+
+
+def warm_caches():
+    """
+    Заполнение кеша страницы обзора.
+
+    Первые страницы всех категорий с книгами рендерятся тем же кодом,
+    что и на странице обзора (один запрос на все категории).
+
+    Returns:
+        int: Количество категорий с книгами
+    """
+    from elibrary_app import views
+    from elibrary_app.caching import catalog_changed_at, category_list
+
+    catalog_changed_at()
+    filled = [category for category in category_list() if category.book_count]
+    if filled:
+        context = {'pages': {}, 'next_cursors': {}}
+        cursors = {category.name: '' for category in filled}
+        async_to_sync(views._acategory_fragments)(filled, cursors, context)
+    return len(filled)
+
+
+# Шаги прогрева по порядку
+STEPS = (
+    ('templates', warm_templates),
+    ('urls', warm_urls),
+    ('database', check_database),
+    ('caches', warm_caches),
+)
+
+
+def _run():
+    """
+    Шаги прогрева (вызывается под блокировкой _lock).
+    """
+    report = []
+    for name, step in STEPS:
+        started = time.perf_counter()
+        result = step()
+        report.append((name, result, time.perf_counter() - started))
+    _ready.set()
+    logger.info('Прогрев завершен', extra={
+        'steps': {name: round(elapsed * 1000, 1) for name, _, elapsed in report},
+    })
+    return report
+
+
+def warmup():
+    """
+    Выполнение всех шагов прогрева.
+
+    Returns:
+        list: Тройки (шаг, результат шага, время в секундах)
+
+    Raises:
+        Exception: Ошибка шага; готовность не отмечается
+    """
+    with _lock:
+        return _run()
+
+
+def warmup_on_start():
+    """
+    Прогрев при запуске воркера (wsgi.py, asgi.py).
+
+    Ошибка прогрева не мешает запуску: она записывается в журнал,
+    а проверка готовности повторит прогрев.
+    """
+    if not settings.WARMUP_ON_START:
+        return
+    try:
+        warmup()
+    except Exception:
+        logger.exception('Прогрев не выполнен')
+
+
+def is_ready():
+    """
+    Готов ли процесс к приему запросов.
+
+    Если прогрев еще не выполнен успешно и не идет в другом потоке,
+    он выполняется сейчас.
+
+    Returns:
+        bool: True - прогрев завершен
+    """
+    if _ready.is_set():
+        return True
+    if not _lock.acquire(blocking=False):
+        return False
+    try:
+        if not _ready.is_set():
+            _run()
+    except Exception:
+        logger.exception('Прогрев не выполнен')
+        return False
+    finally:
+        _lock.release()
+    return True
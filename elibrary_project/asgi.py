@@ -12,5 +12,13 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'elibrary_project.settings')
+# Соединения с базой не переживают запрос: под ASGI они открываются
+# в потоках sync_to_async и иначе остаются открытыми (settings.CONN_MAX_AGE)
+os.environ.setdefault('DJANGO_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
+
+# Прогрев воркера до приема первого запроса (elibrary_app.warmup)
+from elibrary_app.warmup import warmup_on_start  # noqa: E402
+
+warmup_on_start()
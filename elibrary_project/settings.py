@@ -38,12 +38,16 @@ INSTALLED_APPS = [
 
 # Промежуточное программное обеспечение (Middleware)
 MIDDLEWARE = [
+    'elibrary_app.assets.PrecompressedStaticMiddleware',      # Статика из STATIC_ROOT (сжатые копии, immutable)
+    'elibrary_app.metrics.RequestMetricsMiddleware',          # Замеры запросов (Server-Timing, /metrics)
     'django.middleware.security.SecurityMiddleware',          # Безопасность
     'django.contrib.sessions.middleware.SessionMiddleware',   # Управление сессиями
     'django.middleware.common.CommonMiddleware',              # Общие функции
     'django.middleware.csrf.CsrfViewMiddleware',              # Защита от CSRF-атак
     'django.contrib.auth.middleware.AuthenticationMiddleware', # Аутентификация
     'django.contrib.messages.middleware.MessageMiddleware',   # Сообщения
+    'elibrary_app.profiling.ProfilingMiddleware',             # Профилирование запросов по требованию
+    'elibrary_app.database.ReadYourWritesMiddleware',         # Чтение своих изменений после записи
     'django.middleware.clickjacking.XFrameOptionsMiddleware', # Защита от clickjacking
 ]
 
@@ -53,7 +57,8 @@ ROOT_URLCONF = 'elibrary_project.urls'
 # Настройки шаблонов
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates с замером времени рендеринга для Server-Timing
+        'BACKEND': 'elibrary_app.metrics.TimedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],  # Директория с шаблонами проекта
         'APP_DIRS': True,                  # Поиск шаблонов в приложениях
         'OPTIONS': {
@@ -70,14 +75,61 @@ TEMPLATES = [
 # WSGI приложение для развертывания
 WSGI_APPLICATION = 'elibrary_project.wsgi.application'
 
+# Параметры соединений SQLite (бэкенд elibrary_app.sqlite):
+#   journal_mode=WAL     - чтение не ждет записи
+#   busy_timeout         - ожидание блокировки (мс) вместо "database is locked"
+#   synchronous=NORMAL   - безопасно в режиме WAL и заметно быстрее FULL
+#   mmap_size            - чтение файла через отображение в память (байты)
+#   cache_size           - кеш страниц соединения (отрицательное значение - в КБ)
+#   transaction_mode     - BEGIN IMMEDIATE: блокировка записи в начале транзакции
+SQLITE_OPTIONS = {
+    'pragmas': {
+        'journal_mode': 'WAL',
+        'busy_timeout': 5000,
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,
+        'temp_store': 'MEMORY',
+    },
+    'transaction_mode': 'IMMEDIATE',
+}
+
+# Время жизни соединения с базой (секунды). Под WSGI соединение живет между
+# запросами, и PRAGMA выполняются один раз. Под ASGI синхронные обращения
+# к базе выполняются в потоках sync_to_async, и долгоживущие соединения
+# остаются открытыми в этих потоках: asgi.py по умолчанию задает 0.
+# Значение переопределяется переменной окружения DJANGO_CONN_MAX_AGE
+CONN_MAX_AGE = int(os.environ.get('DJANGO_CONN_MAX_AGE', 600))
+
 # Настройки базы данных
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',  # Движок базы данных (SQLite)
+        'ENGINE': 'elibrary_app.sqlite',         # SQLite с настройкой соединений
         'NAME': BASE_DIR / 'db.sqlite3',         # Путь к файлу базы данных
-    }
+        'OPTIONS': SQLITE_OPTIONS,
+        'CONN_MAX_AGE': CONN_MAX_AGE,            # 0 под ASGI (см. выше)
+        'CONN_HEALTH_CHECKS': True,
+    },
+    # Реплика для чтения страниц каталога (elibrary_app.database).
+    # По умолчанию - тот же файл через отдельное соединение; для настоящей
+    # реплики укажите копию базы, которую поддерживает Litestream или sqlite3 .backup
+    'replica': {
+        'ENGINE': 'elibrary_app.sqlite',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': SQLITE_OPTIONS,
+        'CONN_MAX_AGE': CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+    },
 }
 
+# Чтение страниц обзора, книги и "Мои книги" с реплики, запись - в default
+DATABASE_ROUTERS = ['elibrary_app.database.ReplicaRouter']
+DATABASE_REPLICA = 'replica'
+
+# Сколько секунд после запроса с записью клиент читает из default
+# (должно превышать задержку реплики); столько же кешируются данные с реплики
+REPLICA_STICKY_SECONDS = 10
+
 # Валидаторы паролей для повышения безопасности
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -103,10 +155,153 @@ USE_TZ = True              # Использование временных зо
 # Настройки статических файлов (CSS, JavaScript, изображения)
 STATIC_URL = '/static/'    # URL-префикс для статических файлов
 STATICFILES_DIRS = [BASE_DIR / 'static']  # Дополнительные директории со статическими файлами
+STATIC_ROOT = BASE_DIR / 'staticfiles'     # Куда collectstatic собирает файлы для раздачи
+
+# collectstatic добавляет к именам хеш содержимого и создает сжатые копии
+# .gz/.br (elibrary_app.assets); {% static %} возвращает имя с хешем
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'elibrary_app.assets.CompressedManifestStaticFilesStorage'},
+}
 
 # Настройки медиа-файлов (загружаемые пользователями - PDF книги)
 MEDIA_URL = '/media/'      # URL-префикс для медиа-файлов
 MEDIA_ROOT = BASE_DIR / 'media'  # Директория для хранения медиа-файлов
 
+# Количество книг одной категории на странице обзора (keyset-пагинация)
+EXPLORE_PAGE_SIZE = 24
+
+# Количество книг на странице "Мои книги"
+CONTRI_PAGE_SIZE = 24
+
+# Количество строк, читаемых из базы за раз при выгрузке каталога
+EXPORT_CHUNK_SIZE = 2000
+
+# JSON API: размер страницы списка по умолчанию и максимальный
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 200
+
+# Время хранения готовых ответов API в кеше (ключ включает ETag)
+API_CACHE_TIMEOUT = 60 * 60
+
+# Кеш приложения (фрагменты страницы обзора и другие данные).
+# Файловый кеш общий для всех процессов сервера, поэтому инвалидация
+# после изменения книги видна во всех воркерах.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+    }
+}
+
+# Время жизни закешированных фрагментов страницы обзора (секунды)
+EXPLORE_CACHE_TIMEOUT = 60 * 60
+
+# Хранение сессий:
+#   'django.contrib.sessions.backends.cached_db'     - чтение из кеша, запись
+#       в кеш и базу (сессии переживают очистку кеша)
+#   'django.contrib.sessions.backends.signed_cookies' - данные в подписанной
+#       cookie без обращений к базе и кешу (не больше ~4 КБ; выход не отзывает
+#       скопированную cookie до истечения SESSION_COOKIE_AGE)
+#   'django.contrib.sessions.backends.db'            - только база (по умолчанию Django)
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'default'
+
+# Пользователь сессии загружается через кеш (elibrary_app.users)
+AUTHENTICATION_BACKENDS = ['elibrary_app.users.CachedModelBackend']
+
+# Время жизни пользователя в кеше (секунды); при сохранении пользователя
+# запись удаляется сразу
+USER_CACHE_TIMEOUT = 60
+
+# Лимиты попыток входа и регистрации (elibrary_app.throttling): для каждой
+# формы - (попыток, за секунд) по IP-адресу и по email из формы.
+# Попытки восстанавливаются равномерно: 5 за 300 секунд - одна в минуту
+THROTTLE_RATES = {
+    'login': {'ip': (30, 60), 'email': (5, 300)},
+    'register': {'ip': (5, 600), 'email': (3, 600)},
+}
+
+# Заголовок с адресом клиента за обратным прокси (например 'HTTP_X_REAL_IP');
+# None - REMOTE_ADDR. Задавайте только если прокси перезаписывает заголовок
+THROTTLE_IP_HEADER = None
+
+# Версия HTML-страниц для ETag условных запросов (увеличить при изменении
+# шаблонов страниц книги и обзора, чтобы браузеры не показывали старые)
+PAGE_ETAG_VERSION = 3
+
+# Список книг в админке: книги с фильтром или поиском считаются не дальше
+# этого количества (без фильтров - сумма счетчиков категорий)
+ADMIN_COUNT_LIMIT = 10000
+
+# Количество результатов на странице полнотекстового поиска
+SEARCH_PAGE_SIZE = 20
+
+# Количество совпадений в тексте PDF, показываемых на странице поиска
+SEARCH_PAGE_HITS = 10
+
+# Число процессов для фонового извлечения текста из PDF (0 - синхронно)
+PDF_INGEST_WORKERS = min(4, os.cpu_count() or 1)
+
+# Передача PDF-файлов фронтовым прокси:
+#   None    - файл отдает Django (Range, sendfile через wsgi.file_wrapper)
+#   'nginx' - заголовок X-Accel-Redirect с префиксом PDF_SENDFILE_URL_PREFIX
+#   'apache' - заголовок X-Sendfile с абсолютным путем к файлу
+PDF_SENDFILE_BACKEND = None
+PDF_SENDFILE_URL_PREFIX = '/protected/media/'
+
+# Загрузка больших PDF-файлов по частям
+CHUNKED_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024        # Размер части (8 МБ)
+CHUNKED_UPLOAD_MAX_SIZE = 2 * 1024 * 1024 * 1024   # Максимальный размер файла (2 ГБ)
+CHUNKED_UPLOAD_THRESHOLD = 20 * 1024 * 1024        # Файлы больше отправляются по частям
+CHUNKED_UPLOAD_EXPIRY = 24 * 60 * 60               # Сеанс брошен через сутки (manage.py clear_uploads)
+
+# Заголовок Server-Timing с временем БД, шаблонов и всего запроса
+SERVER_TIMING = True
+
+# Токен доступа к /metrics (Authorization: Bearer <токен>); пустой - без проверки
+METRICS_TOKEN = ''
+
+# Профилирование запросов cProfile (elibrary_app.profiling): заголовок
+# X-Profile: <PROFILE_TOKEN> (пустой - отключен), доля случайных запросов
+# PROFILE_SAMPLE_RATE или ?_profile=1 для сотрудников. Сводка - manage.py profiles
+PROFILE_TOKEN = ''
+PROFILE_SAMPLE_RATE = 0.0
+PROFILE_DIR = BASE_DIR / 'profiles'
+# Сколько последних профилей хранить для каждого представления
+PROFILE_MAX_FILES = 50
+
+# Прогрев воркера при запуске (elibrary_app.warmup): шаблоны, маршруты,
+# проверка доступности базы и кеш страницы обзора до приема первого запроса
+WARMUP_ON_START = True
+
+# Счетчики просмотров и скачиваний (elibrary_app.popularity): обращения
+# накапливаются в памяти процесса и записываются раз в COUNTER_FLUSH_INTERVAL
+# секунд или раньше, когда накоплено COUNTER_FLUSH_MAX_BOOKS книг;
+# None - только явной записью flush_hits()
+COUNTER_FLUSH_INTERVAL = 10
+COUNTER_FLUSH_MAX_BOOKS = 1000
+
+# Рейтинг популярных книг: мест в категории, вес скачивания относительно
+# просмотра и период пересчета таблицы рейтинга (секунды)
+POPULAR_LIMIT = 10
+POPULAR_DOWNLOAD_WEIGHT = 5
+POPULAR_REFRESH_INTERVAL = 300
+
+# Журналы приложения: одна строка JSON на событие (elibrary_app.logs)
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'elibrary_app.logs.JsonFormatter'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'json'},
+    },
+    'loggers': {
+        'elibrary_app': {'handlers': ['console'], 'level': 'INFO', 'propagate': True},
+    },
+}
+
 # Автоматическое поле для первичных ключей моделей
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
@@ -3,8 +3,11 @@ URL-конфигурация основного проекта электрон
 
 Этот файл определяет корневые URL-шаблоны проекта, включая:
 - Административную панель Django
-- Статические и медиа-файлы в режиме разработки
+- Медиа-файлы в режиме разработки
 - Маршруты приложения электронной библиотеки
+
+PDF-файлы книг отдаются представлением downloadBook (Range, ETag);
+раздача /media/ через static() оставлена только для режима отладки.
 """
 
 from django.conf import settings
@@ -22,11 +25,12 @@ urlpatterns = [
 ]
 
 # Обслуживание медиа-файлов в режиме разработки
-if settings.DEBUG or not settings.DEBUG:
+if settings.DEBUG:
     """
     Настройка обслуживания медиа-файлов.
     
     Внимание: В продакшн-окружении медиа-файлы должны обслуживаться
-    веб-сервером (Nginx, Apache), а не Django.
+    веб-сервером (Nginx, Apache), а не Django. Книги при этом доступны
+    через представление downloadBook.
     """
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
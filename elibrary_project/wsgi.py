@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'elibrary_project.settings')
 
 application = get_wsgi_application()
+
+# Прогрев воркера до приема первого запроса (elibrary_app.warmup)
+from elibrary_app.warmup import warmup_on_start  # noqa: E402
+
+warmup_on_start()
@@ -0,0 +1,102 @@
+/*
+ * Загрузка больших PDF-файлов по частям для форм addBook/editBook.
+ *
+ * Если выбранный файл больше порога (data-chunked-threshold формы),
+ * он отправляется через API /uploads/ частями с SHA-256 каждой части,
+ * а форма отправляется уже с полем upload_id вместо файла.
+ * Идентификатор сеанса хранится в localStorage, поэтому после обрыва
+ * связи повторная отправка формы догружает только недостающие части.
+ */
+(function () {
+    'use strict';
+
+    function csrfToken(form) {
+        return form.querySelector('input[name="csrfmiddlewaretoken"]').value;
+    }
+
+    function toHex(buffer) {
+        return Array.from(new Uint8Array(buffer))
+            .map(function (byte) { return byte.toString(16).padStart(2, '0'); })
+            .join('');
+    }
+
+    async function request(url, options, form) {
+        options.headers = Object.assign({'X-CSRFToken': csrfToken(form)}, options.headers || {});
+        options.credentials = 'same-origin';
+        const response = await fetch(url, options);
+        const data = await response.json();
+        if (!response.ok) {
+            throw new Error(data.error || response.statusText);
+        }
+        return data;
+    }
+
+    async function startOrResume(form, file) {
+        const key = 'chunked-upload:' + file.name + ':' + file.size + ':' + file.lastModified;
+        const saved = localStorage.getItem(key);
+        if (saved) {
+            try {
+                const status = await request(form.dataset.chunkedUrl + saved + '/', {method: 'GET'}, form);
+                return {key: key, status: status};
+            } catch (error) {
+                localStorage.removeItem(key);
+            }
+        }
+        const body = new FormData();
+        body.append('filename', file.name);
+        body.append('size', file.size);
+        const status = await request(form.dataset.chunkedUrl, {method: 'POST', body: body}, form);
+        localStorage.setItem(key, status.id);
+        return {key: key, status: status};
+    }
+
+    async function uploadFile(form, file, progress) {
+        const session = await startOrResume(form, file);
+        const status = session.status;
+        const received = new Set(status.received);
+        const base = form.dataset.chunkedUrl + status.id + '/';
+
+        for (let number = 0; number < status.chunk_count; number++) {
+            if (!received.has(number)) {
+                const start = number * status.chunk_size;
+                const chunk = file.slice(start, Math.min(start + status.chunk_size, file.size));
+                const digest = toHex(await crypto.subtle.digest('SHA-256', await chunk.arrayBuffer()));
+                await request(base + 'chunks/' + number + '/', {
+                    method: 'PUT',
+                    body: chunk,
+                    headers: {'X-Chunk-SHA256': digest},
+                }, form);
+            }
+            progress.textContent = 'Загружено ' + Math.round((number + 1) * 100 / status.chunk_count) + '%';
+        }
+
+        await request(base + 'complete/', {method: 'POST'}, form);
+        localStorage.removeItem(session.key);
+        return status.id;
+    }
+
+    document.addEventListener('submit', async function (event) {
+        const form = event.target;
+        if (!form.dataset.chunkedUrl || !window.crypto || !crypto.subtle) {
+            return;
+        }
+        const input = form.querySelector('input[type="file"][name="pdf"]');
+        const file = input && input.files[0];
+        if (!file || file.size <= Number(form.dataset.chunkedThreshold)) {
+            return;
+        }
+
+        event.preventDefault();
+        const progress = form.querySelector('.js-upload-progress');
+        const button = form.querySelector('button[type="submit"]');
+        button.disabled = true;
+        try {
+            form.querySelector('input[name="upload_id"]').value = await uploadFile(form, file, progress);
+            input.value = '';
+            form.submit();
+        } catch (error) {
+            progress.textContent = 'Ошибка загрузки: ' + error.message + '. Отправьте форму еще раз, чтобы продолжить.';
+            button.disabled = false;
+        }
+    });
+})();
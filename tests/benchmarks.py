@@ -0,0 +1,526 @@
+"""
+Замеры задержки, числа SQL-запросов и памяти по маршрутам приложения.
+
+Каталог наполняется быстрым сидером (bulk_create пачками), пользователи
+создаются фабриками из tests/factories.py. Каждый именованный маршрут
+elibrary_app/urls.py описан сценарием (Scenario) и прогоняется через
+тестовый клиент Django:
+
+    - p50 / p95 задержки по нескольким повторам (первый повтор - прогрев)
+    - число SQL-запросов отдельного контрольного запроса
+    - пик выделенной памяти Python (tracemalloc) того же запроса
+
+Результаты сохраняются в JSON и сравниваются с базовым файлом
+(tests/benchmark_baseline.json): метрика считается ухудшившейся, если
+выросла больше чем в допустимое число раз и больше минимального шага
+(шум субмиллисекундных замеров не считается регрессией).
+
+Запуск (см. README, раздел о замерах):
+
+    pytest tests/test_benchmarks.py --benchmark --benchmark-sizes=1000,10000
+"""
+
+import hashlib
+import json
+import math
+import os
+import platform
+import random
+import sqlite3
+import time
+import tracemalloc
+from collections import Counter
+
+import django
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from elibrary_app.models import (
+    BookStats, Category, ChunkedUpload, EBooksModel, adjust_book_counts, author_display_name,
+)
+from elibrary_app.popularity import rebuild_ranking
+from elibrary_app.storage import digest_from_name
+from tests.factories import EBookFactory, UserFactory, make_pdf
+
+# Размеры каталога для полного прогона
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+# Размер пачки bulk_create при наполнении каталога
+SEED_BATCH_SIZE = 5000
+
+# Количество авторов, между которыми распределяются книги
+SEED_AUTHORS = 10
+
+# Счетчики обращений создаются для каждой STATS_STEP-й книги
+STATS_STEP = 7
+
+# Повторов каждого запроса (не считая прогрева)
+REPEAT = 20
+
+# Допустимый рост метрики (во сколько раз) и минимальный значимый шаг;
+# p95 по 20 повторам определяется одним-двумя выбросами, поэтому допуск шире
+THRESHOLDS = {'p50_ms': 1.25, 'p95_ms': 2.0, 'queries': 1.0, 'peak_kb': 1.25}
+MIN_DELTA = {'p50_ms': 2.0, 'p95_ms': 10.0, 'queries': 0, 'peak_kb': 256}
+
+# Файл базовых результатов по умолчанию
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'benchmark_baseline.json')
+
+# Пароль пользователей UserFactory
+PASSWORD = 'testpass123'
+CATEGORIES = ('Education', 'Fiction', 'Science')
+WORDS = (
+    'история', 'физика', 'роман', 'алгебра', 'война', 'мир', 'звезды', 'химия',
+    'море', 'город', 'право', 'код', 'сад', 'поэзия', 'логика', 'время',
+)
+
+
+def seed_books(count, authors, batch_size=SEED_BATCH_SIZE, seed=0):
+    """
+    Быстрое наполнение каталога книгами.
+
+    Все книги ссылаются на один PDF-файл в адресуемом хранилище, поэтому
+    на диск пишется один файл независимо от размера каталога. Сигналы
+    post_save при bulk_create не срабатывают, поэтому счетчики книг
+    категорий обновляются отдельно, а кеш обзора сбрасывается после
+    наполнения.
+
+    Args:
+        count (int): Количество книг
+        authors (list): Пользователи, между которыми распределяются книги
+        batch_size (int): Размер пачки bulk_create
+        seed (int): Начальное значение генератора названий
+
+    Returns:
+        str: Имя общего PDF-файла в хранилище
+    """
+    storage = EBooksModel._meta.get_field('pdf').storage
+    pdf_name = storage.save('pdfs/benchmark.pdf', ContentFile(make_pdf(['Benchmark'])))
+    pdf_sha256 = digest_from_name(pdf_name)
+
+    names = [author_display_name(author) for author in authors]
+    generator = random.Random(seed)
+    summary = ' '.join(WORDS) * 8
+    for name in CATEGORIES:
+        Category.objects.get_or_create(name=name, defaults={'title': name})
+
+    created = 0
+    while created < count:
+        batch = []
+        for number in range(created, min(created + batch_size, count)):
+            position = number % len(authors)
+            batch.append(EBooksModel(
+                title=' '.join(generator.choices(WORDS, k=3)) + f' {number}',
+                summary=summary,
+                pages=str(50 + number % 900),
+                pdf=pdf_name,
+                pdf_sha256=pdf_sha256,
+                author=authors[position],
+                indexed_author=names[position],
+                category_id=CATEGORIES[number % len(CATEGORIES)],
+            ))
+            batch[-1].render_summary()
+        EBooksModel.objects.bulk_create(batch, batch_size=batch_size)
+        adjust_book_counts(Counter(book.category_id for book in batch))
+        created += len(batch)
+
+    cache.clear()
+    return pdf_name
+
+
+def seed_stats(step=STATS_STEP):
+    """
+    Счетчики обращений каждой step-й книги и рейтинг по ним.
+    """
+    ids = EBooksModel.objects.order_by('id').values_list('id', flat=True)[::step]
+    BookStats.objects.bulk_create(
+        [BookStats(book_id=book_id, views=book_id % 97, downloads=book_id % 13) for book_id in ids],
+        batch_size=SEED_BATCH_SIZE,
+    )
+    rebuild_ranking()
+
+
+class Scenario:
+    """
+    Замеряемый запрос к одному маршруту.
+
+    Args:
+        key (str): Имя сценария в результатах
+        url_name (str): Имя маршрута в elibrary_app/urls.py
+        request (callable): Функция (client, context, state) -> HttpResponse
+        prepare (callable): Подготовка вне замера: (client, context) -> state
+        login (bool): Запрос от имени автора книг
+        cold (bool): Очищать кеш перед каждым повтором
+    """
+
+    def __init__(self, key, url_name, request, prepare=None, login=False, cold=False):
+        self.key = key
+        self.url_name = url_name
+        self.request = request
+        self.prepare = prepare
+        self.login = login
+        self.cold = cold
+
+
+def _new_book(client, context):
+    """
+    Отдельная книга автора для удаления и редактирования.
+    """
+    return EBookFactory(set_author_data=context['user'], category='Science').id
+
+
+def _new_upload(client, context):
+    """
+    Сеанс загрузки по частям из одной части.
+    """
+    response = client.post(reverse('uploadStart'), {'filename': 'book.pdf', 'size': len(context['pdf'])})
+    return response.json()['id']
+
+
+def _uploaded_chunk(client, context):
+    """
+    Сеанс загрузки, в котором получены все части.
+    """
+    upload_id = _new_upload(client, context)
+    _put_chunk(client, context, upload_id)
+    return upload_id
+
+
+def _put_chunk(client, context, upload_id):
+    """
+    Отправка единственной части файла.
+    """
+    return client.put(
+        reverse('uploadChunk', args=[upload_id, 0]),
+        context['pdf'],
+        content_type='application/octet-stream',
+        HTTP_X_CHUNK_SHA256=context['pdf_sha256'],
+    )
+
+
+def _book_form(context, title):
+    """
+    Данные формы книги с новым PDF-файлом.
+    """
+    return {
+        'title': title,
+        'summary': 'Аннотация',
+        'pages': '100',
+        'category': 'Science',
+        'pdf': SimpleUploadedFile('book.pdf', context['pdf'], content_type='application/pdf'),
+    }
+
+
+SCENARIOS = [
+    Scenario('home', 'home', lambda c, ctx, s: c.get(reverse('home'))),
+    Scenario('explore', 'explore', lambda c, ctx, s: c.get(reverse('explore'))),
+    Scenario('explore:cold', 'explore', lambda c, ctx, s: c.get(reverse('explore')), cold=True),
+    Scenario(
+        'exploreCategory', 'exploreCategory',
+        lambda c, ctx, s: c.get(reverse('exploreCategory', args=['Science'])), cold=True,
+    ),
+    Scenario('popular', 'popular', lambda c, ctx, s: c.get(reverse('popular'))),
+    Scenario('search', 'search', lambda c, ctx, s: c.get(reverse('search'), {'q': 'физика роман'})),
+    Scenario('register', 'register', lambda c, ctx, s: c.get(reverse('register'))),
+    Scenario(
+        'login', 'login',
+        lambda c, ctx, s: c.post(reverse('login'), {'email': ctx['user'].username, 'password': PASSWORD}),
+    ),
+    Scenario(
+        'logout', 'logout', lambda c, ctx, s: c.get(reverse('logout')),
+        prepare=lambda c, ctx: c.force_login(ctx['user']),
+    ),
+    Scenario(
+        'addBook', 'addBook',
+        lambda c, ctx, s: c.post(reverse('addBook', args=[ctx['user'].id]), _book_form(ctx, 'Новая книга')),
+        login=True,
+    ),
+    Scenario(
+        'editBook', 'editBook',
+        lambda c, ctx, s: c.post(reverse('editBook', args=[s]), _book_form(ctx, 'Новое название')),
+        prepare=_new_book, login=True,
+    ),
+    Scenario(
+        'deleteBook', 'deleteBook', lambda c, ctx, s: c.get(reverse('deleteBook', args=[s])),
+        prepare=_new_book, login=True,
+    ),
+    Scenario('viewBook', 'viewBook', lambda c, ctx, s: c.get(reverse('viewBook', args=[ctx['book_id']]))),
+    Scenario(
+        'downloadBook', 'downloadBook',
+        lambda c, ctx, s: c.get(reverse('downloadBook', args=[ctx['book_id']])),
+    ),
+    Scenario(
+        'contri', 'contri', lambda c, ctx, s: c.get(reverse('contri', args=[ctx['user'].id])),
+        login=True,
+    ),
+    Scenario(
+        'uploadStart', 'uploadStart', lambda c, ctx, s: c.post(
+            reverse('uploadStart'), {'filename': 'book.pdf', 'size': len(ctx['pdf'])},
+        ),
+        login=True,
+    ),
+    Scenario(
+        'uploadStatus', 'uploadStatus', lambda c, ctx, s: c.get(reverse('uploadStatus', args=[s])),
+        prepare=_new_upload, login=True,
+    ),
+    Scenario(
+        'uploadChunk', 'uploadChunk', lambda c, ctx, s: _put_chunk(c, ctx, s),
+        prepare=_new_upload, login=True,
+    ),
+    Scenario(
+        'uploadComplete', 'uploadComplete', lambda c, ctx, s: c.post(reverse('uploadComplete', args=[s])),
+        prepare=_uploaded_chunk, login=True,
+    ),
+    Scenario(
+        'exportBooks', 'exportBooks',
+        lambda c, ctx, s: c.get(reverse('exportBooks'), {'category': 'Science', 'author': ctx['user'].id}),
+        login=True,
+    ),
+    Scenario('apiBooks', 'apiBooks', lambda c, ctx, s: c.get(reverse('apiBooks'), {'category': 'Fiction'})),
+    Scenario('apiBook', 'apiBook', lambda c, ctx, s: c.get(reverse('apiBook', args=[ctx['book_id']]))),
+    Scenario('metrics', 'metrics', lambda c, ctx, s: c.get(reverse('metrics'))),
+    Scenario('readiness', 'readiness', lambda c, ctx, s: c.get(reverse('readiness'))),
+]
+
+
+def percentile(values, percent):
+    """
+    Перцентиль по методу ближайшего ранга.
+
+    Args:
+        values (list): Замеры
+        percent (float): Перцентиль от 0 до 100
+
+    Returns:
+        float: Значение перцентиля
+    """
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _consume(response):
+    """
+    Чтение потокового ответа, чтобы в замер попала вся его отдача.
+    """
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+        response.close()
+    return response
+
+
+def _prepare(client, scenario, context):
+    """
+    Подготовка повтора сценария (вне замера).
+
+    Returns:
+        object: Состояние для запроса сценария
+    """
+    state = scenario.prepare(client, context) if scenario.prepare else None
+    if scenario.cold:
+        cache.clear()
+    return state
+
+
+def measure(client, scenario, context, repeat=REPEAT):
+    """
+    Замер одного сценария.
+
+    Args:
+        client (Client): Тестовый клиент (с входом, если нужен сценарию)
+        scenario (Scenario): Сценарий
+        context (dict): Данные каталога (user, book_id, pdf, pdf_sha256)
+        repeat (int): Количество замеряемых повторов
+
+    Returns:
+        dict: p50_ms, p95_ms, queries, peak_kb и status ответа
+
+    Raises:
+        AssertionError: Маршрут ответил ошибкой - замер не имеет смысла
+    """
+    timings = []
+    for iteration in range(repeat + 1):
+        state = _prepare(client, scenario, context)
+        start = time.perf_counter()
+        response = _consume(scenario.request(client, context, state))
+        if iteration:
+            timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code < 400, f'{scenario.key}: ответ {response.status_code}'
+
+    # Контрольный запрос: число SQL-запросов и пик памяти
+    state = _prepare(client, scenario, context)
+    with CaptureQueriesContext(connection) as queries:
+        tracemalloc.start()
+        try:
+            response = _consume(scenario.request(client, context, state))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'queries': len(queries),
+        'peak_kb': round(peak / 1024, 1),
+        'status': response.status_code,
+    }
+
+
+def build_context(size):
+    """
+    Наполнение каталога и данные для сценариев.
+
+    Args:
+        size (int): Количество книг
+
+    Returns:
+        dict: Автор книг (user), книга из середины каталога (book_id),
+              содержимое и хеш PDF для загрузок
+    """
+    authors = UserFactory.create_batch(SEED_AUTHORS)
+    seed_books(size, authors)
+    seed_stats()
+
+    pdf = make_pdf(['Benchmark upload'])
+    middle = EBooksModel.objects.order_by('id').values_list('id', flat=True)[size // 2]
+    return {
+        'user': authors[0],
+        'book_id': middle,
+        'pdf': pdf,
+        'pdf_sha256': hashlib.sha256(pdf).hexdigest(),
+    }
+
+
+def run_scenarios(client_class, context, repeat=REPEAT, scenarios=None):
+    """
+    Прогон сценариев на уже наполненном каталоге.
+
+    Args:
+        client_class (type): Класс тестового клиента
+        context (dict): Результат build_context
+        repeat (int): Количество повторов каждого запроса
+        scenarios (list): Сценарии (по умолчанию SCENARIOS)
+
+    Returns:
+        dict: Имя сценария -> метрики
+    """
+    # Повторы сценария login не упираются в лимит попыток, но проверка
+    # лимитов остается в замере
+    unlimited = {
+        scope: {limit: (10 ** 9, 1) for limit in limits}
+        for scope, limits in settings.THROTTLE_RATES.items()
+    }
+    results = {}
+    with override_settings(THROTTLE_RATES=unlimited):
+        for scenario in scenarios or SCENARIOS:
+            client = client_class()
+            if scenario.login:
+                client.force_login(context['user'])
+            results[scenario.key] = measure(client, scenario, context, repeat)
+            ChunkedUpload.objects.all().delete()
+    return results
+
+
+def run_suite(client_class, size, repeat=REPEAT, baseline=None, tolerance=1.0):
+    """
+    Прогон всех сценариев на каталоге заданного размера.
+
+    Сценарии, ухудшившиеся относительно базовых замеров, замеряются
+    повторно: регрессией считается только ухудшение, подтвержденное
+    вторым замером (кратковременная нагрузка на машину его не дает).
+
+    Args:
+        client_class (type): Класс тестового клиента
+        size (int): Количество книг
+        repeat (int): Количество повторов каждого запроса
+        baseline (dict): Базовые метрики для этого размера каталога
+        tolerance (float): Множитель допустимого роста (см. compare)
+
+    Returns:
+        tuple: (сценарий -> метрики, список подтвержденных ухудшений)
+    """
+    context = build_context(size)
+    results = run_scenarios(client_class, context, repeat)
+    if not baseline:
+        return results, []
+
+    # Повторный замер не исправит отсутствие базового замера
+    regressed = {line.split('.')[0] for line in compare(results, baseline, tolerance) if '.' in line}
+    if regressed:
+        scenarios = [scenario for scenario in SCENARIOS if scenario.key in regressed]
+        results.update(run_scenarios(client_class, context, repeat, scenarios))
+    return results, compare(results, baseline, tolerance)
+
+
+def environment():
+    """
+    Описание окружения замера для файла результатов.
+    """
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'machine': platform.machine(),
+        'created_at': timezone.now().isoformat(timespec='seconds'),
+    }
+
+
+def load_results(path):
+    """
+    Чтение файла результатов.
+
+    Returns:
+        dict | None: Результаты или None, если файла нет
+    """
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as stream:
+        return json.load(stream)
+
+
+def save_results(path, results):
+    """
+    Запись результатов (размер каталога -> сценарий -> метрики) в JSON.
+    """
+    with open(path, 'w', encoding='utf-8') as stream:
+        json.dump({'environment': environment(), 'results': results}, stream, indent=2, sort_keys=True)
+        stream.write('\n')
+
+
+def compare(results, baseline, tolerance=1.0):
+    """
+    Поиск ухудшений относительно базовых результатов.
+
+    Args:
+        results (dict): Сценарий -> метрики для одного размера каталога
+        baseline (dict): Базовые метрики для того же размера
+        tolerance (float): Множитель допустимого роста задержки и памяти
+                           (для нестабильных машин); число запросов
+                           сравнивается строго
+
+    Сценарий без базового замера (новый маршрут) тоже считается
+    ухудшением: маршрут добавляется вместе со своими базовыми метриками.
+
+    Returns:
+        list: Описания ухудшившихся метрик
+    """
+    regressions = []
+    for key, metrics in sorted(results.items()):
+        before = baseline.get(key)
+        if not before:
+            regressions.append(f'{key}: нет базового замера')
+            continue
+        for metric, ratio in THRESHOLDS.items():
+            if metric not in metrics or metric not in before:
+                continue
+            if metric != 'queries':
+                ratio *= tolerance
+            old, new = before[metric], metrics[metric]
+            if new > old * ratio and new - old > MIN_DELTA[metric]:
+                regressions.append(f'{key}.{metric}: {old} -> {new}')
+    return regressions
@@ -0,0 +1,56 @@
+import pytest
+from django.core.cache import cache
+from elibrary_app.popularity import buffer
+
+
+def pytest_addoption(parser):
+    # Параметры замеров производительности (см. tests/benchmarks.py)
+    group = parser.getgroup("benchmark")
+    group.addoption("--benchmark", action="store_true", help="выполнить замеры маршрутов")
+    group.addoption("--benchmark-sizes", default="1000,10000,100000,1000000",
+                    help="размеры каталога через запятую")
+    group.addoption("--benchmark-repeat", type=int, default=20, help="повторов каждого запроса")
+    group.addoption("--benchmark-baseline", default=None,
+                    help="файл базовых результатов (по умолчанию tests/benchmark_baseline.json)")
+    group.addoption("--benchmark-save", default=None, help="файл для сохранения результатов")
+    group.addoption("--benchmark-tolerance", type=float, default=1.0,
+                    help="множитель допустимого роста задержки и памяти")
+
+
+def pytest_generate_tests(metafunc):
+    if "benchmark_size" in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption("benchmark_sizes").split(",")]
+        metafunc.parametrize("benchmark_size", sizes)
+
+
+@pytest.fixture(autouse=True)
+def local_cache(settings):
+    # Каждый тест работает с пустым кешем в памяти процесса
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def plain_static_storage(settings):
+    # Таблица имен с хешем появляется только после collectstatic (см. test_assets.py)
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    }
+
+
+@pytest.fixture(autouse=True)
+def primary_database(settings):
+    # Тесты работают с одной базой; чтение с реплики проверяется в test_database.py
+    settings.DATABASE_REPLICA = None
+
+
+@pytest.fixture(autouse=True)
+def buffered_counters(settings):
+    # Без фонового потока: тесты записывают счетчики явно (flush_hits)
+    settings.COUNTER_FLUSH_INTERVAL = None
+    buffer.drain()
+    yield
+    buffer.drain()
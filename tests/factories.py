@@ -1,6 +1,6 @@
 import factory
 from django.contrib.auth.models import User
-from elibrary_app.models import EBooksModel
+from elibrary_app.models import Category, EBooksModel
 from django.core.files.uploadedfile import SimpleUploadedFile
 
 class UserFactory(factory.django.DjangoModelFactory):
@@ -23,6 +23,14 @@ class UserFactory(factory.django.DjangoModelFactory):
         return user
 
 
+class CategoryFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Category
+        django_get_or_create = ("name",)
+    name = factory.Sequence(lambda number: f"Category{number}")
+    title = factory.LazyAttribute(lambda category: category.name)
+
+
 class EBookFactory(factory.django.DjangoModelFactory):
     class Meta:
         model = EBooksModel
@@ -30,16 +38,48 @@ class EBookFactory(factory.django.DjangoModelFactory):
     summary = factory.Faker("paragraph", nb_sentences=5)
     pages = factory.Faker("random_int", min=50, max=1200)
     pdf = SimpleUploadedFile("test.pdf", b"file_content", content_type="application/pdf")
-    author = factory.Faker("name")
+    author = None
     category = factory.Iterator(["Education", "Fiction", "Science", "Other"])
 
+    @classmethod
+    def _adjust_kwargs(cls, **kwargs):
+        # Категорию можно передать именем: строка таблицы создается при необходимости
+        if isinstance(kwargs.get("category"), str):
+            kwargs["category"] = CategoryFactory(name=kwargs["category"])
+        return kwargs
+
     @factory.post_generation
     def set_author_data(self, create, extracted, **kwargs):
         if not create:
             return
         if extracted:  
             user = extracted
-            self.author = f"{user.first_name} {user.last_name}"
-            self.author_id = user.id
+            self.author = user
         else:
-            pass
\ No newline at end of file
+            pass
+
+
+def make_pdf(pages):
+    """Минимальный PDF, в котором на каждой странице выведена одна строка текста."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+    body = b"%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    body += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    body += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return body
\ No newline at end of file
@@ -0,0 +1,124 @@
+import pytest
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from elibrary_app.caching import category_counts
+from elibrary_app.models import BookPage, Category, EBooksModel
+from tests.factories import EBookFactory, UserFactory, make_pdf
+
+CHANGELIST = "admin:elibrary_app_ebooksmodel_changelist"
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.PDF_INGEST_WORKERS = 0
+
+
+def counts():
+    return dict(Category.objects.values_list("name", "book_count"))
+
+
+def run_action(client, action, books=(), **data):
+    data = {"action": action, ACTION_CHECKBOX_NAME: [book.pk for book in books], **data}
+    return client.post(reverse(CHANGELIST), data, follow=True)
+
+
+@pytest.mark.django_db
+class TestChangelist:
+    def test_no_full_count_of_books(self, admin_client):
+        EBookFactory.create_batch(5, category="Science")
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.get(reverse(CHANGELIST))
+        assert response.status_code == 200
+        assert response.context["cl"].result_count == 5
+        assert not [
+            query["sql"] for query in queries.captured_queries
+            if "COUNT(" in query["sql"] and "elibrary_app_ebooksmodel" in query["sql"]
+        ]
+
+    def test_search_uses_fulltext_index(self, admin_client):
+        EBookFactory(title="Линейная алгебра")
+        EBookFactory(title="Война и мир")
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.get(reverse(CHANGELIST), {"q": "алгеб"})
+        assert [book.title for book in response.context["cl"].result_list] == ["Линейная алгебра"]
+        sql = " ".join(query["sql"] for query in queries.captured_queries)
+        assert "elibrary_app_ebook_fts" in sql and "LIKE" not in sql
+
+    def test_filtered_count_is_bounded(self, admin_client, settings):
+        settings.ADMIN_COUNT_LIMIT = 3
+        EBookFactory.create_batch(5, category="Fiction")
+        EBookFactory(category="Science")
+        response = admin_client.get(reverse(CHANGELIST), {"category": "Fiction"})
+        assert response.context["cl"].result_count == 3
+
+    def test_author_filter(self, admin_client):
+        author = UserFactory(first_name="Анна", last_name="Петрова")
+        EBookFactory(set_author_data=author, title="Книга Анны")
+        EBookFactory(title="Чужая книга")
+        response = admin_client.get(reverse(CHANGELIST), {"author": author.pk})
+        assert [book.title for book in response.context["cl"].result_list] == ["Книга Анны"]
+        assert "Анна Петрова" in response.content.decode("utf-8")
+
+
+@pytest.mark.django_db
+class TestBulkActions:
+    def test_move_to_category(self, admin_client, django_capture_on_commit_callbacks):
+        books = EBookFactory.create_batch(3, category="Education")
+        EBookFactory(category="Science")
+        category_counts()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = run_action(admin_client, "move_to_Science", books[:2])
+        assert "Перенесено" in response.content.decode("utf-8")
+        assert EBooksModel.objects.filter(category="Science").count() == 3
+        assert counts()["Education"] == 1 and counts()["Science"] == 3
+        # Кеш счетчиков страницы обзора сброшен
+        assert category_counts()["Science"] == 3
+
+    def test_move_across_filtered_selection(self, admin_client):
+        EBookFactory.create_batch(4, category="Fiction")
+        EBookFactory(category="Other")
+        data = {"action": "move_to_Education", "select_across": "1", ACTION_CHECKBOX_NAME: ["0"]}
+        admin_client.post(reverse(CHANGELIST) + "?category=Fiction", data)
+        assert counts()["Fiction"] == 0 and counts()["Education"] == 4
+        assert counts()["Other"] == 1
+
+    def test_delete_in_one_statement(self, admin_client, django_capture_on_commit_callbacks):
+        books = EBookFactory.create_batch(3, category="Fiction")
+        category_counts()
+        BookPage.objects.create(book=books[0], number=1, text="текст")
+
+        response = run_action(admin_client, "delete_selected_books", books[:2])
+        assert "Удалить выбранные книги (2)" in response.content.decode("utf-8")
+        assert EBooksModel.objects.count() == 3
+
+        with CaptureQueriesContext(connection) as queries, django_capture_on_commit_callbacks(execute=True):
+            run_action(admin_client, "delete_selected_books", books[:2], post="yes")
+        deletes = [query["sql"] for query in queries.captured_queries if query["sql"].startswith("DELETE")]
+        assert len(deletes) == 2
+        assert list(EBooksModel.objects.values_list("id", flat=True)) == [books[2].id]
+        assert not BookPage.objects.exists()
+        # Работа обработчика post_delete выполнена явно: счетчик и кеш обзора
+        assert counts()["Fiction"] == 1
+        assert category_counts()["Fiction"] == 1
+
+    def test_reextract_text(self, admin_client, django_capture_on_commit_callbacks):
+        book = EBookFactory(pdf=SimpleUploadedFile("book.pdf", make_pdf(["new text"])))
+        BookPage.objects.create(book=book, number=1, text="старый текст")
+        with django_capture_on_commit_callbacks(execute=True):
+            run_action(admin_client, "reextract_selected_text", [book])
+        assert list(book.text_pages.values_list("text", flat=True)) == ["new text"]
+
+
+@pytest.mark.django_db
+def test_category_name_read_only_after_creation(admin_client):
+    category = Category.objects.get(name="Science")
+    url = reverse("admin:elibrary_app_category_change", args=[category.pk])
+    response = admin_client.get(url)
+    assert response.status_code == 200
+    assert 'name="name"' not in response.content.decode("utf-8")
+    assert 'name="name"' in admin_client.get(reverse("admin:elibrary_app_category_add")).content.decode("utf-8")
@@ -0,0 +1,112 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from elibrary_app.models import EBooksModel
+from elibrary_app.pagination import encode_cursor
+from tests.factories import EBookFactory, UserFactory
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.API_PAGE_SIZE = 2
+
+
+@pytest.mark.django_db
+class TestBooksList:
+    def test_default_fields_skip_summary(self, client):
+        EBookFactory(summary="Очень длинная аннотация")
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse("apiBooks"))
+        assert response.status_code == 200
+        book = response.json()["results"][0]
+        assert "summary" not in book
+        assert {"id", "title", "author_name", "pdf_url", "updated_at"} <= book.keys()
+        assert not any('"summary"' in query["sql"] for query in queries.captured_queries)
+
+    def test_sparse_fieldset(self, client):
+        book = EBookFactory(summary="Аннотация")
+        response = client.get(reverse("apiBooks"), {"fields": "title,summary"})
+        assert response.json()["results"] == [{"title": book.title, "summary": "Аннотация"}]
+
+    def test_unknown_field(self, client):
+        response = client.get(reverse("apiBooks"), {"fields": "title,password"})
+        assert response.status_code == 400
+        assert "password" in response.json()["error"]
+
+    def test_cursor_pagination_and_filters(self, client):
+        user = UserFactory()
+        expected = [EBookFactory(category="Science", set_author_data=user).id for _ in range(5)]
+        EBookFactory(category="Fiction", set_author_data=user)
+        EBookFactory(category="Science")
+
+        ids, cursor = [], ""
+        while True:
+            response = client.get(reverse("apiBooks"), {
+                "category": "Science", "author": user.id, "fields": "id", "cursor": cursor,
+            })
+            data = response.json()
+            ids += [book["id"] for book in data["results"]]
+            cursor = data["next"]
+            if not cursor:
+                break
+        assert ids == expected
+
+    @pytest.mark.parametrize("cursor", ["%%%", encode_cursor(["abc"]), encode_cursor([10**30]), encode_cursor([1, 2])])
+    def test_invalid_cursor(self, client, cursor):
+        EBookFactory()
+        response = client.get(reverse("apiBooks"), {"cursor": cursor})
+        assert response.status_code == 400
+        assert response.json() == {"error": "Некорректный курсор"}
+
+    def test_sort_by_title(self, client):
+        for title in ["Вега", "Альфа", "Бета"]:
+            EBookFactory(title=title)
+        response = client.get(reverse("apiBooks"), {"sort": "title", "fields": "title", "limit": 3})
+        assert [book["title"] for book in response.json()["results"]] == ["Альфа", "Бета", "Вега"]
+
+    def test_invalid_limit(self, client):
+        assert client.get(reverse("apiBooks"), {"limit": 1000}).status_code == 400
+
+    def test_etag_and_response_cache(self, client, django_assert_num_queries, django_capture_on_commit_callbacks):
+        EBookFactory()
+        first = client.get(reverse("apiBooks"))
+        assert first["ETag"]
+
+        with django_assert_num_queries(0):
+            assert client.get(reverse("apiBooks"), HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 304
+            cached = client.get(reverse("apiBooks"))
+        assert cached.content == first.content
+
+        with django_capture_on_commit_callbacks(execute=True):
+            EBookFactory()
+        changed = client.get(reverse("apiBooks"), HTTP_IF_NONE_MATCH=first["ETag"])
+        assert changed.status_code == 200
+        assert changed["ETag"] != first["ETag"]
+
+
+@pytest.mark.django_db
+class TestBookDetail:
+    def test_all_fields_by_default(self, client):
+        book = EBookFactory(summary="Аннотация")
+        data = client.get(reverse("apiBook", args=[book.id])).json()
+        assert data["summary"] == "Аннотация"
+        assert data["pdf_url"] == reverse("downloadBook", args=[book.id])
+
+    def test_not_found(self, client):
+        response = client.get(reverse("apiBook", args=[999]))
+        assert response.status_code == 404
+        assert "error" in response.json()
+
+    def test_etag_follows_updates(self, client):
+        book = EBookFactory()
+        etag = client.get(reverse("apiBook", args=[book.id]))["ETag"]
+        assert client.get(reverse("apiBook", args=[book.id]), HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        book.title = "Новое название"
+        book.save()
+        response = client.get(reverse("apiBook", args=[book.id]), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()["title"] == "Новое название"
+        assert EBooksModel.objects.count() == 1
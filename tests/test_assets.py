@@ -0,0 +1,164 @@
+import gzip
+import io
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.http import HttpResponse
+from django.template import Context, Template
+from elibrary_app import assets
+from elibrary_app.assets import IMMUTABLE_CACHE_CONTROL, PrecompressedStaticMiddleware, compress_bytes
+from elibrary_app.management.commands import vendor_assets
+
+STYLE = b"body { color: #333; }\n" * 100
+
+
+@pytest.fixture
+def static_dir(tmp_path, settings):
+    source = tmp_path / "static"
+    (source / "css").mkdir(parents=True)
+    (source / "css" / "style.css").write_bytes(STYLE)
+    (source / "css" / "tiny.css").write_bytes(b"p{}")
+    settings.STATICFILES_DIRS = [source]
+    assets.vendored.cache_clear()
+    yield source
+    assets.vendored.cache_clear()
+
+
+@pytest.fixture
+def collected(static_dir, tmp_path, settings):
+    settings.STATIC_ROOT = tmp_path / "collected"
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {"BACKEND": "elibrary_app.assets.CompressedManifestStaticFilesStorage"},
+    }
+    call_command("collectstatic", interactive=False, verbosity=0)
+    manifest = json.loads((settings.STATIC_ROOT / "staticfiles.json").read_text())
+    return settings.STATIC_ROOT, manifest["paths"]
+
+
+def serve(rf, path, **headers):
+    middleware = PrecompressedStaticMiddleware(lambda request: HttpResponse("view"))
+    response = middleware(rf.get(path, **headers))
+    body = b"".join(response.streaming_content) if response.streaming else response.content
+    return response, body
+
+
+def test_compress_skips_incompressible():
+    assert ".gz" in compress_bytes(STYLE)
+    assert compress_bytes(bytes(range(256))) == {}
+
+
+class TestCollectstatic:
+    def test_hashed_names_and_gzip_copies(self, collected):
+        root, paths = collected
+        hashed = paths["css/style.css"]
+        assert hashed != "css/style.css"
+        assert gzip.decompress((root / (hashed + ".gz")).read_bytes()) == STYLE
+        assert (root / "css/style.css.gz").exists()
+        assert (root / (hashed + ".br")).exists() == (assets.brotli is not None)
+
+    def test_small_files_not_compressed(self, collected):
+        root, paths = collected
+        assert not (root / (paths["css/tiny.css"] + ".gz")).exists()
+
+    def test_static_tag_returns_hashed_url(self, collected):
+        root, paths = collected
+        html = Template("{% load static %}{% static 'css/style.css' %}").render(Context())
+        assert html == "/static/" + paths["css/style.css"]
+
+
+class TestMiddleware:
+    def test_serves_gzip_with_immutable_cache(self, rf, collected):
+        root, paths = collected
+        response, body = serve(rf, "/static/" + paths["css/style.css"], HTTP_ACCEPT_ENCODING="gzip, deflate")
+        assert response["Content-Encoding"] == "gzip"
+        assert response["Content-Type"].startswith("text/css")
+        assert response["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+        assert "Accept-Encoding" in response["Vary"]
+        assert "Content-Disposition" not in response
+        assert gzip.decompress(body) == STYLE
+
+    def test_identity_when_not_accepted(self, rf, collected):
+        root, paths = collected
+        response, body = serve(rf, "/static/" + paths["css/style.css"], HTTP_ACCEPT_ENCODING="gzip;q=0")
+        assert "Content-Encoding" not in response
+        assert body == STYLE
+
+    def test_unhashed_name_short_cache(self, rf, collected):
+        response, body = serve(rf, "/static/css/style.css")
+        assert "immutable" not in response["Cache-Control"]
+
+    def test_unhashed_name_revalidates_with_304(self, rf, collected):
+        response, body = serve(rf, "/static/css/style.css")
+        assert body == STYLE
+        etag, last_modified = response["ETag"], response["Last-Modified"]
+
+        response, body = serve(rf, "/static/css/style.css", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert body == b""
+        assert response["ETag"] == etag
+        assert "immutable" not in response["Cache-Control"]
+
+        response, body = serve(rf, "/static/css/style.css", HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == 304
+
+    def test_compressed_copy_has_own_etag(self, rf, collected):
+        plain, _ = serve(rf, "/static/css/style.css")
+        compressed, _ = serve(rf, "/static/css/style.css", HTTP_ACCEPT_ENCODING="gzip")
+        assert compressed["ETag"] != plain["ETag"]
+
+        response, body = serve(
+            rf, "/static/css/style.css", HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=plain["ETag"],
+        )
+        assert response.status_code == 200
+        assert gzip.decompress(body) == STYLE
+
+    def test_unknown_path_passes_through(self, rf, collected):
+        response, body = serve(rf, "/static/css/missing.css")
+        assert body == b"view"
+
+    def test_without_static_root(self, rf, settings):
+        settings.STATIC_ROOT = None
+        response, body = serve(rf, "/static/css/style.css")
+        assert body == b"view"
+
+
+class TestVendorAssets:
+    def fake_asset(self, monkeypatch, content, integrity):
+        monkeypatch.setattr(vendor_assets, "VENDOR_ASSETS", {
+            "lib-css": ("vendor/lib/lib.min.css", "https://cdn.example.com/lib.min.css", integrity),
+        })
+        monkeypatch.setattr(vendor_assets.urllib.request, "urlopen", lambda url, timeout: io.BytesIO(content))
+
+    def test_downloads_verified_file(self, monkeypatch, static_dir):
+        content = b".btn { display: inline-block; }"
+        self.fake_asset(monkeypatch, content, "sha384-" + vendor_assets.sri_digest(content, "sha384"))
+        call_command("vendor_assets", stdout=io.StringIO())
+        assert (static_dir / "vendor/lib/lib.min.css").read_bytes() == content
+
+    def test_rejects_hash_mismatch(self, monkeypatch, static_dir):
+        self.fake_asset(monkeypatch, b"tampered", "sha384-" + vendor_assets.sri_digest(b"original", "sha384"))
+        with pytest.raises(CommandError):
+            call_command("vendor_assets", stdout=io.StringIO())
+        assert not (static_dir / "vendor/lib/lib.min.css").exists()
+
+    def test_check_reports_missing_and_altered_files(self, static_dir):
+        assert {message.id for message in assets.check_vendor_assets()} == {"elibrary_app.W001"}
+
+        for path, url, integrity in assets.VENDOR_ASSETS.values():
+            (static_dir / path).parent.mkdir(parents=True, exist_ok=True)
+            (static_dir / path).write_bytes(b"/* altered */")
+        assert [message.id for message in assets.check_vendor_assets()] == ["elibrary_app.E001"] * 2
+
+    def test_tag_uses_cdn_until_vendored(self, static_dir):
+        template = Template("{% load vendor %}{% vendor_asset 'bootstrap-css' %}")
+        path, cdn_url, integrity = assets.VENDOR_ASSETS["bootstrap-css"]
+        html = template.render(Context())
+        assert cdn_url in html and integrity in html
+
+        (static_dir / path).parent.mkdir(parents=True)
+        (static_dir / path).write_bytes(b"/* bootstrap */")
+        assets.vendored.cache_clear()
+        html = template.render(Context())
+        assert f'href="/static/{path}"' in html and integrity in html
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from elibrary_app import views
+from elibrary_app.downloads import aiter_file
+from tests.factories import EBookFactory, UserFactory
+
+CONTENT = bytes(range(256)) * 1024
+
+
+@pytest.fixture
+def book(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    pdf = SimpleUploadedFile("book.pdf", CONTENT, content_type="application/pdf")
+    return EBookFactory(title="Книга", pdf=pdf, category="Science")
+
+
+def get(async_client, path, **extra):
+    return async_to_sync(async_client.get)(path, **extra)
+
+
+def body(response):
+    async def consume():
+        return b"".join([chunk async for chunk in response.streaming_content])
+    return async_to_sync(consume)()
+
+
+def test_views_are_async():
+    for view in (views.explore, views.viewBook, views.contri, views.downloadBook):
+        assert asyncio.iscoroutinefunction(view)
+
+
+def test_aiter_file_reads_range(tmp_path):
+    path = tmp_path / "file.bin"
+    path.write_bytes(CONTENT)
+
+    async def read():
+        return [block async for block in aiter_file(str(path), 100, 70000, block_size=65536)]
+
+    blocks = async_to_sync(read)()
+    assert [len(block) for block in blocks] == [65536, 70000 - 65536]
+    assert b"".join(blocks) == CONTENT[100:70100]
+
+
+@pytest.mark.django_db
+class TestAsgiDownload:
+    def test_streams_async_iterator(self, async_client, book):
+        response = get(async_client, reverse("downloadBook", args=[book.id]))
+        assert response.status_code == 200
+        assert response.is_async
+        assert int(response["Content-Length"]) == len(CONTENT)
+        assert body(response) == CONTENT
+
+    def test_range(self, async_client, book):
+        response = get(async_client, reverse("downloadBook", args=[book.id]), headers={"Range": "bytes=10-19"})
+        assert response.status_code == 206
+        assert response["Content-Range"] == f"bytes 10-19/{len(CONTENT)}"
+        assert body(response) == CONTENT[10:20]
+
+    def test_not_modified(self, async_client, book):
+        etag = get(async_client, reverse("downloadBook", args=[book.id]))["ETag"]
+        response = get(async_client, reverse("downloadBook", args=[book.id]), headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    def test_wsgi_keeps_file_response(self, client, book):
+        response = client.get(reverse("downloadBook", args=[book.id]))
+        assert not response.is_async
+        assert b"".join(response.streaming_content) == CONTENT
+
+    def test_method_not_allowed(self, async_client, book):
+        response = async_to_sync(async_client.post)(reverse("downloadBook", args=[book.id]))
+        assert response.status_code == 405
+
+    def test_missing_book(self, async_client):
+        assert get(async_client, reverse("downloadBook", args=[999])).status_code == 404
+
+
+@pytest.mark.django_db
+class TestAsgiPages:
+    def test_explore(self, async_client, book):
+        response = get(async_client, reverse("explore"))
+        assert response.status_code == 200
+        assert "Книга" in response.content.decode()
+
+        again = get(async_client, reverse("explore"), headers={"If-None-Match": response["ETag"]})
+        assert again.status_code == 304
+
+    def test_view_book(self, async_client, book):
+        response = get(async_client, reverse("viewBook", args=[book.id]))
+        assert response.status_code == 200
+        assert response["ETag"]
+        assert get(async_client, reverse("viewBook", args=[999])).status_code == 404
+
+    def test_contri_requires_login(self, async_client):
+        user = UserFactory()
+        response = get(async_client, reverse("contri", args=[user.id]))
+        assert response.status_code == 302
+        assert "next=" in response["Location"]
+
+    def test_contri(self, async_client, book):
+        user = UserFactory()
+        EBookFactory(title="Своя книга", set_author_data=user)
+        async_client.force_login(user)
+        response = get(async_client, reverse("contri", args=[user.id]))
+        assert response.status_code == 200
+        assert "Своя книга" in response.content.decode()
+        assert response.context["total"] == 1
@@ -0,0 +1,96 @@
+import pytest
+from django.urls import reverse
+from elibrary_app.models import EBooksModel
+from elibrary_app.pagination import encode_cursor
+from elibrary_app.search import search_books
+from tests.factories import EBookFactory, UserFactory
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.CONTRI_PAGE_SIZE = 2
+
+
+@pytest.fixture
+def logged_client(client):
+    user = UserFactory()
+    client.force_login(user)
+    return client, user
+
+
+@pytest.mark.django_db
+class TestAuthorForeignKey:
+    def test_rename_propagates_to_display_and_search(self, client):
+        user = UserFactory(first_name="Лев", last_name="Толстой")
+        book = EBookFactory(set_author_data=user)
+        assert search_books("Толстой")[0] == [book]
+
+        user.last_name = "Николаевич"
+        user.save()
+
+        assert search_books("Николаевич")[0] == [book]
+        assert search_books("Толстой")[0] == []
+        response = client.get(reverse("viewBook", args=[book.id]))
+        assert "Лев Николаевич" in response.content.decode()
+
+    def test_last_login_does_not_touch_books(self, django_assert_num_queries):
+        user = UserFactory()
+        EBookFactory(set_author_data=user)
+        with django_assert_num_queries(1):
+            user.save(update_fields=["last_login"])
+
+    def test_deleted_user_keeps_books(self):
+        user = UserFactory()
+        book = EBookFactory(set_author_data=user)
+        user.delete()
+        book.refresh_from_db()
+        assert book.author is None
+
+    def test_explore_authors_without_extra_queries(self, client, django_assert_max_num_queries):
+        for _ in range(5):
+            EBookFactory(category="Science", set_author_data=UserFactory())
+        # количество книг, время изменения каталога и по запросу на категорию
+        with django_assert_max_num_queries(5):
+            response = client.get(reverse("explore"))
+        assert response.status_code == 200
+
+
+@pytest.mark.django_db
+class TestContriPagination:
+    def test_pages_by_title(self, logged_client):
+        client, user = logged_client
+        for title in ["Вега", "Альфа", "Гамма", "Бета", "Дельта"]:
+            EBookFactory(title=title, set_author_data=user)
+        EBookFactory(title="Чужая")
+
+        titles, cursor = [], ""
+        while True:
+            response = client.get(reverse("contri", args=[user.id]), {"sort": "title", "cursor": cursor})
+            assert response.context["total"] == 5
+            titles += [book.title for book in response.context["books"]]
+            cursor = response.context["next_cursor"]
+            if not cursor:
+                break
+        assert titles == ["Альфа", "Бета", "Вега", "Гамма", "Дельта"]
+
+    def test_newest_first_by_default(self, logged_client):
+        client, user = logged_client
+        books = [EBookFactory(set_author_data=user) for _ in range(3)]
+        # одинаковое время добавления: порядок определяется id
+        EBooksModel.objects.filter(id__in=[book.id for book in books]).update(created_at=books[0].created_at)
+
+        response = client.get(reverse("contri", args=[user.id]))
+        assert response.context["sort"] == "new"
+        first = [book.id for book in response.context["books"]]
+        response = client.get(reverse("contri", args=[user.id]), {"cursor": response.context["next_cursor"]})
+        assert first + [book.id for book in response.context["books"]] == [books[2].id, books[1].id, books[0].id]
+
+    @pytest.mark.parametrize("values", [["вчера", 1], [{"date": 1}, 1], ["2024-01-01T00:00:00+00:00", "x"]])
+    def test_cursor_with_wrong_values_starts_from_first_page(self, logged_client, values):
+        client, user = logged_client
+        EBookFactory.create_batch(3, set_author_data=user)
+        response = client.get(reverse("contri", args=[user.id]), {"cursor": encode_cursor(values)})
+        assert response.status_code == 200
+        assert len(response.context["books"]) == 2
+        assert response.context["next_cursor"]
@@ -0,0 +1,102 @@
+import pytest
+from django.test import Client
+from django.urls import get_resolver
+from elibrary_app.models import EBooksModel
+from tests import benchmarks
+from tests.factories import UserFactory
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.PDF_INGEST_WORKERS = 0
+
+
+@pytest.fixture(scope="session")
+def benchmark_report(request):
+    # Результаты всех размеров каталога записываются одним файлом в конце сессии
+    report = {}
+    yield report
+    path = request.config.getoption("benchmark_save")
+    if path and report:
+        benchmarks.save_results(path, report)
+
+
+def test_every_route_has_scenario():
+    names = {name for name in get_resolver("elibrary_app.urls").reverse_dict if isinstance(name, str)}
+    assert names == {scenario.url_name for scenario in benchmarks.SCENARIOS}
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert benchmarks.percentile(values, 50) == 50
+    assert benchmarks.percentile(values, 95) == 95
+    assert benchmarks.percentile([7], 95) == 7
+
+
+def test_compare():
+    baseline = {"explore": {"p50_ms": 10.0, "p95_ms": 20.0, "queries": 4, "peak_kb": 500.0}}
+    same = {"explore": {"p50_ms": 11.0, "p95_ms": 35.0, "queries": 4, "peak_kb": 600.0}}
+    assert benchmarks.compare(same, baseline) == []
+
+    worse = {"explore": {"p50_ms": 20.0, "p95_ms": 20.0, "queries": 5, "peak_kb": 500.0}}
+    assert benchmarks.compare(worse, baseline) == [
+        "explore.p50_ms: 10.0 -> 20.0",
+        "explore.queries: 4 -> 5",
+    ]
+    # Допуск ослабляет только задержку и память
+    assert benchmarks.compare(worse, baseline, tolerance=2.5) == ["explore.queries: 4 -> 5"]
+
+    # Субмиллисекундный рост - шум, а не регрессия
+    tiny = {"home": {"p50_ms": 0.5}}
+    assert benchmarks.compare({"home": {"p50_ms": 1.5}}, tiny) == []
+
+    # Новый маршрут без базового замера не проходит незамеченным
+    assert benchmarks.compare({"metrics": {"p50_ms": 1.0}}, tiny) == ["metrics: нет базового замера"]
+
+
+def test_baseline_covers_every_scenario():
+    baseline = benchmarks.load_results(benchmarks.BASELINE_PATH)["results"]
+    keys = {scenario.key for scenario in benchmarks.SCENARIOS}
+    for size, results in baseline.items():
+        assert keys <= set(results), size
+
+
+@pytest.mark.django_db
+def test_seed_books():
+    authors = UserFactory.create_batch(2)
+    benchmarks.seed_books(7, authors, batch_size=3)
+
+    books = EBooksModel.objects.order_by("id")
+    assert books.count() == 7
+    assert {book.author_id for book in books} == {author.id for author in authors}
+    assert all(book.indexed_author for book in books)
+    assert len({book.pdf.name for book in books}) == 1
+
+
+@pytest.mark.django_db
+def test_suite_smoke():
+    results, regressions = benchmarks.run_suite(Client, 30, repeat=1)
+    assert regressions == []
+    assert set(results) == {scenario.key for scenario in benchmarks.SCENARIOS}
+    assert all(metrics["status"] < 400 for metrics in results.values())
+    assert results["explore"]["queries"] < results["explore:cold"]["queries"]
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_benchmark(request, benchmark_size, benchmark_report):
+    config = request.config
+    if not config.getoption("benchmark"):
+        pytest.skip("замеры выполняются с параметром --benchmark")
+
+    baseline = benchmarks.load_results(config.getoption("benchmark_baseline") or benchmarks.BASELINE_PATH)
+    results, regressions = benchmarks.run_suite(
+        Client,
+        benchmark_size,
+        repeat=config.getoption("benchmark_repeat"),
+        baseline=(baseline or {}).get("results", {}).get(str(benchmark_size)),
+        tolerance=config.getoption("benchmark_tolerance"),
+    )
+    benchmark_report[str(benchmark_size)] = results
+    assert not regressions, "Ухудшение относительно базовых замеров:\n" + "\n".join(regressions)
@@ -0,0 +1,92 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models import ProtectedError
+from django.urls import reverse
+from elibrary_app.forms import EBookForm
+from elibrary_app.models import Category
+from tests.factories import CategoryFactory, EBookFactory
+
+
+@pytest.fixture(autouse=True)
+def small_pages(settings, tmp_path):
+    settings.EXPLORE_PAGE_SIZE = 2
+    settings.MEDIA_ROOT = tmp_path
+
+
+def book_count(name):
+    return Category.objects.get(name=name).book_count
+
+
+@pytest.mark.django_db
+class TestBookCount:
+    def test_create_move_delete(self):
+        book = EBookFactory(category="Education")
+        EBookFactory(category="Education")
+        assert book_count("Education") == 2
+
+        book.category_id = "Science"
+        book.save()
+        assert book_count("Education") == 1
+        assert book_count("Science") == 1
+
+        # Повторное сохранение без смены категории счетчики не меняет
+        book.title = "Новое название"
+        book.save()
+        assert book_count("Science") == 1
+
+        book.delete()
+        assert book_count("Science") == 0
+
+    def test_category_with_books_protected(self):
+        EBookFactory(category="Fiction")
+        with pytest.raises(ProtectedError):
+            Category.objects.get(name="Fiction").delete()
+
+    def test_form_loads_category_once(self, django_assert_num_queries):
+        CategoryFactory(name="Science")
+        data = {"title": "Книга", "summary": "Аннотация", "pages": "10", "category": "Science"}
+        files = {"pdf": SimpleUploadedFile("book.pdf", b"%PDF-1.4", content_type="application/pdf")}
+        # Строка категории - один SELECT поля формы, без повторного EXISTS модели
+        with django_assert_num_queries(1):
+            assert EBookForm(data, files).is_valid()
+
+        form = EBookForm({**data, "category": "Unknown"}, files)
+        assert not form.is_valid()
+        assert "category" in form.errors
+
+
+@pytest.mark.django_db
+class TestExploreCategories:
+    def test_new_category_without_code_changes(self, client):
+        CategoryFactory(name="Poetry", title="Стихи", icon="fa-feather", position=10)
+        EBookFactory(category="Poetry", title="Сборник стихов")
+        response = client.get(reverse("explore"))
+        content = response.content.decode("utf-8")
+        assert "Стихи" in content and "Сборник стихов" in content
+        assert 'id="books-Poetry"' in content
+
+        response = client.get(reverse("exploreCategory", args=["Poetry"]))
+        assert response.status_code == 200
+
+    def test_category_edit_invalidates_explore(self, client, django_capture_on_commit_callbacks):
+        EBookFactory(category="Science")
+        client.get(reverse("explore"))
+        Category.objects.filter(name="Science").update(title="Наука")
+        category = Category.objects.get(name="Science")
+        with django_capture_on_commit_callbacks(execute=True):
+            category.save()
+        assert "Наука" in client.get(reverse("explore")).content.decode("utf-8")
+
+    def test_query_count_independent_of_categories(
+        self, client, django_assert_max_num_queries, django_capture_on_commit_callbacks,
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            for number in range(20):
+                EBookFactory.create_batch(3, category=f"Category{number}")
+        # список категорий + первые страницы всех категорий одним запросом
+        with django_assert_max_num_queries(2) as queries:
+            response = client.get(reverse("explore"))
+        # Страницы выбираются подзапросами с LIMIT по индексу, без нумерации всех книг
+        assert not any("ROW_NUMBER" in query["sql"] for query in queries.captured_queries)
+        assert len(response.context["pages"]) == 20
+        assert all(len(books) == 2 for books in response.context["pages"].values())
@@ -0,0 +1,95 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from tests.factories import EBookFactory, UserFactory
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.mark.django_db
+class TestViewBookConditional:
+    def test_etag_and_last_modified(self, client):
+        book = EBookFactory()
+        response = client.get(reverse("viewBook", args=[book.id]))
+        assert response.status_code == 200
+        assert response["ETag"]
+        assert response["Last-Modified"]
+        assert "no-cache" in response["Cache-Control"]
+        assert "Cookie" in response["Vary"]
+
+    def test_not_modified_skips_rendering(self, client, django_assert_num_queries):
+        book = EBookFactory()
+        etag = client.get(reverse("viewBook", args=[book.id]))["ETag"]
+        with django_assert_num_queries(1):
+            response = client.get(reverse("viewBook", args=[book.id]), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_if_modified_since(self, client):
+        book = EBookFactory()
+        last_modified = client.get(reverse("viewBook", args=[book.id]))["Last-Modified"]
+        response = client.get(reverse("viewBook", args=[book.id]), HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == 304
+
+    def test_change_invalidates_etag(self, client):
+        book = EBookFactory()
+        etag = client.get(reverse("viewBook", args=[book.id]))["ETag"]
+        book.title = "Новое название"
+        book.save()
+        response = client.get(reverse("viewBook", args=[book.id]), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+
+    def test_etag_depends_on_user(self, client):
+        book = EBookFactory()
+        anonymous = client.get(reverse("viewBook", args=[book.id]))["ETag"]
+        client.force_login(UserFactory())
+        response = client.get(reverse("viewBook", args=[book.id]), HTTP_IF_NONE_MATCH=anonymous)
+        assert response.status_code == 200
+        assert "private" in response["Cache-Control"]
+
+    def test_missing_book(self, client):
+        assert client.get(reverse("viewBook", args=[999])).status_code == 404
+
+
+@pytest.mark.django_db
+class TestExploreConditional:
+    def test_not_modified(self, client):
+        EBookFactory(category="Science")
+        first = client.get(reverse("explore"))
+        response = client.get(reverse("explore"), HTTP_IF_NONE_MATCH=first["ETag"])
+        assert response.status_code == 304
+
+    def test_new_book_changes_etag(self, client, django_capture_on_commit_callbacks):
+        EBookFactory(category="Science")
+        etag = client.get(reverse("explore"))["ETag"]
+        with django_capture_on_commit_callbacks(execute=True):
+            EBookFactory(category="Fiction")
+        response = client.get(reverse("explore"), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+
+    def test_delete_changes_etag(self, client, django_capture_on_commit_callbacks):
+        EBookFactory(category="Science")
+        book = EBookFactory(category="Science")
+        etag = client.get(reverse("explore"))["ETag"]
+        with django_capture_on_commit_callbacks(execute=True):
+            book.delete()
+        response = client.get(reverse("explore"), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+
+    def test_cursor_changes_etag(self, client):
+        EBookFactory(category="Science")
+        etag = client.get(reverse("explore"))["ETag"]
+        response = client.get(reverse("explore"), {"cursor_Science": "abc"}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+
+    def test_version_from_single_query(self, client, django_assert_num_queries):
+        EBookFactory(category="Science")
+        etag = client.get(reverse("explore"))["ETag"]
+        cache.clear()
+        # max(updated_at) + количество по категориям
+        with django_assert_num_queries(2):
+            response = client.get(reverse("explore"), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
@@ -0,0 +1,128 @@
+import sqlite3
+
+import pytest
+from django.contrib.sessions.models import Session
+from django.db import connections
+from django.test import override_settings
+from django.urls import reverse
+from elibrary_app.database import (
+    STICKY_COOKIE, ReplicaRouter, replica_cache_timeout, replica_in_use, use_replica,
+)
+from elibrary_app.models import EBooksModel
+from elibrary_app.sqlite.base import DatabaseWrapper
+from tests.factories import EBookFactory
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.fixture
+def wrapper(tmp_path, django_db_blocker):
+    # Отдельное соединение с файлом базы (в памяти режим WAL недоступен)
+    settings_dict = {**connections["default"].settings_dict, "NAME": str(tmp_path / "probe.sqlite3")}
+    connection = DatabaseWrapper(settings_dict, alias="probe")
+    with django_db_blocker.unblock():
+        yield connection
+        connection.close()
+
+
+@pytest.fixture
+def replica(settings):
+    settings.DATABASE_REPLICA = "replica"
+
+
+class TestBackend:
+    def test_pragmas_applied(self, wrapper):
+        with wrapper.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            assert cursor.fetchone()[0] == "wal"
+            cursor.execute("PRAGMA busy_timeout")
+            assert cursor.fetchone()[0] == 5000
+            cursor.execute("PRAGMA synchronous")
+            assert cursor.fetchone()[0] == 1  # NORMAL
+
+    def test_pragma_options_not_passed_to_connect(self, wrapper):
+        params = wrapper.get_connection_params()
+        assert "pragmas" not in params
+        assert "transaction_mode" not in params
+
+    def test_atomic_takes_write_lock_immediately(self, wrapper):
+        wrapper.ensure_connection()
+        wrapper.set_autocommit(False)
+        wrapper._start_transaction_under_autocommit()
+        try:
+            # Вторая запись не может начаться, пока открыта транзакция
+            other = sqlite3.connect(wrapper.settings_dict["NAME"], timeout=0, isolation_level=None)
+            with pytest.raises(sqlite3.OperationalError, match="locked"):
+                other.execute("BEGIN IMMEDIATE")
+            other.close()
+        finally:
+            wrapper.connection.rollback()
+            wrapper.set_autocommit(True)
+
+    def test_invalid_transaction_mode(self, wrapper):
+        wrapper.settings_dict["OPTIONS"] = {"transaction_mode": "LATER"}
+        wrapper.ensure_connection()
+        with pytest.raises(Exception, match="transaction_mode"):
+            wrapper._start_transaction_under_autocommit()
+
+
+class TestRouter:
+    def test_reads_default_outside_replica_views(self):
+        assert ReplicaRouter().db_for_read(EBooksModel) is None
+        assert not replica_in_use()
+
+    def test_writes_and_sessions_use_default(self, rf, replica):
+        router = ReplicaRouter()
+
+        @use_replica
+        def view(request):
+            return router.db_for_read(EBooksModel), router.db_for_read(Session), router.db_for_write(EBooksModel)
+
+        assert view(rf.get("/")) == ("replica", "default", "default")
+
+    def test_unsafe_method_and_sticky_cookie_read_default(self, rf, replica):
+        view = use_replica(lambda request: replica_in_use())
+        assert view(rf.get("/"))
+        assert not view(rf.post("/"))
+        request = rf.get("/")
+        request.COOKIES[STICKY_COOKIE] = "1"
+        assert not view(request)
+
+    @override_settings(REPLICA_STICKY_SECONDS=10)
+    def test_cache_timeout_capped_on_replica(self, rf, replica):
+        view = use_replica(lambda request: (replica_cache_timeout(300), replica_cache_timeout(None)))
+        assert view(rf.get("/")) == (10, 10)
+        assert replica_cache_timeout(300) == 300
+
+
+@pytest.mark.django_db(databases=["default", "replica"])
+class TestReplicaReads:
+    @pytest.fixture
+    def book(self):
+        # В реплику попадает копия книги с "устаревшим" названием
+        book = EBookFactory(title="Из основной базы")
+        book.save(using="replica")
+        EBooksModel.objects.using("replica").filter(pk=book.pk).update(title="С реплики")
+        return book
+
+    def test_view_book_reads_replica(self, client, book, replica):
+        response = client.get(reverse("viewBook", args=[book.id]))
+        assert "С реплики" in response.content.decode()
+
+    def test_view_book_reads_default_without_replica(self, client, book):
+        response = client.get(reverse("viewBook", args=[book.id]))
+        assert "Из основной базы" in response.content.decode()
+
+    def test_sticky_cookie_after_write(self, client, book, replica):
+        response = client.post(reverse("login"), {"email": "nobody@example.com", "password": "wrong"})
+        assert response.cookies[STICKY_COOKIE]["max-age"] > 0
+
+        response = client.get(reverse("viewBook", args=[book.id]))
+        assert "Из основной базы" in response.content.decode()
+
+    def test_safe_request_sets_no_cookie(self, client, book, replica):
+        response = client.get(reverse("viewBook", args=[book.id]))
+        assert STICKY_COOKIE not in response.cookies
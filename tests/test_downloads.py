@@ -0,0 +1,88 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from elibrary_app.downloads import RangeNotSatisfiable, parse_range
+from tests.factories import EBookFactory
+
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def book(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    pdf = SimpleUploadedFile("book.pdf", CONTENT, content_type="application/pdf")
+    return EBookFactory(title="Книга", pdf=pdf)
+
+
+def body(response):
+    return b"".join(response.streaming_content)
+
+
+def test_parse_range():
+    assert parse_range("bytes=0-99", 1000) == (0, 99)
+    assert parse_range("bytes=900-", 1000) == (900, 999)
+    assert parse_range("bytes=-100", 1000) == (900, 999)
+    assert parse_range("bytes=990-2000", 1000) == (990, 999)
+    assert parse_range("bytes=0-1,5-9", 1000) is None
+    assert parse_range(None, 1000) is None
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range("bytes=1000-", 1000)
+
+
+@pytest.mark.django_db
+class TestDownloadBook:
+    def test_full_file(self, client, book):
+        response = client.get(reverse("downloadBook", args=[book.id]))
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/pdf"
+        assert response["Accept-Ranges"] == "bytes"
+        assert int(response["Content-Length"]) == len(CONTENT)
+        assert response["Content-Disposition"].startswith("inline")
+        assert body(response) == CONTENT
+
+    def test_attachment(self, client, book):
+        response = client.get(reverse("downloadBook", args=[book.id]), {"download": 1})
+        assert response["Content-Disposition"].startswith("attachment")
+
+    def test_range(self, client, book):
+        response = client.get(reverse("downloadBook", args=[book.id]), HTTP_RANGE="bytes=10-19")
+        assert response.status_code == 206
+        assert response["Content-Range"] == f"bytes 10-19/{len(CONTENT)}"
+        assert int(response["Content-Length"]) == 10
+        assert body(response) == CONTENT[10:20]
+
+    def test_unsatisfiable_range(self, client, book):
+        response = client.get(reverse("downloadBook", args=[book.id]), HTTP_RANGE="bytes=5000-")
+        assert response.status_code == 416
+        assert response["Content-Range"] == f"bytes */{len(CONTENT)}"
+
+    def test_if_none_match(self, client, book):
+        etag = client.get(reverse("downloadBook", args=[book.id]))["ETag"]
+        response = client.get(reverse("downloadBook", args=[book.id]), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+
+    def test_if_range_mismatch_returns_full_file(self, client, book):
+        response = client.get(
+            reverse("downloadBook", args=[book.id]),
+            HTTP_RANGE="bytes=0-9",
+            HTTP_IF_RANGE='"stale"',
+        )
+        assert response.status_code == 200
+        assert body(response) == CONTENT
+
+    def test_nginx_mode(self, client, book, settings):
+        settings.PDF_SENDFILE_BACKEND = "nginx"
+        response = client.get(reverse("downloadBook", args=[book.id]))
+        assert response.status_code == 200
+        assert response["X-Accel-Redirect"] == "/protected/media/" + book.pdf.name
+        assert response.content == b""
+
+    def test_missing_file(self, client, book):
+        book.pdf.storage.delete(book.pdf.name)
+        response = client.get(reverse("downloadBook", args=[book.id]))
+        assert response.status_code == 404
+
+    def test_view_book_links_to_download(self, client, book):
+        response = client.get(reverse("viewBook", args=[book.id]))
+        assert reverse("downloadBook", args=[book.id]) in response.content.decode("utf-8")
@@ -0,0 +1,126 @@
+import pytest
+from django.db import transaction
+from django.urls import reverse
+from elibrary_app.caching import generation
+from elibrary_app.pagination import encode_cursor
+from tests.factories import EBookFactory
+
+
+@pytest.fixture(autouse=True)
+def small_pages(settings, tmp_path):
+    settings.EXPLORE_PAGE_SIZE = 2
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.mark.django_db
+class TestExplorePagination:
+    def test_counts_cover_whole_category(self, client):
+        EBookFactory.create_batch(5, category="Education")
+        EBookFactory(category="Fiction")
+        response = client.get(reverse("explore"))
+        assert response.status_code == 200
+        assert response.context["counts"]["Education"] == 5
+        assert response.context["counts"]["Fiction"] == 1
+        assert len(response.context["pages"]["Education"]) == 2
+        assert response.context["next_cursors"]["Education"]
+        assert response.context["next_cursors"]["Fiction"] is None
+
+    def test_query_count_does_not_grow_with_catalog(
+        self, client, django_assert_max_num_queries, django_capture_on_commit_callbacks,
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            EBookFactory.create_batch(10, category="Science")
+        # список категорий + первые страницы всех категорий одним запросом
+        with django_assert_max_num_queries(2):
+            client.get(reverse("explore"))
+
+    def test_sections_served_from_cache(self, client, django_assert_num_queries):
+        EBookFactory.create_batch(3, category="Science")
+        client.get(reverse("explore"))
+        with django_assert_num_queries(0):
+            response = client.get(reverse("explore"))
+        assert response.context["counts"]["Science"] == 3
+        assert "Science" not in response.context["pages"]
+
+    def test_change_invalidates_only_its_category(self, client, django_capture_on_commit_callbacks):
+        EBookFactory(category="Science", title="Старая наука")
+        EBookFactory(category="Fiction", title="Роман")
+        client.get(reverse("explore"))
+        with django_capture_on_commit_callbacks(execute=True):
+            book = EBookFactory(category="Science", title="Новая наука")
+        response = client.get(reverse("explore"))
+        assert "Science" in response.context["pages"]
+        assert "Fiction" not in response.context["pages"]
+        assert "Новая наука" in response.content.decode("utf-8")
+
+        book.category_id = "Fiction"
+        with django_capture_on_commit_callbacks(execute=True):
+            book.save()
+        response = client.get(reverse("explore"))
+        assert "Science" in response.context["pages"]
+        assert "Fiction" in response.context["pages"]
+        assert response.context["counts"] == {"Education": 0, "Fiction": 2, "Science": 1, "Other": 0}
+
+    def test_delete_invalidates_category(self, client, django_capture_on_commit_callbacks):
+        book = EBookFactory(category="Education", title="Удаляемая книга")
+        client.get(reverse("explore"))
+        with django_capture_on_commit_callbacks(execute=True):
+            book.delete()
+        response = client.get(reverse("explore"))
+        assert "Удаляемая книга" not in response.content.decode("utf-8")
+
+    def test_generation_changes_after_commit(self, django_capture_on_commit_callbacks):
+        before = generation("Science")
+        with django_capture_on_commit_callbacks(execute=True):
+            EBookFactory(category="Science")
+            # до фиксации параллельный запрос не должен получить новое поколение
+            assert generation("Science") == before
+        assert generation("Science") > before
+
+    def test_rolled_back_change_keeps_generation(self, django_capture_on_commit_callbacks):
+        before = generation("Science")
+        with django_capture_on_commit_callbacks(execute=True) as callbacks, pytest.raises(RuntimeError):
+            with transaction.atomic():
+                EBookFactory(category="Science")
+                raise RuntimeError
+        assert callbacks == []
+        assert generation("Science") == before
+
+    def test_cursor_walks_category_without_gaps(self, client):
+        for title in ["Д", "А", "Б", "Б", "Г"]:
+            EBookFactory(category="Education", title=title)
+        seen = []
+        cursor = ""
+        while True:
+            response = client.get(reverse("exploreCategory", args=["Education"]), {"cursor": cursor})
+            assert response.status_code == 200
+            seen += [book.title for book in response.context["books"]]
+            cursor = response.context["next_cursor"]
+            if not cursor:
+                break
+        assert seen == ["А", "Б", "Б", "Г", "Д"]
+
+    def test_explore_cursor_is_per_category(self, client):
+        EBookFactory.create_batch(3, category="Education")
+        EBookFactory.create_batch(3, category="Fiction")
+        first = client.get(reverse("explore"))
+        response = client.get(reverse("explore"), {"cursor_Education": first.context["next_cursors"]["Education"]})
+        assert len(response.context["pages"]["Education"]) == 1
+        # первая страница Fiction уже в кеше
+        assert "Fiction" not in response.context["pages"]
+
+    def test_broken_cursor_starts_from_first_page(self, client):
+        EBookFactory.create_batch(3, category="Education")
+        response = client.get(reverse("exploreCategory", args=["Education"]), {"cursor": "%%%"})
+        assert len(response.context["books"]) == 2
+
+    @pytest.mark.parametrize("values", [["Книга", "abc"], ["Книга", [1]], ["Книга", 10**30]])
+    def test_cursor_with_wrong_values_starts_from_first_page(self, client, values):
+        EBookFactory.create_batch(3, category="Education")
+        response = client.get(reverse("exploreCategory", args=["Education"]), {"cursor": encode_cursor(values)})
+        assert response.status_code == 200
+        assert len(response.context["books"]) == 2
+
+    def test_unknown_category(self, client):
+        response = client.get(reverse("exploreCategory", args=["Unknown"]))
+        assert response.status_code == 404
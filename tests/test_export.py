@@ -0,0 +1,93 @@
+import csv
+import datetime
+import gzip
+import io
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from django.utils import timezone
+from elibrary_app.models import EBooksModel
+from tests.factories import EBookFactory, UserFactory
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.EXPORT_CHUNK_SIZE = 2
+
+
+@pytest.fixture
+def logged_client(client):
+    user = UserFactory()
+    client.force_login(user)
+    return client, user
+
+
+def body(response):
+    assert response.streaming
+    return b"".join(response.streaming_content)
+
+
+@pytest.mark.django_db
+class TestExportEndpoint:
+    def test_requires_login(self, client):
+        assert client.get(reverse("exportBooks")).status_code == 302
+
+    def test_csv(self, logged_client):
+        client, user = logged_client
+        EBookFactory(title="Первая", category="Science", set_author_data=user)
+        EBookFactory.create_batch(4, category="Fiction")
+
+        response = client.get(reverse("exportBooks"))
+        assert response["Content-Type"].startswith("text/csv")
+        assert response["X-Export-Until"]
+        rows = list(csv.DictReader(io.StringIO(body(response).decode("utf-8"))))
+        assert len(rows) == 5
+        assert rows[0]["title"] == "Первая"
+        assert rows[0]["author"] == f"{user.first_name} {user.last_name}"
+        assert [int(row["id"]) for row in rows] == sorted(int(row["id"]) for row in rows)
+
+    def test_jsonl_gzip_with_filters(self, logged_client):
+        client, user = logged_client
+        EBookFactory(category="Science", set_author_data=user)
+        EBookFactory(category="Fiction", set_author_data=user)
+        EBookFactory(category="Science")
+
+        response = client.get(reverse("exportBooks"), {
+            "format": "jsonl", "gzip": "1", "category": "Science", "author": user.username,
+        })
+        assert response["Content-Type"] == "application/gzip"
+        assert "books.jsonl.gz" in response["Content-Disposition"]
+        records = [json.loads(line) for line in gzip.decompress(body(response)).decode("utf-8").splitlines()]
+        assert [(record["category"], record["author_id"]) for record in records] == [("Science", user.id)]
+
+    def test_modified_since(self, logged_client):
+        client, _ = logged_client
+        old = EBookFactory()
+        new = EBookFactory()
+        EBooksModel.objects.filter(id=old.id).update(updated_at=timezone.now() - datetime.timedelta(days=10))
+
+        since = (timezone.now() - datetime.timedelta(days=1)).date().isoformat()
+        response = client.get(reverse("exportBooks"), {"format": "jsonl", "modified_since": since})
+        assert [json.loads(line)["id"] for line in body(response).splitlines()] == [new.id]
+
+    def test_invalid_parameters(self, logged_client):
+        client, _ = logged_client
+        assert client.get(reverse("exportBooks"), {"format": "xml"}).status_code == 400
+        assert client.get(reverse("exportBooks"), {"modified_since": "вчера"}).status_code == 400
+
+
+@pytest.mark.django_db
+class TestExportCommand:
+    def test_writes_file(self, tmp_path):
+        EBookFactory.create_batch(3, category="Education")
+        output = tmp_path / "books.csv.gz"
+        call_command("export_books", "--gzip", "--output", str(output), "--chunk-size", "1")
+        rows = list(csv.DictReader(io.StringIO(gzip.decompress(output.read_bytes()).decode("utf-8"))))
+        assert len(rows) == 3
+
+    def test_invalid_date(self):
+        with pytest.raises(CommandError):
+            call_command("export_books", "--modified-since", "never")
@@ -0,0 +1,124 @@
+import csv
+import hashlib
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+from elibrary_app.caching import generation
+from elibrary_app.models import EBooksModel
+from elibrary_app.search import search_books
+from tests.factories import UserFactory, make_pdf
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path / "media"
+    return settings.MEDIA_ROOT
+
+
+@pytest.fixture
+def source(tmp_path):
+    directory = tmp_path / "source"
+    directory.mkdir()
+    return directory
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as stream:
+        writer = csv.DictWriter(stream, fieldnames=["file", "title", "category", "summary", "pages", "author"])
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+    return path
+
+
+@pytest.mark.django_db
+class TestImportBooks:
+    def test_imports_in_batches(self, source, media, tmp_path):
+        rows = []
+        for number in range(5):
+            (source / f"{number}.pdf").write_bytes(make_pdf([f"Book {number}"]))
+            rows.append({"file": f"{number}.pdf", "title": f"Книга {number}", "category": "Science", "summary": "<i>Аннотация</i>"})
+        manifest = write_csv(tmp_path / "books.csv", rows)
+
+        call_command("import_books", str(source), str(manifest), "--batch-size", "2", "--workers", "3")
+
+        assert EBooksModel.objects.count() == 5
+        book = EBooksModel.objects.get(title="Книга 3")
+        digest = hashlib.sha256(make_pdf(["Book 3"])).hexdigest()
+        assert book.pdf_sha256 == digest
+        # bulk_create не вызывает save(): HTML аннотации формирует импорт
+        assert book.summary_html == "&lt;i&gt;Аннотация&lt;/i&gt;"
+        assert (media / book.pdf.name).read_bytes() == make_pdf(["Book 3"])
+        # полнотекстовый индекс обновлен триггерами
+        assert search_books("Книга")[0]
+
+    def test_explore_invalidated_after_batch_commit(self, source, tmp_path, django_capture_on_commit_callbacks):
+        (source / "a.pdf").write_bytes(make_pdf(["A"]))
+        manifest = write_csv(tmp_path / "books.csv", [{"file": "a.pdf", "title": "A", "category": "Fiction"}])
+        before = generation("Fiction")
+        with django_capture_on_commit_callbacks() as callbacks:
+            call_command("import_books", str(source), str(manifest))
+        assert generation("Fiction") == before
+
+        for callback in callbacks:
+            callback()
+        assert generation("Fiction") > before
+
+    def test_rerun_and_duplicates_are_skipped(self, source, tmp_path, capsys):
+        (source / "a.pdf").write_bytes(make_pdf(["A"]))
+        (source / "copy.pdf").write_bytes(make_pdf(["A"]))
+        (source / "b.pdf").write_bytes(make_pdf(["B"]))
+        manifest = write_csv(tmp_path / "books.csv", [
+            {"file": "a.pdf", "title": "A", "category": "Fiction"},
+            {"file": "copy.pdf", "title": "Копия A", "category": "Fiction"},
+            {"file": "b.pdf", "title": "B", "category": "Fiction"},
+        ])
+
+        call_command("import_books", str(source), str(manifest))
+        assert EBooksModel.objects.count() == 2
+
+        call_command("import_books", str(source), str(manifest))
+        assert EBooksModel.objects.count() == 2
+        assert "уже в каталоге: 3" in capsys.readouterr().out
+
+    def test_invalid_records_are_reported(self, source, tmp_path, capsys):
+        (source / "ok.pdf").write_bytes(make_pdf(["ok"]))
+        (source / "fake.pdf").write_bytes(b"not a pdf")
+        (tmp_path / "outside.pdf").write_bytes(make_pdf(["outside"]))
+        manifest = tmp_path / "books.jsonl"
+        manifest.write_text("\n".join([
+            json.dumps({"file": "ok.pdf", "title": "OK", "category": "Education"}),
+            json.dumps({"file": "fake.pdf", "title": "Fake", "category": "Education"}),
+            json.dumps({"file": "missing.pdf", "title": "Missing", "category": "Education"}),
+            json.dumps({"file": "ok.pdf", "title": "Bad", "category": "Poetry"}),
+            json.dumps({"file": "../outside.pdf", "title": "Outside", "category": "Education"}),
+            "{broken",
+        ]), encoding="utf-8")
+
+        call_command("import_books", str(source), str(manifest))
+
+        assert list(EBooksModel.objects.values_list("title", flat=True)) == ["OK"]
+        captured = capsys.readouterr()
+        assert "ошибок: 5" in captured.out
+        assert "Строка 2: Файл не является PDF" in captured.err
+
+    def test_author_from_manifest_and_default(self, source, tmp_path):
+        author = UserFactory(username="writer", first_name="Анна", last_name="Ахматова")
+        fallback = UserFactory(username="editor")
+        (source / "a.pdf").write_bytes(make_pdf(["A"]))
+        (source / "b.pdf").write_bytes(make_pdf(["B"]))
+        manifest = write_csv(tmp_path / "books.csv", [
+            {"file": "a.pdf", "title": "A", "category": "Fiction", "author": "writer"},
+            {"file": "b.pdf", "title": "B", "category": "Fiction"},
+        ])
+
+        call_command("import_books", str(source), str(manifest), "--author", "editor")
+
+        assert EBooksModel.objects.get(title="A").author == author
+        assert EBooksModel.objects.get(title="B").author == fallback
+        assert search_books("Ахматова")[0] == [EBooksModel.objects.get(title="A")]
+
+    def test_missing_directory(self, tmp_path):
+        with pytest.raises(CommandError):
+            call_command("import_books", str(tmp_path / "nope"), str(tmp_path / "books.csv"))
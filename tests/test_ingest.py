@@ -0,0 +1,79 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from elibrary_app.ingest import ingest_book, store_pages
+from elibrary_app.models import BookPage, EBooksModel
+from elibrary_app.search import search_pages
+from tests.factories import EBookFactory, UserFactory, make_pdf
+
+
+@pytest.fixture(autouse=True)
+def inline_ingest(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.PDF_INGEST_WORKERS = 0
+
+
+def pdf_upload(*pages):
+    return SimpleUploadedFile("book.pdf", make_pdf(pages), content_type="application/pdf")
+
+
+@pytest.mark.django_db
+class TestPdfIngest:
+    def test_add_book_extracts_pages(self, client, django_capture_on_commit_callbacks):
+        user = UserFactory()
+        client.force_login(user)
+        data = {
+            "title": "Physics",
+            "summary": "Summary",
+            "pages": "2",
+            "pdf": pdf_upload("classical mechanics", "quantum entanglement"),
+            "category": "Science",
+        }
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.post(reverse("addBook", args=[user.id]), data)
+        assert response.status_code == 302
+
+        book = EBooksModel.objects.get()
+        assert list(book.text_pages.values_list("number", "text")) == [
+            (1, "classical mechanics"),
+            (2, "quantum entanglement"),
+        ]
+        hits = search_pages("entanglement")
+        assert [(hit["book"], hit["number"]) for hit in hits] == [(book, 2)]
+        response = client.get(reverse("search"), {"q": "entanglement"})
+        assert "стр. 2" in response.content.decode("utf-8")
+
+    def test_broken_pdf_does_not_break_upload(self, client, django_capture_on_commit_callbacks):
+        user = UserFactory()
+        client.force_login(user)
+        data = {
+            "title": "Broken",
+            "summary": "Summary",
+            "pages": "1",
+            "pdf": SimpleUploadedFile("broken.pdf", b"not a pdf", content_type="application/pdf"),
+            "category": "Science",
+        }
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.post(reverse("addBook", args=[user.id]), data)
+        assert response.status_code == 302
+        assert not BookPage.objects.exists()
+
+    def test_stale_result_is_discarded(self):
+        book = EBookFactory(pdf=pdf_upload("new text"))
+        assert not store_pages(book.id, "pdfs/old.pdf", ["old text"])
+        assert not BookPage.objects.exists()
+
+    def test_reingest_replaces_pages(self):
+        book = EBookFactory(pdf=pdf_upload("one", "two", "three"))
+        ingest_book(book)
+        book.pdf = pdf_upload("only")
+        book.save()
+        ingest_book(book)
+        assert list(book.text_pages.values_list("text", flat=True)) == ["only"]
+        assert search_pages("three") == []
+
+    def test_backfill_command(self):
+        book = EBookFactory(pdf=pdf_upload("backfilled text"))
+        call_command("extract_pdf_text", workers=1)
+        assert book.text_pages.get().text == "backfilled text"
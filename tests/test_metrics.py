@@ -0,0 +1,128 @@
+import json
+import logging
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from elibrary_app.logs import JsonFormatter
+from elibrary_app.metrics import Registry, registry, render_prometheus
+from tests.factories import EBookFactory, UserFactory
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.PDF_INGEST_WORKERS = 0
+    registry.clear()
+
+
+@pytest.fixture
+def logged_client(client):
+    user = UserFactory()
+    client.force_login(user)
+    client.user = user
+    return client
+
+
+def server_timing(response):
+    return dict(
+        (part.split(";")[0].strip(), part) for part in response["Server-Timing"].split(",")
+    )
+
+
+def test_histogram_buckets_and_threads():
+    source = Registry()
+
+    def observe():
+        for value in (0.001, 0.02, 3.0):
+            source.observe("elibrary_request_duration_seconds", (("view", "home"),), value)
+        source.inc("elibrary_requests_total", (("view", "home"),))
+
+    threads = [threading.Thread(target=observe) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    text = render_prometheus(source)
+    assert 'elibrary_request_duration_seconds_bucket{view="home",le="0.005"} 4' in text
+    assert 'elibrary_request_duration_seconds_bucket{view="home",le="0.025"} 8' in text
+    assert 'elibrary_request_duration_seconds_bucket{view="home",le="+Inf"} 12' in text
+    assert 'elibrary_request_duration_seconds_count{view="home"} 12' in text
+    assert 'elibrary_requests_total{view="home"} 4' in text
+
+
+@pytest.mark.django_db
+class TestRequestMetrics:
+    def test_server_timing(self, client):
+        book = EBookFactory()
+        response = client.get(reverse("viewBook", args=[book.id]))
+        timing = server_timing(response)
+        assert set(timing) == {"db", "tpl", "total"}
+        # Запрос версии книги и выборка книги с автором
+        assert 'desc="2 queries"' in timing["db"]
+        assert float(timing["tpl"].split("dur=")[1]) > 0
+
+    def test_server_timing_disabled(self, client, settings):
+        settings.SERVER_TIMING = False
+        assert not client.get(reverse("home")).has_header("Server-Timing")
+
+    def test_async_view_queries(self, async_client):
+        book = EBookFactory()
+        response = async_to_sync(async_client.get)(reverse("viewBook", args=[book.id]))
+        assert 'desc="2 queries"' in server_timing(response)["db"]
+
+    def test_metrics_endpoint(self, client):
+        EBookFactory()
+        client.get(reverse("explore"))
+        client.get(reverse("explore"))
+        client.get("/missing-page/")
+
+        response = client.get(reverse("metrics"))
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+        text = response.content.decode()
+        assert 'elibrary_requests_total{view="explore",method="GET",status="200"} 2' in text
+        assert 'elibrary_requests_total{view="unmatched",method="GET",status="404"} 1' in text
+        assert 'elibrary_db_queries_count{view="explore"} 2' in text
+        assert "# TYPE elibrary_template_duration_seconds histogram" in text
+
+    def test_metrics_token(self, client, settings):
+        settings.METRICS_TOKEN = "secret"
+        assert client.get(reverse("metrics")).status_code == 403
+        response = client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret")
+        assert response.status_code == 200
+
+
+@pytest.mark.django_db
+class TestLogging:
+    def test_add_book_logged(self, logged_client, caplog):
+        data = {
+            "title": "Книга",
+            "summary": "Аннотация",
+            "pages": "10",
+            "category": "Science",
+            "pdf": SimpleUploadedFile("book.pdf", b"%PDF-1.4 test", content_type="application/pdf"),
+        }
+        with caplog.at_level(logging.INFO, logger="elibrary_app"):
+            logged_client.post(reverse("addBook", args=[logged_client.user.id]), data)
+        record = next(record for record in caplog.records if record.getMessage() == "Книга добавлена")
+        assert record.user_id == logged_client.user.id
+        assert record.category == "Science"
+
+    def test_form_errors_logged(self, logged_client, caplog):
+        with caplog.at_level(logging.INFO, logger="elibrary_app"):
+            logged_client.post(reverse("addBook", args=[logged_client.user.id]), {"title": ""})
+        record = next(record for record in caplog.records if record.levelno == logging.WARNING)
+        assert "title" in record.errors
+
+
+def test_json_formatter():
+    record = logging.LogRecord("elibrary_app.views", logging.INFO, __file__, 1, "Книга %s", ("добавлена",), None)
+    record.book_id = 7
+    data = json.loads(JsonFormatter().format(record))
+    assert data["message"] == "Книга добавлена"
+    assert data["level"] == "INFO"
+    assert data["logger"] == "elibrary_app.views"
+    assert data["book_id"] == 7
@@ -1,5 +1,11 @@
 import pytest
-from elibrary_app.tests.factories import EBookFactory
+from tests.factories import EBookFactory
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
 
 @pytest.mark.django_db
 def test_ebook_str():
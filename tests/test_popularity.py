@@ -0,0 +1,214 @@
+import io
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from elibrary_app import popularity
+from elibrary_app.models import BookStats, PopularBook
+from elibrary_app.popularity import DOWNLOADS, VIEWS, HitBuffer, buffer, flush_hits, rebuild_ranking
+from tests.factories import EBookFactory
+
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.fixture
+def book():
+    pdf = SimpleUploadedFile("book.pdf", CONTENT, content_type="application/pdf")
+    return EBookFactory(title="Книга", pdf=pdf)
+
+
+def stats(book):
+    row = BookStats.objects.filter(book=book).first()
+    return (row.views, row.downloads) if row else (0, 0)
+
+
+def record(book, views=0, downloads=0):
+    buffer.add(book.id, VIEWS, views)
+    buffer.add(book.id, DOWNLOADS, downloads)
+
+
+def test_buffer_drain_and_merge():
+    hits = HitBuffer()
+    hits.add(1, VIEWS)
+    hits.add(1, VIEWS)
+    assert hits.add(2, DOWNLOADS) == 2
+    drained = hits.drain()
+    assert drained == {1: [2, 0], 2: [0, 1]}
+    assert len(hits) == 0
+
+    hits.add(1, DOWNLOADS)
+    hits.merge(drained)
+    assert hits.drain() == {1: [2, 1], 2: [0, 1]}
+
+
+def test_threshold_wakes_flusher(settings, monkeypatch):
+    settings.COUNTER_FLUSH_INTERVAL = 60
+    settings.COUNTER_FLUSH_MAX_BOOKS = 2
+    monkeypatch.setattr(popularity, "_start_flusher", lambda: None)
+    popularity._wake.clear()
+    popularity.record_view(1)
+    assert not popularity._wake.is_set()
+    popularity.record_view(2)
+    assert popularity._wake.is_set()
+    popularity._wake.clear()
+
+
+@pytest.mark.django_db
+class TestCounters:
+    def test_view_buffered_until_flush(self, client, book):
+        client.get(reverse("viewBook", args=[book.id]))
+        client.get(reverse("viewBook", args=[book.id]))
+        assert not BookStats.objects.exists()
+
+        assert flush_hits() == 1
+        assert stats(book) == (2, 0)
+        client.get(reverse("viewBook", args=[book.id]))
+        flush_hits()
+        assert stats(book) == (3, 0)
+
+    def test_not_modified_view_not_counted(self, client, book):
+        etag = client.get(reverse("viewBook", args=[book.id]))["ETag"]
+        response = client.get(reverse("viewBook", args=[book.id]), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        flush_hits()
+        assert stats(book) == (1, 0)
+
+    def test_download_counted_once_per_file(self, client, book):
+        url = reverse("downloadBook", args=[book.id])
+        client.get(url)
+        client.get(url, HTTP_RANGE="bytes=0-99")
+        client.get(url, HTTP_RANGE="bytes=100-199")
+        client.head(url)
+        flush_hits()
+        assert stats(book) == (0, 2)
+
+    def test_flush_is_one_insert(self, book):
+        books = [book] + EBookFactory.create_batch(3)
+        for item in books:
+            record(item, views=2, downloads=1)
+        with CaptureQueriesContext(connection) as queries:
+            assert flush_hits() == 4
+        inserts = [query["sql"] for query in queries.captured_queries if query["sql"].startswith("INSERT")]
+        assert len(inserts) == 1
+        assert not any(query["sql"].startswith("UPDATE") for query in queries.captured_queries)
+        assert all(stats(item) == (2, 1) for item in books)
+
+    def test_deleted_book_dropped(self, book):
+        record(book, views=1)
+        buffer.add(book.id + 1000, VIEWS)
+        assert flush_hits() == 1
+        assert BookStats.objects.count() == 1
+
+    def test_failed_flush_keeps_hits(self, book, monkeypatch):
+        record(book, views=3)
+
+        def fail(hits):
+            raise RuntimeError("база недоступна")
+
+        monkeypatch.setattr(popularity, "write_hits", fail)
+        with pytest.raises(RuntimeError):
+            flush_hits()
+        monkeypatch.undo()
+        flush_hits()
+        assert stats(book) == (3, 0)
+
+
+@pytest.mark.django_db
+class TestRanking:
+    def test_ranks_per_category(self, settings):
+        settings.POPULAR_LIMIT = 2
+        settings.POPULAR_DOWNLOAD_WEIGHT = 5
+        first = EBookFactory(category="Science")
+        second = EBookFactory(category="Science")
+        third = EBookFactory(category="Science")
+        fiction = EBookFactory(category="Fiction")
+        unread = EBookFactory(category="Fiction")
+        record(first, views=3, downloads=2)
+        record(second, views=12)
+        record(third, views=1)
+        record(fiction, downloads=1)
+        record(unread)
+        flush_hits()
+
+        assert rebuild_ranking() == 3
+        ranking = list(PopularBook.objects.values_list("category", "rank", "book", "score"))
+        assert ranking == [
+            ("Fiction", 1, fiction.id, 5),
+            ("Science", 1, first.id, 13),
+            ("Science", 2, second.id, 12),
+        ]
+
+        # Пересчет заменяет таблицу целиком
+        record(third, views=20)
+        flush_hits()
+        rebuild_ranking()
+        assert list(PopularBook.objects.filter(category="Science").values_list("book", flat=True)) == [
+            third.id, first.id,
+        ]
+
+    def test_refresh_once_per_interval(self, book):
+        record(book, views=1)
+        flush_hits()
+        assert popularity.refresh_ranking_if_due()
+        assert not popularity.refresh_ranking_if_due()
+        assert PopularBook.objects.count() == 1
+
+    def test_command(self, book):
+        record(book, downloads=1)
+        flush_hits()
+        out = io.StringIO()
+        call_command("rank_books", stdout=out)
+        assert "строк: 1" in out.getvalue()
+
+    def test_deleted_book_removed_from_ranking(self, client, book, django_assert_num_queries):
+        record(book, views=1)
+        flush_hits()
+        rebuild_ranking()
+        # Страницы текста, книга и счетчик категории: счетчики и рейтинг не удаляются
+        with django_assert_num_queries(3):
+            book.delete()
+        assert "Книга" not in client.get(reverse("popular")).content.decode("utf-8")
+
+        assert rebuild_ranking() == 0
+        assert not BookStats.objects.exists()
+
+
+@pytest.mark.django_db
+class TestPopularView:
+    def test_lists_ranking(self, client, book):
+        record(book, views=4)
+        flush_hits()
+        rebuild_ranking()
+
+        response = client.get(reverse("popular"))
+        assert response.status_code == 200
+        content = response.content.decode("utf-8")
+        assert "1. Книга" in content
+        assert "4 просмотров" in content
+
+    def test_reads_table_not_counters(self, client, book):
+        for category in ("Science", "Fiction", "Education"):
+            item = EBookFactory(category=category)
+            record(item, views=1)
+        flush_hits()
+        rebuild_ranking()
+        client.get(reverse("popular"))
+
+        with CaptureQueriesContext(connection) as queries:
+            client.get(reverse("popular"))
+        selects = [query["sql"] for query in queries.captured_queries if query["sql"].startswith("SELECT")]
+        assert len(selects) == 1
+        assert "elibrary_app_bookstats" not in selects[0]
+        assert "ORDER BY" in selects[0] and "rank" in selects[0]
+
+    def test_empty(self, client):
+        response = client.get(reverse("popular"))
+        assert "Рейтинг пока пуст" in response.content.decode("utf-8")
@@ -0,0 +1,81 @@
+import io
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from elibrary_app.profiling import PROFILE_RESPONSE_HEADER
+from tests.factories import EBookFactory, UserFactory
+
+
+@pytest.fixture(autouse=True)
+def profiles(settings, tmp_path):
+    settings.PROFILE_DIR = tmp_path / "profiles"
+    settings.PROFILE_TOKEN = "secret"
+    settings.PROFILE_SAMPLE_RATE = 0.0
+    settings.PROFILE_MAX_FILES = 3
+    settings.MEDIA_ROOT = tmp_path
+    return settings.PROFILE_DIR
+
+
+def stored(directory, view):
+    return sorted(path.name for path in (directory / view).glob("*.prof"))
+
+
+@pytest.mark.django_db
+class TestProfilingMiddleware:
+    def test_not_profiled_by_default(self, client, profiles):
+        response = client.get(reverse("explore"))
+        assert PROFILE_RESPONSE_HEADER not in response
+        assert not profiles.exists()
+
+    def test_header_with_token(self, client, profiles):
+        EBookFactory(category="Science")
+        response = client.get(reverse("explore"), HTTP_X_PROFILE="secret")
+        assert stored(profiles, "explore") == [response[PROFILE_RESPONSE_HEADER]]
+
+        response = client.get(reverse("explore"), HTTP_X_PROFILE="wrong")
+        assert PROFILE_RESPONSE_HEADER not in response
+
+    def test_query_flag_only_for_staff(self, client, admin_client, profiles):
+        client.force_login(UserFactory())
+        assert PROFILE_RESPONSE_HEADER not in client.get(reverse("home"), {"_profile": "1"})
+        assert PROFILE_RESPONSE_HEADER in admin_client.get(reverse("home"), {"_profile": "1"})
+        assert len(stored(profiles, "home")) == 1
+
+    def test_sampling(self, client, settings, profiles):
+        settings.PROFILE_SAMPLE_RATE = 1.0
+        client.get(reverse("home"))
+        assert len(stored(profiles, "home")) == 1
+
+    def test_async_view(self, async_client, profiles):
+        response = async_to_sync(async_client.get)(reverse("explore"), headers={"X-Profile": "secret"})
+        assert stored(profiles, "explore") == [response[PROFILE_RESPONSE_HEADER]]
+
+    def test_rotation_keeps_latest(self, client, profiles):
+        names = [client.get(reverse("home"), HTTP_X_PROFILE="secret")[PROFILE_RESPONSE_HEADER] for _ in range(5)]
+        assert stored(profiles, "home") == names[-3:]
+
+
+@pytest.mark.django_db
+class TestProfilesCommand:
+    def test_merges_profiles_per_view(self, client, profiles):
+        for _ in range(2):
+            client.get(reverse("home"), HTTP_X_PROFILE="secret")
+        client.get(reverse("explore"), HTTP_X_PROFILE="secret")
+
+        output = io.StringIO()
+        call_command("profiles", "home", "--limit", "5", stdout=output)
+        text = output.getvalue()
+        assert "home: профилей 2" in text
+        assert "cumulative" in text
+        assert "explore" not in text
+
+    def test_clear(self, client, profiles):
+        client.get(reverse("home"), HTTP_X_PROFILE="secret")
+        call_command("profiles", "--clear", stdout=io.StringIO())
+        assert stored(profiles, "home") == []
+
+    def test_unknown_view(self, profiles):
+        with pytest.raises(CommandError):
+            call_command("profiles", "missing", stdout=io.StringIO())
@@ -0,0 +1,65 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from elibrary_app.models import EBooksModel
+from elibrary_app.search import build_match_query, ensure_search_triggers, search_books
+from tests.factories import EBookFactory
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+def test_build_match_query_escapes_syntax():
+    assert build_match_query('Война "и" мир') == '"Война" "и" "мир"*'
+    assert build_match_query('  -*() ') == ''
+
+
+@pytest.mark.django_db
+class TestSearch:
+    def test_ranks_title_above_summary(self):
+        in_summary = EBookFactory(title="Сборник", summary="Задачи: алгебра и геометрия")
+        in_title = EBookFactory(title="Алгебра для начинающих", summary="Учебник")
+        books, has_next = search_books("алгебра")
+        assert [book.id for book in books][:2] == [in_title.id, in_summary.id]
+        assert not has_next
+
+    def test_index_follows_update_and_delete(self):
+        book = EBookFactory(title="Старое название", summary="текст")
+        book.title = "Квантовая механика"
+        book.save()
+        assert search_books("квантовая")[0] == [book]
+        assert search_books("старое")[0] == []
+        EBooksModel.objects.filter(id=book.id).delete()
+        assert search_books("квантовая")[0] == []
+
+    def test_prefix_and_pagination(self, client, settings):
+        settings.SEARCH_PAGE_SIZE = 2
+        EBookFactory.create_batch(3, title="Программирование на Python")
+        response = client.get(reverse("search"), {"q": "програм"})
+        assert response.status_code == 200
+        assert len(response.context["books"]) == 2
+        assert response.context["next_page"] == 2
+        response = client.get(reverse("search"), {"q": "програм", "page": 2})
+        assert len(response.context["books"]) == 1
+        assert response.context["next_page"] is None
+
+    def test_rebuild_command(self):
+        book = EBookFactory(title="Органическая химия")
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM elibrary_app_ebook_fts")
+        assert search_books("химия")[0] == []
+        call_command("rebuild_search_index")
+        assert search_books("химия")[0] == [book]
+
+    def test_triggers_restored_after_table_rebuild(self):
+        book = EBookFactory(title="Черновик")
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER elibrary_app_ebook_fts_au")
+        EBooksModel.objects.filter(id=book.id).update(title="Теория вероятностей")
+        ensure_search_triggers()
+        assert search_books("вероятностей")[0] == [book]
+        EBooksModel.objects.filter(id=book.id).update(title="Математическая статистика")
+        assert search_books("статистика")[0] == [book]
@@ -0,0 +1,79 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from elibrary_app.users import user_cache_key
+from tests.factories import UserFactory
+
+
+@pytest.fixture
+def logged_client(client):
+    user = UserFactory(first_name="Анна")
+    client.force_login(user)
+    return client, user
+
+
+@pytest.mark.django_db
+class TestCachedSessions:
+    def test_authenticated_page_without_queries(self, logged_client, django_assert_num_queries):
+        client, user = logged_client
+        client.get(reverse("home"))
+
+        # Сессия и пользователь читаются из кеша
+        with django_assert_num_queries(0):
+            response = client.get(reverse("home"))
+        assert "Выйти (Анна)" in response.content.decode()
+
+    def test_user_save_invalidates_cache(self, logged_client):
+        client, user = logged_client
+        client.get(reverse("home"))
+        assert cache.get(user_cache_key(user.id)) is not None
+
+        user.first_name = "Мария"
+        user.save()
+        assert cache.get(user_cache_key(user.id)) is None
+        assert "Выйти (Мария)" in client.get(reverse("home")).content.decode()
+
+    def test_password_change_logs_out(self, logged_client):
+        client, user = logged_client
+        client.get(reverse("home"))
+
+        user.set_password("newpass456")
+        user.save()
+        assert "Выйти" not in client.get(reverse("home")).content.decode()
+
+    def test_inactive_cached_user_logged_out(self, logged_client):
+        client, user = logged_client
+        client.get(reverse("home"))
+
+        # Изменение в обход save(): в кеше остается старый объект
+        User.objects.filter(pk=user.pk).update(is_active=False)
+        cached = cache.get(user_cache_key(user.id))
+        cached.is_active = False
+        cache.set(user_cache_key(user.id), cached)
+        assert "Выйти" not in client.get(reverse("home")).content.decode()
+
+    def test_deleted_user_removed_from_cache(self, logged_client):
+        client, user = logged_client
+        client.get(reverse("home"))
+
+        user.delete()
+        assert cache.get(user_cache_key(user.id)) is None
+        assert "Выйти" not in client.get(reverse("home")).content.decode()
+
+
+@pytest.mark.django_db
+class TestSignedCookieSessions:
+    @pytest.fixture(autouse=True)
+    def signed_cookies(self, settings):
+        settings.SESSION_ENGINE = "django.contrib.sessions.backends.signed_cookies"
+
+    def test_login_and_page_without_queries(self, client, django_assert_num_queries):
+        user = UserFactory(first_name="Анна")
+        response = client.post(reverse("login"), {"email": user.username, "password": "testpass123"})
+        assert response.status_code == 302
+        client.get(reverse("home"))
+
+        with django_assert_num_queries(0):
+            response = client.get(reverse("home"))
+        assert "Выйти (Анна)" in response.content.decode()
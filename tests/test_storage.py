@@ -0,0 +1,98 @@
+import hashlib
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from elibrary_app.management.commands import migrate_pdf_storage
+from elibrary_app.models import EBooksModel
+from tests.factories import EBookFactory, UserFactory
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.PDF_INGEST_WORKERS = 0
+    return tmp_path
+
+
+def upload(content, name="book.pdf"):
+    return SimpleUploadedFile(name, content, content_type="application/pdf")
+
+
+@pytest.mark.django_db
+class TestContentAddressedStorage:
+    def test_sharded_name_and_digest(self, media):
+        book = EBookFactory(pdf=upload(b"%PDF-1.4 first"))
+        digest = hashlib.sha256(b"%PDF-1.4 first").hexdigest()
+        assert book.pdf.name == f"pdfs/{digest[:2]}/{digest[2:4]}/{digest}.pdf"
+        assert book.pdf_sha256 == digest
+        assert (media / book.pdf.name).read_bytes() == b"%PDF-1.4 first"
+
+    def test_identical_uploads_stored_once(self, media):
+        first = EBookFactory(pdf=upload(b"same", "a.pdf"))
+        second = EBookFactory(pdf=upload(b"same", "b.pdf"))
+        assert first.pdf.name == second.pdf.name
+        assert list(first.duplicates()) == [second]
+        assert len(list((media / "pdfs").rglob("*.pdf"))) == 1
+        assert not list((media / "pdfs").glob("*.upload"))
+
+    def test_add_book_reports_duplicate(self, client):
+        EBookFactory(pdf=upload(b"shared content"))
+        user = UserFactory()
+        client.force_login(user)
+        data = {
+            "title": "Копия",
+            "summary": "Аннотация",
+            "pages": "1",
+            "pdf": upload(b"shared content"),
+            "category": "Science",
+        }
+        response = client.post(reverse("addBook", args=[user.id]), data, follow=True)
+        assert "Такой PDF-файл уже есть в библиотеке" in response.content.decode("utf-8")
+
+    def test_migrate_command_moves_legacy_files(self, media):
+        storage = EBooksModel._meta.get_field("pdf").storage
+        legacy = [EBookFactory(pdf=upload(b"x")) for _ in range(2)]
+        (media / "pdfs").mkdir(exist_ok=True)
+        for number, book in enumerate(legacy):
+            name = f"pdfs/legacy_{number}.pdf"
+            (media / name).write_bytes(b"legacy content")
+            EBooksModel.objects.filter(id=book.id).update(pdf=name, pdf_sha256="")
+
+        call_command("migrate_pdf_storage")
+
+        digest = hashlib.sha256(b"legacy content").hexdigest()
+        for book in legacy:
+            book.refresh_from_db()
+            assert book.pdf_sha256 == digest
+            assert storage.exists(book.pdf.name)
+        assert not storage.exists("pdfs/legacy_0.pdf")
+        assert not storage.exists("pdfs/legacy_1.pdf")
+
+    def test_migrate_command_pages_by_id(self, media, monkeypatch, capsys):
+        monkeypatch.setattr(migrate_pdf_storage, "BATCH_SIZE", 2)
+        books = [EBookFactory(pdf=upload(b"x")) for _ in range(5)]
+        for number, book in enumerate(books):
+            name = f"pdfs/legacy_{number}.pdf"
+            # файл второй книги потерян: она остается в выборке
+            if number != 1:
+                (media / name).write_bytes(f"legacy {number}".encode())
+            EBooksModel.objects.filter(id=book.id).update(pdf=name, pdf_sha256="")
+
+        call_command("migrate_pdf_storage")
+
+        assert "Перенесено книг: 4, уникальных файлов: 4, файлов не найдено: 1" in capsys.readouterr().out
+        assert list(EBooksModel.objects.filter(pdf_sha256="").values_list("id", flat=True)) == [books[1].id]
+
+    def test_download_etag_is_content_digest(self, client):
+        book = EBookFactory(pdf=upload(b"etag content"))
+        response = client.get(reverse("downloadBook", args=[book.id]))
+        assert response["ETag"] == f'"{hashlib.sha256(b"etag content").hexdigest()}"'
+
+    def test_content_file_upload(self):
+        book = EBookFactory()
+        book.pdf.save("other.pdf", ContentFile(b"plain"), save=True)
+        book.refresh_from_db()
+        assert book.pdf_sha256 == hashlib.sha256(b"plain").hexdigest()
@@ -0,0 +1,73 @@
+import io
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from elibrary_app.models import EBooksModel, SUMMARY_EXCERPT_LENGTH
+from tests.factories import EBookFactory
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.mark.django_db
+class TestRenderOnSave:
+    def test_html_escaped_with_line_breaks(self):
+        book = EBookFactory(summary="Первая <b>строка</b>\nВторая & последняя")
+        assert book.summary_html == "Первая &lt;b&gt;строка&lt;/b&gt;<br>Вторая &amp; последняя"
+
+    def test_excerpt(self):
+        short = EBookFactory(summary="Короткая аннотация")
+        long = EBookFactory(summary="а" * 150)
+        assert short.summary_excerpt == "Короткая аннотация"
+        assert long.summary_excerpt == "а" * SUMMARY_EXCERPT_LENGTH + "..."
+
+    def test_update_fields_include_rendered(self):
+        book = EBookFactory(summary="Старая")
+        book.summary = "Новая\nаннотация"
+        book.save(update_fields=["summary"])
+        book.refresh_from_db()
+        assert book.summary_html == "Новая<br>аннотация"
+        assert book.summary_excerpt == "Новая\nаннотация"
+
+
+@pytest.mark.django_db
+class TestViews:
+    def test_view_book_uses_stored_html(self, client):
+        book = EBookFactory(summary="<script>alert(1)</script>")
+        content = client.get(reverse("viewBook", args=[book.id])).content.decode("utf-8")
+        assert "&lt;script&gt;alert(1)&lt;/script&gt;" in content
+        assert "<script>alert(1)" not in content
+
+    def test_explore_shows_excerpt(self, client):
+        EBookFactory(summary="б" * 150, category="Science")
+        content = client.get(reverse("explore")).content.decode("utf-8")
+        assert "б" * SUMMARY_EXCERPT_LENGTH + "..." in content
+        assert "б" * (SUMMARY_EXCERPT_LENGTH + 1) not in content
+
+
+@pytest.mark.django_db
+class TestCommand:
+    def test_backfills_missing(self):
+        book = EBookFactory(summary="Аннотация\nкниги")
+        empty = EBookFactory(summary="")
+        EBooksModel.objects.filter(id=book.id).update(summary_html="", summary_excerpt="")
+
+        out = io.StringIO()
+        call_command("render_summaries", batch_size=1, stdout=out)
+        assert "Аннотаций сформировано: 1" in out.getvalue()
+        book.refresh_from_db()
+        assert book.summary_html == "Аннотация<br>книги"
+        assert book.summary_excerpt == "Аннотация\nкниги"
+        empty.refresh_from_db()
+        assert empty.summary_html == ""
+
+    def test_all_rerenders(self):
+        EBookFactory(summary="Первая")
+        EBookFactory(summary="Вторая")
+        EBooksModel.objects.update(summary_html="устаревший HTML")
+
+        call_command("render_summaries", "--all", stdout=io.StringIO())
+        assert set(EBooksModel.objects.values_list("summary_html", flat=True)) == {"Первая", "Вторая"}
@@ -0,0 +1,99 @@
+import pytest
+from django.urls import reverse
+from elibrary_app import views
+from elibrary_app.metrics import registry, render_prometheus
+from elibrary_app.throttling import consume
+
+
+@pytest.fixture(autouse=True)
+def rates(settings):
+    settings.THROTTLE_RATES = {
+        "login": {"ip": (10, 60), "email": (3, 60)},
+        "register": {"ip": (2, 60)},
+    }
+    settings.THROTTLE_IP_HEADER = None
+    registry.clear()
+
+
+@pytest.fixture
+def authenticate_calls(monkeypatch):
+    calls = []
+
+    def authenticate(**credentials):
+        calls.append(credentials)
+        return None
+
+    monkeypatch.setattr(views.auth, "authenticate", authenticate)
+    return calls
+
+
+def login(client, email, **extra):
+    return client.post(reverse("login"), {"email": email, "password": "wrong"}, **extra)
+
+
+class TestConsume:
+    def test_bucket_refills_gradually(self):
+        buckets = [("throttle:test", 2, 60)]
+        assert consume(buckets, now=0) == (0.0, None)
+        assert consume(buckets, now=0) == (0.0, None)
+
+        wait, exhausted = consume(buckets, now=0)
+        assert exhausted == 0
+        assert wait == pytest.approx(30)
+
+        # Одна попытка восстанавливается за period / capacity секунд
+        assert consume(buckets, now=30) == (0.0, None)
+        assert consume(buckets, now=30)[1] == 0
+
+    def test_denied_attempt_consumes_nothing(self):
+        consume([("throttle:small", 1, 60)], now=0)
+        buckets = [("throttle:large", 5, 60), ("throttle:small", 1, 60)]
+        assert consume(buckets, now=0)[1] == 1
+        for _ in range(5):
+            assert consume([("throttle:large", 5, 60)], now=0) == (0.0, None)
+
+
+@pytest.mark.django_db
+class TestLoginThrottle:
+    def test_email_limit_before_hashing(self, client, authenticate_calls):
+        for _ in range(3):
+            assert login(client, "Reader@Example.com").status_code == 302
+
+        response = login(client, "reader@example.com")
+        assert response.status_code == 429
+        assert int(response["Retry-After"]) == 20
+        assert len(authenticate_calls) == 3
+
+    def test_ip_limit_across_emails(self, client, authenticate_calls):
+        for number in range(10):
+            assert login(client, f"user{number}@example.com").status_code == 302
+        assert login(client, "other@example.com").status_code == 429
+
+    def test_ip_header_behind_proxy(self, client, settings, authenticate_calls):
+        settings.THROTTLE_IP_HEADER = "HTTP_X_REAL_IP"
+        for number in range(10):
+            login(client, f"user{number}@example.com", HTTP_X_REAL_IP="203.0.113.1")
+        assert login(client, "a@example.com", HTTP_X_REAL_IP="203.0.113.1").status_code == 429
+        assert login(client, "a@example.com", HTTP_X_REAL_IP="203.0.113.2").status_code == 302
+
+    def test_get_not_throttled(self, client, authenticate_calls):
+        for _ in range(3):
+            login(client, "reader@example.com")
+        assert client.get(reverse("login")).status_code == 200
+
+    def test_counters_exported(self, client, authenticate_calls):
+        for _ in range(4):
+            login(client, "reader@example.com")
+        text = render_prometheus()
+        assert 'elibrary_throttle_attempts_total{scope="login"} 4' in text
+        assert 'elibrary_throttle_denied_total{scope="login",limit="email"} 1' in text
+
+
+@pytest.mark.django_db
+def test_register_throttled(client):
+    data = {"email": "new@example.com", "password": "pass12345", "first-name": "А", "last-name": "Б"}
+    client.post(reverse("register"), data)
+    client.post(reverse("register"), data)
+    response = client.post(reverse("register"), {**data, "email": "other@example.com"})
+    assert response.status_code == 429
+    assert "Retry-After" in response
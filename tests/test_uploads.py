@@ -0,0 +1,189 @@
+import hashlib
+import io
+import os
+import time
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from elibrary_app import uploads
+from elibrary_app.models import ChunkedUpload, EBooksModel
+from tests.factories import UserFactory
+
+CONTENT = b"%PDF-1.4 chunked upload body"
+
+
+def sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.CHUNKED_UPLOAD_CHUNK_SIZE = 10
+    settings.PDF_INGEST_WORKERS = 0
+
+
+@pytest.fixture
+def logged_client(client):
+    user = UserFactory()
+    client.force_login(user)
+    return client, user
+
+
+def start(client, content=CONTENT, **extra):
+    response = client.post(reverse("uploadStart"), {"filename": "big.pdf", "size": len(content), **extra})
+    assert response.status_code == 201
+    return response.json()
+
+
+def put_chunk(client, upload_id, number, data, digest=None):
+    return client.put(
+        reverse("uploadChunk", args=[upload_id, number]),
+        data=data,
+        content_type="application/octet-stream",
+        HTTP_X_CHUNK_SHA256=digest or sha(data),
+    )
+
+
+@pytest.mark.django_db
+class TestChunkedUpload:
+    def test_resumable_flow_attaches_file_to_book(self, logged_client):
+        client, user = logged_client
+        status = start(client)
+        assert status["chunk_count"] == 3
+        chunks = [CONTENT[i:i + 10] for i in range(0, len(CONTENT), 10)]
+
+        # части отправляются не по порядку, затем загрузка "прерывается"
+        assert put_chunk(client, status["id"], 2, chunks[2]).status_code == 200
+        assert put_chunk(client, status["id"], 0, chunks[0]).status_code == 200
+        resumed = client.get(reverse("uploadStatus", args=[status["id"]])).json()
+        assert resumed["received"] == [0, 2]
+
+        assert put_chunk(client, status["id"], 1, chunks[1]).status_code == 200
+        response = client.post(reverse("uploadComplete", args=[status["id"]]))
+        assert response.json()["completed"]
+
+        response = client.post(reverse("addBook", args=[user.id]), {
+            "title": "Большая книга",
+            "summary": "Аннотация",
+            "pages": "900",
+            "category": "Science",
+            "upload_id": status["id"],
+        })
+        assert response.status_code == 302
+        book = EBooksModel.objects.get()
+        assert book.pdf_sha256 == sha(CONTENT)
+        with book.pdf.open("rb") as stored:
+            assert stored.read() == CONTENT
+        assert not ChunkedUpload.objects.exists()
+
+    def test_invalid_form_closes_attached_upload(self, logged_client, monkeypatch):
+        client, user = logged_client
+        status = start(client)
+        for number in range(status["chunk_count"]):
+            put_chunk(client, status["id"], number, CONTENT[number * 10:number * 10 + 10])
+        client.post(reverse("uploadComplete", args=[status["id"]]))
+        attached = []
+
+        class RecordingFile(uploads.UploadedFile):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                attached.append(self)
+
+        monkeypatch.setattr(uploads, "UploadedFile", RecordingFile)
+        response = client.post(reverse("addBook", args=[user.id]), {
+            "summary": "Без названия",
+            "pages": "900",
+            "category": "Science",
+            "upload_id": status["id"],
+        })
+        assert response.status_code == 200
+        assert len(attached) == 1 and attached[0].closed
+        # сеанс остается для повторной отправки исправленной формы
+        assert ChunkedUpload.objects.filter(id=status["id"], completed=True).exists()
+
+    def test_chunk_checksum_mismatch_is_rejected(self, logged_client):
+        client, _ = logged_client
+        status = start(client)
+        response = put_chunk(client, status["id"], 0, CONTENT[:10], digest=sha(b"other"))
+        assert response.status_code == 400
+        assert client.get(reverse("uploadStatus", args=[status["id"]])).json()["received"] == []
+
+    def test_resent_chunk_with_bad_bytes_keeps_accepted_chunk(self, logged_client):
+        client, _ = logged_client
+        status = start(client)
+        assert put_chunk(client, status["id"], 0, CONTENT[:10]).status_code == 200
+
+        response = put_chunk(client, status["id"], 0, b"X" * 10, digest=sha(CONTENT[:10]))
+        assert response.status_code == 400
+        upload = ChunkedUpload.objects.get(id=status["id"])
+        with open(upload.path, "rb") as assembly:
+            assert assembly.read(10) == CONTENT[:10]
+        assert client.get(reverse("uploadStatus", args=[status["id"]])).json()["received"] == [0]
+        # во временном каталоге не остается буферов частей
+        assert os.listdir(os.path.dirname(upload.path)) == [os.path.basename(upload.path)]
+
+    def test_chunk_with_wrong_length_is_rejected(self, logged_client):
+        client, _ = logged_client
+        status = start(client)
+        assert put_chunk(client, status["id"], 0, CONTENT[:5]).status_code == 400
+        assert put_chunk(client, status["id"], 7, CONTENT[:10]).status_code == 400
+
+    def test_incomplete_upload_cannot_be_completed(self, logged_client):
+        client, _ = logged_client
+        status = start(client)
+        put_chunk(client, status["id"], 0, CONTENT[:10])
+        response = client.post(reverse("uploadComplete", args=[status["id"]]))
+        assert response.status_code == 400
+        assert response.json()["received"] == [0]
+
+    def test_whole_file_checksum(self, logged_client):
+        client, _ = logged_client
+        status = start(client, sha256=sha(b"something else"))
+        for number in range(status["chunk_count"]):
+            put_chunk(client, status["id"], number, CONTENT[number * 10:(number + 1) * 10])
+        response = client.post(reverse("uploadComplete", args=[status["id"]]))
+        assert response.status_code == 400
+
+    def test_upload_of_another_user_is_hidden(self, logged_client, client):
+        owner_client, _ = logged_client
+        status = start(owner_client)
+        upload = ChunkedUpload.objects.get(id=status["id"])
+        assert os.path.getsize(upload.path) == len(CONTENT)
+
+        other = UserFactory()
+        owner_client.force_login(other)
+        assert owner_client.get(reverse("uploadStatus", args=[status["id"]])).status_code == 404
+        assert put_chunk(owner_client, status["id"], 0, CONTENT[:10]).status_code == 404
+
+    def test_expired_upload_is_hidden_and_cleared(self, logged_client, settings):
+        client, _ = logged_client
+        status = start(client)
+        put_chunk(client, status["id"], 0, CONTENT[:10])
+        fresh = start(client)
+        expired = ChunkedUpload.objects.get(id=status["id"])
+        ChunkedUpload.objects.filter(id=expired.id).update(
+            created_at=timezone.now() - timedelta(seconds=settings.CHUNKED_UPLOAD_EXPIRY + 1),
+        )
+        assert client.get(reverse("uploadStatus", args=[expired.id])).status_code == 404
+        assert put_chunk(client, expired.id, 1, CONTENT[10:20]).status_code == 404
+
+        # файл без сеанса (сеанс удален вместе с пользователем) удаляется, когда устареет
+        orphan = os.path.join(os.path.dirname(expired.path), "orphan.part")
+        open(orphan, "wb").close()
+        stale = time.time() - settings.CHUNKED_UPLOAD_EXPIRY - 1
+        os.utime(orphan, (stale, stale))
+
+        output = io.StringIO()
+        call_command("clear_uploads", stdout=output)
+        assert "Удалено сеансов: 1, файлов без сеанса: 1" in output.getvalue()
+        assert [str(pk) for pk in ChunkedUpload.objects.values_list("id", flat=True)] == [fresh["id"]]
+        assert not os.path.exists(expired.path) and not os.path.exists(orphan)
+        assert os.path.exists(ChunkedUpload.objects.get().path)
+
+    def test_requires_login(self, client):
+        response = client.post(reverse("uploadStart"), {"filename": "a.pdf", "size": 10})
+        assert response.status_code == 302
@@ -1,10 +1,16 @@
 import pytest
 from django.urls import reverse
-from elibrary_app.tests.factories import UserFactory, EBookFactory
+from tests.factories import UserFactory, EBookFactory
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.contrib.auth.models import User 
 from elibrary_app.models import EBooksModel
 
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
 @pytest.mark.django_db
 class TestAuthViews:
     def test_register_get(self, client):
@@ -81,9 +87,9 @@ class TestBookViews:
         EBookFactory(category="Science")
         response = client.get(reverse("explore"))
         assert response.status_code == 200
-        assert len(response.context["edu_books"]) == 3
-        assert len(response.context["fiction_books"]) == 2
-        assert len(response.context["science_books"]) == 1
+        assert len(response.context["pages"]["Education"]) == 3
+        assert len(response.context["pages"]["Fiction"]) == 2
+        assert len(response.context["pages"]["Science"]) == 1
 
     def test_add_book_get(self, logged_client):
         client, user = logged_client
@@ -109,7 +115,8 @@ class TestBookViews:
 
         book = EBooksModel.objects.first()
         assert book.title == "Тестовая книга"
-        assert book.author == f"{user.first_name} {user.last_name}"
+        assert book.author == user
+        assert book.author_name == f"{user.first_name} {user.last_name}"
         assert book.author_id == user.id
 
     def test_contri_view(self, logged_client):
@@ -0,0 +1,77 @@
+import io
+import threading
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.template import engines
+from django.urls import reverse
+from elibrary_app import warmup
+from elibrary_app.caching import CATEGORIES_KEY
+from tests.factories import EBookFactory
+
+
+@pytest.fixture(autouse=True)
+def not_ready(monkeypatch, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    monkeypatch.setattr(warmup, "_ready", threading.Event())
+
+
+@pytest.mark.django_db
+class TestWarmup:
+    def test_steps(self):
+        EBookFactory(category="Science")
+        report = {name: result for name, result, elapsed in warmup.warmup()}
+        assert report["templates"] >= 10
+        # Все маршруты приложения с параметрами int, str и uuid
+        assert report["urls"] >= 20
+        assert report["caches"] == 1
+        assert cache.get(CATEGORIES_KEY) is not None
+
+    def test_templates_compiled_once(self):
+        loader = engines.all()[0].engine.template_loaders[0]
+        loader.reset()
+        warmup.warm_templates()
+        # Шаблоны уже в кеширующем загрузчике: get_template не читает файлы
+        assert {"explore.html", "viewBook.html", "exploreBooks.html"} <= set(loader.get_template_cache)
+
+    def test_explore_served_from_warm_cache(self, client, django_assert_num_queries):
+        EBookFactory(category="Science", title="Прогретая книга")
+        warmup.warmup()
+        with django_assert_num_queries(0):
+            response = client.get(reverse("explore"))
+        assert "Прогретая книга" in response.content.decode("utf-8")
+
+    def test_database_checked(self, django_assert_num_queries):
+        with django_assert_num_queries(1) as captured:
+            assert warmup.check_database() == 1
+        assert captured.captured_queries[0]["sql"] == "SELECT 1"
+
+    def test_command(self):
+        output = io.StringIO()
+        call_command("warmup", stdout=output)
+        assert "templates" in output.getvalue() and "Прогрев завершен" in output.getvalue()
+
+
+@pytest.mark.django_db
+class TestReadiness:
+    def test_ready_after_warmup(self, client):
+        warmup.warmup()
+        response = client.get(reverse("readiness"))
+        assert response.status_code == 200
+        assert response["Cache-Control"] == "no-store"
+
+    def test_probe_retries_failed_warmup(self, client, monkeypatch):
+        def broken():
+            raise RuntimeError("база недоступна")
+
+        monkeypatch.setattr(warmup, "STEPS", (("database", broken),))
+        warmup.warmup_on_start()
+        assert client.get(reverse("readiness")).status_code == 503
+
+        monkeypatch.setattr(warmup, "STEPS", (("database", warmup.check_database),))
+        assert client.get(reverse("readiness")).status_code == 200
+
+    def test_not_ready_while_warming(self, client):
+        with warmup._lock:
+            assert client.get(reverse("readiness")).status_code == 503